@@ -1,3 +1,40 @@
+import time
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from .models import CustomUser
 
-# Create your tests here.
+
+class EndpointBudgetTests(TestCase):
+    """ Query-count and wall-time budgets for the accounts endpoints (see housekeeping.tests). """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user('admin', password='pass', role='ADMIN')
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'cleaner{i}', role='CLEANER', group_id=f'Group {i % 10 + 1}') for i in range(300)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_endpoint_budgets(self):
+        budgets = [
+            ('get', '/api/users/', None, 1, 1000),
+            ('get', f'/api/users/{self.admin.id}/', None, 1, 300),
+            ('patch', f'/api/users/{self.admin.id}/', {'first_name': 'Ana'}, 3, 300),
+            # Password hashing dominates; the budget is about queries
+            ('post', '/api/login/', {'username': 'admin', 'password': 'pass'}, 5, 3000),
+        ]
+        for method, url, body, max_queries, max_ms in budgets:
+            with self.subTest(method=method.upper(), url=url):
+                client = APIClient() if url == '/api/login/' else self.client
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = getattr(client, method)(url, body, format='json')
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                self.assertLess(response.status_code, 400, response.content[:300])
+                self.assertLessEqual(len(queries), max_queries, f'{method.upper()} {url}: {len(queries)} queries')
+                self.assertLessEqual(elapsed_ms, max_ms, f'{method.upper()} {url}: {elapsed_ms:.0f} ms')
@@ -2,6 +2,8 @@
 ASGI config for hotel_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP (including the SSE change stream) goes to Django; WebSocket connections
+to ``/ws/housekeeping/events/`` are served by the housekeeping change stream.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -13,4 +15,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hotel_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up (touches models)
+from housekeeping.stream_views import websocket_events  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        if scope['path'].rstrip('/') == '/ws/housekeeping/events':
+            return await websocket_events(scope, receive, send)
+        await send({'type': 'websocket.close', 'code': 4404})
+        return
+    return await django_application(scope, receive, send)
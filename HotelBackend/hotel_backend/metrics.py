@@ -0,0 +1,181 @@
+"""
+In-process request metrics.
+
+RequestMetricsMiddleware appends one small tuple per sampled request to a
+deque; a daemon thread folds the deque into per-route aggregates once a
+second, so the request thread never takes a lock or formats anything.
+Aggregates live per worker process and reset on restart.
+
+    GET    /api/metrics/    per-route latency histogram, DB and size stats (admins)
+    DELETE /api/metrics/    reset
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+
+from django.utils import timezone
+
+from rest_framework import permissions, views
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+FLUSH_INTERVAL = 1.0
+MAX_PENDING = 50000 # Oldest samples are dropped if the flusher falls behind
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class QueryCounter:
+    """ connection.execute_wrapper hook counting queries and their time. """
+
+    def __init__(self):
+        self.count = 0
+        self.ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.ms += (time.perf_counter() - start) * 1000
+
+
+class RouteStats:
+    __slots__ = ('requests', 'errors', 'total_ms', 'max_ms', 'buckets', 'queries', 'max_queries', 'db_ms', 'bytes', 'max_bytes')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.queries = 0
+        self.max_queries = 0
+        self.db_ms = 0.0
+        self.bytes = 0
+        self.max_bytes = 0
+
+    def add(self, status_code, elapsed_ms, queries, db_ms, size):
+        self.requests += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.queries += queries
+        self.max_queries = max(self.max_queries, queries)
+        self.db_ms += db_ms
+        self.bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+
+    def percentile(self, fraction):
+        """ Upper bound of the bucket holding the given fraction of requests. """
+        threshold = fraction * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= threshold:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self):
+        n = self.requests or 1
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 1),
+            'mean_ms': round(self.total_ms / n, 2),
+            'p50_ms': round(self.percentile(0.50), 2),
+            'p95_ms': round(self.percentile(0.95), 2),
+            'p99_ms': round(self.percentile(0.99), 2),
+            'max_ms': round(self.max_ms, 2),
+            'histogram': dict(zip([f'<={b}' for b in LATENCY_BUCKETS_MS] + ['>10000'], self.buckets)),
+            'mean_queries': round(self.queries / n, 2),
+            'max_queries': self.max_queries,
+            'mean_db_ms': round(self.db_ms / n, 2),
+            'mean_bytes': round(self.bytes / n),
+            'max_bytes': self.max_bytes,
+        }
+
+
+class MetricsRecorder:
+    def __init__(self):
+        self.pending = deque(maxlen=MAX_PENDING)
+        self.routes = {}
+        self.started_at = timezone.now()
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def record(self, sample):
+        """ sample: (method, route, status code, elapsed ms, queries, db ms, bytes). Called on the request thread. """
+        self.pending.append(sample)
+        if self._flusher is None:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name='request-metrics', daemon=True)
+                self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Request metrics flush failed')
+
+    def flush(self):
+        with self._lock:
+            while True:
+                try:
+                    method, route, status_code, elapsed_ms, queries, db_ms, size = self.pending.popleft()
+                except IndexError:
+                    break
+                stats = self.routes.get((method, route))
+                if stats is None:
+                    stats = self.routes[(method, route)] = RouteStats()
+                stats.add(status_code, elapsed_ms, queries, db_ms, size)
+
+    def snapshot(self):
+        self.flush()
+        with self._lock:
+            routes = [
+                dict(method=method, route=route, **stats.as_dict())
+                for (method, route), stats in self.routes.items()
+            ]
+        # Endpoints burning the most server time first
+        routes.sort(key=lambda r: r['total_ms'], reverse=True)
+        return {'since': self.started_at, 'routes': routes}
+
+    def reset(self):
+        with self._lock:
+            self.pending.clear()
+            self.routes = {}
+            self.started_at = timezone.now()
+
+
+recorder = MetricsRecorder()
+
+
+class IsAdminRole(permissions.BasePermission):
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.is_superuser or user.is_staff or user.role == 'ADMIN'))
+
+
+class MetricsView(views.APIView):
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        return Response(recorder.snapshot())
+
+    def delete(self, request):
+        recorder.reset()
+        return Response(status=204)
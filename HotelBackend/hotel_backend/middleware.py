@@ -1,17 +1,38 @@
 
 import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .metrics import QueryCounter, UNMATCHED_ROUTE, recorder
 
 logger = logging.getLogger(__name__)
 
-class RequestLogMiddleware:
+class RequestMetricsMiddleware:
+    """
+    Times each sampled request and counts its DB queries and response bytes
+    into the in-memory per-route aggregates (see hotel_backend/metrics.py).
+    METRICS_SAMPLE_RATE (0..1) sets the share of requests instrumented.
+    """
     def __init__(self, get_response):
         self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
 
     def __call__(self, request):
-        print(f"👉 [INCOMING] {request.method} {request.path}")
-        print(f"   Headers: {dict(request.headers)}")
-        
-        response = self.get_response(request)
-        
-        print(f"👈 [outgoing] Status: {response.status_code}")
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return self.get_response(request)
+
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else UNMATCHED_ROUTE
+        # Streams (SSE) are open-ended; only their setup time is counted
+        size = 0 if response.streaming else len(response.content)
+        recorder.record((request.method, route, response.status_code, elapsed_ms, queries.count, queries.ms, size))
         return response
@@ -16,9 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from .metrics import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('accounts.urls')),
     path('api/housekeeping/', include('housekeeping.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
@@ -0,0 +1,88 @@
+"""
+Room activity analytics.
+
+Every status transition appends one RoomStatusEvent (signals.room_saved,
+and RoomViewSet.bulk_update for its bulk path). Charts never scan that log
+by hand: days that are over are summed once into RoomStatusRollup with a
+single GROUP BY, and only today's events are aggregated live through the
+timestamp index.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import RoomStatusEvent, RoomStatusRollup
+
+
+def status_event(room, from_status, timestamp=None):
+    """ Unsaved event for a room whose status just changed from from_status. """
+    timestamp = timestamp or timezone.now()
+    duration = None
+    if from_status == 'IN_PROGRESS':
+        # The timer is still running unless the app already stopped it and sent the duration
+        if room.cleaning_started_at:
+            duration = max(0, int((timestamp - room.cleaning_started_at).total_seconds()))
+        else:
+            duration = room.last_cleaning_duration
+    return RoomStatusEvent(
+        room=room, room_number=room.number, from_status=from_status or '', to_status=room.status,
+        group_id=room.assigned_group, duration_seconds=duration, timestamp=timestamp,
+    )
+
+
+def day_bounds(first, last):
+    """ Aware [start, end) covering the local days first..last. """
+    start = timezone.make_aware(datetime.combine(first, time.min))
+    end = timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+    return start, end
+
+
+def summarize(first, last):
+    """ Aggregates the raw events of first..last into unsaved rollups, one per day (one query). """
+    start, end = day_bounds(first, last)
+    rows = (
+        RoomStatusEvent.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .annotate(day=TruncDate('timestamp'))
+        .values('day', 'to_status')
+        .annotate(
+            transitions=Count('id'), rooms=Count('room_number', distinct=True),
+            cleanings=Count('duration_seconds'), cleaning_seconds=Sum('duration_seconds'),
+        )
+    )
+    days = {}
+    for day_offset in range((last - first).days + 1):
+        day = first + timedelta(days=day_offset)
+        days[day] = RoomStatusRollup(date=day, by_status={})
+    for row in rows:
+        rollup = days[row['day']]
+        rollup.transitions += row['transitions']
+        rollup.by_status[row['to_status']] = row['transitions']
+        rollup.cleanings += row['cleanings']
+        rollup.cleaning_seconds += row['cleaning_seconds'] or 0
+        if row['to_status'] == 'COMPLETED':
+            rollup.rooms_cleaned = row['rooms']
+    return days
+
+
+def daily_activity(first, last):
+    """ One RoomStatusRollup per day in first..last; closed days are rolled up on first use. """
+    today = timezone.localdate()
+    closed_last = min(last, today - timedelta(days=1))
+    days = {}
+    if first <= closed_last:
+        days = {r.date: r for r in RoomStatusRollup.objects.filter(date__range=(first, closed_last))}
+        missing = [
+            first + timedelta(days=n) for n in range((closed_last - first).days + 1)
+            if first + timedelta(days=n) not in days
+        ]
+        if missing:
+            new = summarize(missing[0], missing[-1])
+            rollups = [new[day] for day in missing]
+            # Another worker may be rolling up the same days
+            RoomStatusRollup.objects.bulk_create(rollups, ignore_conflicts=True)
+            days.update((r.date, r) for r in rollups)
+    if first <= today <= last:
+        days.update(summarize(today, today))
+    return [days[first + timedelta(days=n)] for n in range((last - first).days + 1) if first + timedelta(days=n) in days]
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class HousekeepingConfig(AppConfig):
     name = 'housekeeping'
+
+    def ready(self):
+        from . import signals  # noqa: F401
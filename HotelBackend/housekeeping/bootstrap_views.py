@@ -0,0 +1,97 @@
+"""
+Device bootstrap: a user's whole working set in one response.
+
+    GET /api/housekeeping/bootstrap/?rooms=<version>&announcements=<version>...
+
+Every section comes back as {"version": "...", "data": ...}. A client that
+sends the version it already holds gets {"version": "...", "unchanged": true}
+for sections that did not change, so a poll only carries what moved.
+Which sections are present depends on the role. The query count is fixed:
+one version aggregate per section plus one read per changed section.
+"""
+import hashlib
+
+from rest_framework import permissions, views
+from rest_framework.response import Response
+
+from accounts.models import CustomUser
+from accounts.serializers import UserSerializer
+from .models import Room, Incident, CleaningSession, Announcement, Asset, LostItem
+from .serializers import CleaningSessionSerializer
+from .fast_read import room_reader, incident_reader, announcement_reader, asset_reader, lost_item_reader
+from .mixins import list_version
+from .views import FULL_ROOM_LIST_ROLES, room_scope
+
+BOOTSTRAP_SECTIONS = ('rooms', 'incidents', 'session', 'announcements', 'assets', 'lost_items', 'staff')
+LOST_ITEM_ROLES = ('RECEPTION', 'ADMIN', 'SUPERVISOR', 'MAINTENANCE')
+STAFF_ROLES = ('SUPERVISOR', 'RECEPTION', 'ADMIN')
+
+
+class BootstrapView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        role = 'ADMIN' if user.is_superuser else user.role
+        payload = {}
+        for name in BOOTSTRAP_SECTIONS:
+            section = getattr(self, f'section_{name}')(user, role)
+            if section is None:
+                continue
+            state, render = section
+            # Scope depends on role and group, so they are part of the version
+            key = repr((name, user.pk, role, user.group_id, state))
+            version = hashlib.md5(key.encode()).hexdigest()
+            if request.query_params.get(name) == version:
+                payload[name] = {'version': version, 'unchanged': True}
+            else:
+                payload[name] = {'version': version, 'data': render()}
+        return Response(payload)
+
+    # Each section returns (version state, render callable), or None when the role does not get it
+
+    def section_rooms(self, user, role):
+        rooms = Room.objects.order_by('number')
+        scope = room_scope(user)
+        if scope is not None:
+            rooms = rooms.filter(scope)
+        incidents = Incident.objects.filter(room__in=rooms.values('pk'))
+        return (list_version(rooms), list_version(incidents)), lambda: room_reader.render(rooms)
+
+    def section_incidents(self, user, role):
+        # Open work only; history stays on the paginated /incidents/ list
+        incidents = Incident.objects.filter(status='OPEN').order_by('-created_at', '-id')
+        if not (user.is_superuser or role in FULL_ROOM_LIST_ROLES):
+            incidents = incidents.filter(target_role=role) | incidents.filter(reported_by=user)
+        return list_version(incidents), lambda: incident_reader.render(incidents)
+
+    def section_session(self, user, role):
+        if not user.group_id:
+            return None
+        session = CleaningSession.objects.filter(
+            group_id=user.group_id, status='IN_PROGRESS'
+        ).order_by('-start_time').first()
+        # Sessions have no change stamp; the row is tiny, so it is its own version
+        data = CleaningSessionSerializer(session).data if session else None
+        return data, lambda: data
+
+    def section_announcements(self, user, role):
+        announcements = Announcement.objects.order_by('-created_at', '-id')
+        return list_version(announcements), lambda: announcement_reader.render(announcements)
+
+    def section_assets(self, user, role):
+        assets = Asset.objects.order_by('id')
+        return list_version(assets), lambda: asset_reader.render(assets)
+
+    def section_lost_items(self, user, role):
+        if role not in LOST_ITEM_ROLES:
+            return None
+        lost_items = LostItem.objects.order_by('-created_at', '-id')
+        return list_version(lost_items), lambda: lost_item_reader.render(lost_items)
+
+    def section_staff(self, user, role):
+        if not (role in STAFF_ROLES or user.is_staff):
+            return None
+        # Users have no change stamp either; the staff list is small enough to be its own version
+        data = UserSerializer(CustomUser.objects.order_by('id'), many=True).data
+        return data, lambda: data
@@ -0,0 +1,206 @@
+"""
+Per-group priority index behind GET /rooms/next/.
+
+Each process keeps the assignable rooms of every group in heaps ranked like
+assign_daily (get_room_priority_score, then effort, then id), so handing a
+cleaner their next room is a heap peek instead of a re-rank of the hotel.
+
+Only PREARRIVAL rooms with an arrival time change score as time passes, and
+their score only grows as the arrival gets closer. They are kept in separate
+heaps ordered by arrival, one per priority flag, so each heap's head has its
+best score at any moment and the rooms tied with it come right after it.
+Once its arrival has passed a room's score stops changing (the overdue
+5000), so peek moves it over to the static heap with every other room.
+Overdue rooms are then ranked by effort and id in O(log n); only ties among
+arrivals still to come (the same score step) are scanned.
+
+Before answering, the index catches up on rooms saved (last_updated) or
+deleted (RoomTombstone) since its last sync, the same way delta sync does,
+so changes made by other workers are applied incrementally. A full rebuild
+happens on first use, when the cleaning estimates change and every
+REBUILD_SECONDS as a safety net.
+"""
+import heapq
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.utils import timezone
+
+from .estimates import DEFAULT_ESTIMATE_MINUTES, estimates
+from .logic.priority import get_room_priority_score
+from .models import Room, RoomTombstone
+
+INDEX_FIELDS = ('id', 'status', 'assigned_group', 'cleaning_type', 'guest_status', 'priority', 'next_arrival_time')
+# Same look-back as views.DELTA_SYNC_OVERLAP: late commits can carry an older last_updated
+SYNC_OVERLAP = timedelta(seconds=2)
+REBUILD_SECONDS = 300
+# Vacate cleans cannot start while the guest is in (the -5000 block in get_room_priority_score)
+BLOCKED_WITH_GUEST = ('DEPARTURE', 'PREARRIVAL')
+
+
+def is_assignable(room):
+    if room.status != 'PENDING' or not room.assigned_group:
+        return False
+    return not (room.guest_status == 'GUEST_IN_ROOM' and room.cleaning_type in BLOCKED_WITH_GUEST)
+
+
+class GroupQueue:
+    """
+    Heaps of one group's assignable rooms with lazy deletion: a heap entry is
+    current only while it equals self.entries[room id]; stale entries are
+    dropped when they reach the top, or all at once when they pile up.
+    """
+
+    def __init__(self):
+        self.entries = {} # room id -> (heap name, heap entry)
+        self.heaps = {'static': [], 'arrival': [], 'arrival_priority': []}
+        self.rooms = {} # room id -> SimpleNamespace of INDEX_FIELDS, for scoring heap heads
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, room, effort):
+        if room.cleaning_type == 'PREARRIVAL' and room.next_arrival_time:
+            name = 'arrival_priority' if room.priority else 'arrival'
+            entry = (room.next_arrival_time, -effort, room.id)
+        else:
+            name = 'static'
+            entry = (-get_room_priority_score(room), -effort, room.id)
+        if self.entries.get(room.id) == (name, entry):
+            return
+        self.entries[room.id] = (name, entry)
+        self.rooms[room.id] = room
+        heapq.heappush(self.heaps[name], entry)
+        self.compact(name)
+
+    def discard(self, room_id):
+        if self.entries.pop(room_id, None) is not None:
+            del self.rooms[room_id]
+
+    def compact(self, name):
+        heap = self.heaps[name]
+        if len(heap) > 2 * len(self.entries) + 64:
+            heap[:] = [entry for key, entry in self.entries.values() if key == name]
+            heapq.heapify(heap)
+
+    def head(self, name):
+        heap = self.heaps[name]
+        while heap and self.entries.get(heap[0][-1]) != (name, heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def peek(self, time_now):
+        """ (room id, score) of the top-ranked room at time_now, or None. Calls must not go back in time. """
+        self.promote_overdue(time_now)
+        best = None
+        for name in self.heaps:
+            entry = self.head(name)
+            if entry is None:
+                continue
+            if name == 'static':
+                score = get_room_priority_score(self.rooms[entry[-1]], time_now)
+            else:
+                entry, score = self.tied_head(name, time_now)
+            room_id = entry[-1]
+            key = (score, -entry[1], -room_id)
+            if best is None or key > best[0]:
+                best = (key, room_id, score)
+        return None if best is None else (best[1], best[2])
+
+    def promote_overdue(self, time_now):
+        """ Moves rooms whose arrival has passed to the static heap: their score is fixed from now on. """
+        static = self.heaps['static']
+        for name in ('arrival', 'arrival_priority'):
+            heap = self.heaps[name]
+            while self.head(name) is not None and heap[0][0] <= time_now:
+                _, neg_effort, room_id = heapq.heappop(heap)
+                entry = (-get_room_priority_score(self.rooms[room_id], time_now), neg_effort, room_id)
+                self.entries[room_id] = ('static', entry)
+                heapq.heappush(static, entry)
+
+    def tied_head(self, name, time_now):
+        """
+        (entry, score) of an arrival heap's best room: among the rooms sharing
+        the head's score, the largest effort, then the lowest id, like the
+        static heap. Those rooms are the heap's first entries in arrival order;
+        overdue rooms have already left for the static heap, so these are
+        arrivals within one score step of each other.
+        """
+        heap = self.heaps[name]
+        tied, score = [], None
+        while self.head(name) is not None:
+            room_score = get_room_priority_score(self.rooms[heap[0][-1]], time_now)
+            if score is not None and room_score != score:
+                break
+            score = room_score
+            tied.append(heapq.heappop(heap))
+        for entry in tied:
+            heapq.heappush(heap, entry)
+        return min(tied, key=lambda entry: entry[1:]), score
+
+
+class PriorityIndex:
+    def __init__(self):
+        self._groups = {} # group id -> GroupQueue
+        self._room_groups = {} # room id -> group it is queued in
+        self._synced_at = None
+        self._built_at = None
+        self._estimates = None
+        self._lock = threading.Lock()
+
+    def next_room(self, group_id, time_now=None):
+        """ (room id, score, rooms queued) for the group's top-ranked assignable room; room id and score are None if it has none. """
+        if time_now is None:
+            time_now = timezone.now()
+        with self._lock:
+            self._sync()
+            queue = self._groups.get(group_id)
+            top = queue.peek(time_now) if queue else None
+            if top is None:
+                return None, None, 0
+            return top[0], top[1], len(queue)
+
+    def reset(self):
+        """ Forget this process's index; the next read rebuilds it. """
+        with self._lock:
+            self._synced_at = None
+
+    def _sync(self):
+        # Taken before reading rows so a save racing this query is picked up next time
+        synced_at = timezone.now()
+        effort = estimates.all()
+        if (self._synced_at is None or effort is not self._estimates
+                or time.monotonic() - self._built_at > REBUILD_SECONDS):
+            self._groups, self._room_groups = {}, {}
+            self._estimates, self._built_at = effort, time.monotonic()
+            rows = Room.objects.filter(status='PENDING', assigned_group__isnull=False).values_list(*INDEX_FIELDS)
+            deleted = []
+        else:
+            window_start = self._synced_at - SYNC_OVERLAP
+            rows = Room.objects.filter(last_updated__gt=window_start).values_list(*INDEX_FIELDS)
+            deleted = RoomTombstone.objects.filter(deleted_at__gt=window_start).values_list('room_id', flat=True)
+
+        for values in rows:
+            room = SimpleNamespace(**dict(zip(INDEX_FIELDS, values)))
+            group_id = self._room_groups.get(room.id)
+            if group_id is not None and group_id != room.assigned_group:
+                self._discard(room.id)
+            if is_assignable(room):
+                self._room_groups[room.id] = room.assigned_group
+                queue = self._groups.setdefault(room.assigned_group, GroupQueue())
+                queue.push(room, effort.get(room.cleaning_type, DEFAULT_ESTIMATE_MINUTES))
+            else:
+                self._discard(room.id)
+        for room_id in deleted:
+            self._discard(room_id)
+        self._synced_at = synced_at
+
+    def _discard(self, room_id):
+        group_id = self._room_groups.pop(room_id, None)
+        if group_id is not None:
+            self._groups[group_id].discard(room_id)
+
+
+priority_index = PriorityIndex()
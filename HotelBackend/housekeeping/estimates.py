@@ -0,0 +1,60 @@
+"""
+Cleaning-time estimates (CleaningTypeDefinition) shared by every worker.
+
+The table changes about once a month and is read on every session start,
+forecast, roster generation and auto-assignment, so each process keeps it in
+memory. Writes bump a CacheVersion stamp (signals.py); a process re-checks
+the stamp at most every VERSION_CHECK_SECONDS and reloads when another
+worker changed it. Writes in the same process take effect immediately.
+"""
+import threading
+import time
+
+from django.db.models import F
+
+from .models import CleaningTypeDefinition, CacheVersion
+
+DEFAULT_ESTIMATE_MINUTES = 30
+VERSION_NAME = 'cleaning_estimates'
+VERSION_CHECK_SECONDS = 5
+
+
+class EstimateCache:
+    def __init__(self):
+        self._state = None # (estimates, version, checked at)
+        self._lock = threading.Lock()
+
+    def all(self):
+        """ {cleaning type name: estimated minutes} """
+        state = self._state
+        if state is not None and time.monotonic() - state[2] < VERSION_CHECK_SECONDS:
+            return state[0]
+        with self._lock:
+            version = current_version()
+            if self._state is not None and self._state[1] == version:
+                self._state = (self._state[0], version, time.monotonic())
+            else:
+                estimates = dict(CleaningTypeDefinition.objects.values_list('name', 'estimated_minutes'))
+                self._state = (estimates, version, time.monotonic())
+            return self._state[0]
+
+    def get(self, cleaning_type, default=DEFAULT_ESTIMATE_MINUTES):
+        return self.all().get(cleaning_type, default)
+
+    def invalidate(self):
+        """ Forget this process's copy; the next read reloads. """
+        self._state = None
+
+
+estimates = EstimateCache()
+
+
+def current_version():
+    return CacheVersion.objects.filter(name=VERSION_NAME).values_list('version', flat=True).first() or 0
+
+
+def bump_version():
+    """ Tells every worker to reload. Called when a CleaningTypeDefinition is saved or deleted. """
+    if not CacheVersion.objects.filter(name=VERSION_NAME).update(version=F('version') + 1):
+        CacheVersion.objects.get_or_create(name=VERSION_NAME, defaults={'version': 1})
+    estimates.invalidate()
@@ -0,0 +1,280 @@
+"""
+Change feed behind the live room stream.
+
+Writers append ChangeEvent rows (after commit) and trim the expired ones.
+Every web worker runs one EventBroker that tails the table and fans new rows
+out to its local stream subscribers, so the database sees one small query
+per worker per tick no matter how many devices are connected.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+# Roles that follow the whole hotel rather than a single team
+FULL_VISIBILITY_ROLES = ('SUPERVISOR', 'ADMIN', 'RECEPTION')
+
+EVENT_RETENTION = timedelta(days=1)
+# Each process prunes the feed at most this often, from the write path
+PRUNE_INTERVAL = 600.0
+_last_prune = None
+
+
+def room_event(room, action='SAVED'):
+    loaded = getattr(room, '_loaded_values', {})
+    payload = {
+        'number': room.number,
+        'status': room.status,
+        'guest_status': room.guest_status,
+        'cleaning_type': room.cleaning_type,
+        'assigned_group': room.assigned_group,
+        'assigned_cleaner': room.assigned_cleaner_id,
+        'priority': room.priority,
+    }
+    # Let the team or cleaner a room just left (or a status it just left) see the change too
+    if 'assigned_group' in loaded and loaded['assigned_group'] != room.assigned_group:
+        payload['previous_group'] = loaded['assigned_group']
+    if 'status' in loaded and loaded['status'] != room.status:
+        payload['previous_status'] = loaded['status']
+    if 'assigned_cleaner_id' in loaded and loaded['assigned_cleaner_id'] != room.assigned_cleaner_id:
+        payload['previous_cleaner'] = loaded['assigned_cleaner_id']
+    return ChangeEvent(kind='ROOM', action=action, object_id=room.id, group_id=room.assigned_group, payload=payload)
+
+
+def incident_event(incident, action='SAVED'):
+    try:
+        room = incident.room
+    except ObjectDoesNotExist:
+        room = None # Deleted together with its room
+    payload = {
+        'room': incident.room_id,
+        'room_number': room.number if room else None,
+        'status': incident.status,
+        'priority': incident.priority,
+        'category': incident.category,
+        'target_role': incident.target_role,
+        'text': incident.text,
+    }
+    return ChangeEvent(
+        kind='INCIDENT', action=action, object_id=incident.id,
+        group_id=room.assigned_group if room else None, payload=payload,
+    )
+
+
+def session_event(session, action='SAVED'):
+    payload = {
+        'status': session.status,
+        'target_duration_minutes': session.target_duration_minutes,
+        'break_minutes': session.break_minutes,
+    }
+    return ChangeEvent(kind='SESSION', action=action, object_id=session.id, group_id=session.group_id, payload=payload)
+
+
+def publish(*events):
+    """ Queue events for the feed once the surrounding transaction commits. """
+    events = [e for e in events if e is not None]
+    if events:
+        transaction.on_commit(lambda: write_events(events))
+
+
+def write_events(events):
+    ChangeEvent.objects.bulk_create(events)
+    # Every save writes an event, so the table is trimmed here whether or not anyone is streaming
+    prune_events()
+
+
+def prune_events():
+    """ Deletes events older than EVENT_RETENTION, at most once per PRUNE_INTERVAL. """
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = now
+    ChangeEvent.objects.filter(created_at__lt=timezone.now() - EVENT_RETENTION).delete()
+
+
+def is_visible(event, role, group_id):
+    if role in FULL_VISIBILITY_ROLES:
+        return True
+
+    payload = event.payload
+    if event.kind == 'INCIDENT' and payload.get('target_role') == role:
+        return True
+
+    if role == 'CLEANER':
+        return bool(group_id) and group_id in (event.group_id, payload.get('previous_group'))
+    if role == 'HOUSEMAN':
+        return event.kind == 'ROOM'
+    if role == 'MAINTENANCE':
+        return event.kind == 'ROOM' and 'MAINTENANCE' in (payload.get('status'), payload.get('previous_status'))
+    return False
+
+
+def event_message(event):
+    return {
+        'id': event.id,
+        'kind': event.kind,
+        'action': event.action,
+        'object_id': event.object_id,
+        'group_id': event.group_id,
+        'data': event.payload,
+        'created_at': event.created_at.isoformat() if event.created_at else None,
+    }
+
+
+class Subscription:
+    queue_size = 1000
+
+    def __init__(self, broker, role, group_id):
+        self.broker = broker
+        self.role = role
+        self.group_id = group_id
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.overflowed = False
+        # Live events are held back while a reconnect backlog is being replayed
+        self._held = None
+
+    def offer(self, event):
+        if self._held is not None:
+            self._held.append(event)
+            return
+        if self.overflowed:
+            return
+        if not is_visible(event, self.role, self.group_id):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: stop feeding it and tell the client to resync from REST
+            self.overflowed = True
+
+    def hold(self):
+        self._held = []
+
+    def release(self, backlog=()):
+        held, self._held = self._held or [], None
+        # The backlog and the held live events can overlap
+        events = {event.id: event for event in list(backlog) + held}
+        for event_id in sorted(events):
+            self.offer(events[event_id])
+
+    async def events(self, heartbeat=15.0):
+        """
+        Yields ChangeEvents as they arrive, or None after `heartbeat` seconds
+        of silence so the transport can send a keep-alive. Ends after an
+        overflow (the caller should emit a resync hint).
+        """
+        while not self.overflowed or not self.queue.empty():
+            try:
+                yield await asyncio.wait_for(self.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if self.overflowed:
+                    return
+                yield None
+
+
+class EventBroker:
+    poll_interval = 0.5
+    batch_size = 500
+    backlog_limit = 500
+    # How long an id skipped by an in-flight transaction is re-checked before giving up
+    gap_timeout = 5.0
+
+    def __init__(self):
+        self._subscribers = set()
+        self._task = None
+        self._last_id = None
+        self._gaps = {}
+        # The tail loop outlives the request that started it, so it gets its own
+        # DB thread instead of borrowing that request's executor
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='change-feed')
+
+    def subscribe(self, role, group_id, last_event_id=None):
+        """
+        Registers a subscriber on the running event loop. With last_event_id
+        the caller must `await broker.replay(subscription, last_event_id)`
+        before reading, so missed events arrive first and in order.
+        """
+        subscription = Subscription(self, role, group_id)
+        if last_event_id is not None:
+            subscription.hold()
+        self._subscribers.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscribers.discard(subscription)
+
+    async def replay(self, subscription, last_event_id):
+        events = await sync_to_async(self._fetch_backlog)(last_event_id)
+        subscription.release(events)
+
+    def _fetch_backlog(self, last_event_id):
+        return list(ChangeEvent.objects.filter(id__gt=last_event_id).order_by('id')[:self.backlog_limit])
+
+    def _poll(self):
+        # The feed thread keeps one connection for as long as it runs; replace it if the database dropped it
+        connection.close_if_unusable_or_obsolete()
+        return self._fetch()
+
+    def _close(self):
+        connection.close()
+
+    def _fetch(self):
+        if self._last_id is None:
+            # Start from "now": history is served by replay(), not by the live tail
+            self._last_id = ChangeEvent.objects.aggregate(last=Max('id'))['last'] or 0
+            return []
+
+        now = time.monotonic()
+        self._gaps = {gid: deadline for gid, deadline in self._gaps.items() if deadline > now}
+
+        condition = Q(id__gt=self._last_id)
+        if self._gaps:
+            condition |= Q(id__in=list(self._gaps))
+        events = list(ChangeEvent.objects.filter(condition).order_by('id')[:self.batch_size])
+
+        for event in events:
+            self._gaps.pop(event.id, None)
+            if event.id > self._last_id:
+                # Ids allocated but not yet committed show up later; keep watching them briefly
+                if event.id - self._last_id <= self.batch_size:
+                    for missing in range(self._last_id + 1, event.id):
+                        self._gaps[missing] = now + self.gap_timeout
+                self._last_id = event.id
+
+        return events
+
+    async def _run(self):
+        try:
+            while self._subscribers:
+                try:
+                    events = await sync_to_async(self._poll, thread_sensitive=False, executor=self._executor)()
+                except Exception:
+                    logger.exception("Change feed poll failed")
+                    events = []
+                for event in events:
+                    for subscription in list(self._subscribers):
+                        subscription.offer(event)
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            # Idle broker: the next subscriber starts tailing from "now" again
+            self._executor.submit(self._close)
+            self._task = None
+            self._last_id = None
+            self._gaps = {}
+
+
+broker = EventBroker()
@@ -0,0 +1,205 @@
+"""
+Read-only list rendering that skips per-object ModelSerializer machinery.
+
+A ListReader is compiled once from a serializer class: every readable field
+becomes a (key, column, converter) step over ``values_list()`` tuples. The
+output matches what the serializer would produce (same keys, same order,
+same values, same omitted keys), so responses are byte-identical. Writes and
+single-object reads keep using the serializer.
+"""
+from collections import defaultdict
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .models import display_floor
+from .serializers import (
+    RoomSerializer, IncidentSerializer, AnnouncementSerializer, AssetSerializer, LostItemSerializer,
+)
+
+# DRF fields whose to_representation() returns DB values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+VALUE, COMPUTED, NESTED = range(3)
+
+
+class DateTimeConverter:
+    """
+    DateTimeField.to_representation resolves the active timezone for every
+    value; this resolves it once per render and falls back to DRF for
+    anything but aware datetimes in ISO 8601 output.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    @classmethod
+    def supports(cls, field):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        return (
+            isinstance(field, serializers.DateTimeField)
+            and isinstance(output_format, str) and output_format.lower() == ISO_8601
+        )
+
+    def bind(self):
+        fallback = self.field.to_representation
+        field_timezone = self.field.timezone if hasattr(self.field, 'timezone') else self.field.default_timezone()
+        if field_timezone is None:
+            return fallback
+
+        def convert(value):
+            if isinstance(value, str) or value.tzinfo is None:
+                return fallback(value)
+            text = value.astimezone(field_timezone).isoformat()
+            return text[:-6] + 'Z' if text.endswith('+00:00') else text
+        return convert
+
+
+class ListReader:
+    """
+    Args:
+        serializer_class: The serializer whose output is reproduced.
+        computed: {field_name: (columns, function)} for SerializerMethodFields;
+            the function receives the column values in order.
+        nested: {field_name: (reader, foreign_key)} for nested many=True
+            serializers, loaded with one extra query per list grouped by foreign_key.
+        ordering: Ordering applied when this reader is used for nested rows.
+    """
+
+    def __init__(self, serializer_class, computed=None, nested=None, ordering=('id',)):
+        self.serializer_class = serializer_class
+        self.computed = computed or {}
+        self.nested = nested or {}
+        self.ordering = ordering
+        self._steps = None
+
+    @property
+    def steps(self):
+        if self._steps is None:
+            self._steps = self.compile()
+        return self._steps
+
+    def compile(self):
+        steps = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in self.computed:
+                columns, function = self.computed[name]
+                steps.append((name, COMPUTED, tuple(columns), function))
+            elif name in self.nested:
+                steps.append((name, NESTED, self.nested[name], None))
+            else:
+                attrs = field.source_attrs
+                column = '__'.join(attrs)
+                # DRF omits the key when an intermediate relation is null
+                guard = attrs[0] if len(attrs) > 1 else None
+                if isinstance(field, PASSTHROUGH_FIELDS):
+                    convert = None
+                elif DateTimeConverter.supports(field):
+                    convert = DateTimeConverter(field)
+                else:
+                    convert = field.to_representation
+                steps.append((name, VALUE, (column, guard), convert))
+        return steps
+
+    def plan(self, fields=None, extra_columns=()):
+        """ Returns (steps, column list, column index) restricted to `fields`. """
+        steps = [step for step in self.steps if fields is None or step[0] in fields]
+        columns = ['id']
+        for name, kind, spec, _ in steps:
+            if kind == VALUE:
+                columns.extend(c for c in spec if c)
+            elif kind == COMPUTED:
+                columns.extend(spec)
+        columns.extend(extra_columns)
+        columns = list(dict.fromkeys(columns))
+        return steps, columns, {c: i for i, c in enumerate(columns)}
+
+    def render(self, queryset, fields=None):
+        steps, columns, index = self.plan(fields)
+        rows = list(queryset.values_list(*columns))
+        return self.render_rows(rows, steps, index, queryset)
+
+    def render_rows(self, rows, steps, index, queryset):
+        nested_data = {}
+        for name, kind, spec, _ in steps:
+            if kind == NESTED:
+                reader, foreign_key = spec
+                parents = queryset.order_by().values('pk')
+                nested_data[name] = reader.render_grouped(foreign_key, parents)
+
+        compiled = []
+        for name, kind, spec, convert in steps:
+            if kind == VALUE:
+                column, guard = spec
+                if isinstance(convert, DateTimeConverter):
+                    convert = convert.bind()
+                compiled.append((name, kind, index[column], index[guard] if guard else None, convert))
+            elif kind == COMPUTED:
+                compiled.append((name, kind, tuple(index[c] for c in spec), None, convert))
+            else:
+                compiled.append((name, kind, nested_data[name], None, None))
+
+        output = []
+        for row in rows:
+            item = {}
+            for name, kind, position, guard, convert in compiled:
+                if kind == VALUE:
+                    if guard is not None and row[guard] is None:
+                        continue
+                    value = row[position]
+                    item[name] = value if value is None or convert is None else convert(value)
+                elif kind == COMPUTED:
+                    item[name] = convert(*[row[i] for i in position])
+                else:
+                    item[name] = position.get(row[0], [])
+            output.append(item)
+        return output
+
+    def render_grouped(self, foreign_key, parents):
+        model = self.serializer_class.Meta.model
+        steps, columns, index = self.plan(extra_columns=(foreign_key,))
+        queryset = model.objects.filter(**{f'{foreign_key}__in': parents}).order_by(*self.ordering)
+        rows = list(queryset.values_list(*columns))
+        grouped = defaultdict(list)
+        key_position = index[foreign_key]
+        for row, item in zip(rows, self.render_rows(rows, steps, index, queryset)):
+            grouped[row[key_position]].append(item)
+        return grouped
+
+
+incident_reader = ListReader(IncidentSerializer)
+
+room_reader = ListReader(
+    RoomSerializer,
+    computed={'floor': (('floor', 'number'), display_floor)},
+    nested={'incidents': (incident_reader, 'room')},
+)
+
+announcement_reader = ListReader(AnnouncementSerializer)
+asset_reader = ListReader(AssetSerializer)
+lost_item_reader = ListReader(LostItemSerializer)
+
+
+class FastListMixin:
+    """
+    Serves `list` through `list_reader` instead of the serializer.
+    Falls back to the normal path when pagination is active.
+    """
+    list_reader = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.list_reader is None or self.paginate_queryset(queryset) is not None:
+            return super().list(request, *args, **kwargs)
+        fields = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+        return Response(self.list_reader.render(queryset, fields))
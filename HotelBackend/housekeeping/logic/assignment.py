@@ -0,0 +1,187 @@
+import heapq
+
+# A cleaner never goes over capacity: (load + effort) / capacity <= MAX_CAPACITY_RATIO
+MAX_CAPACITY_RATIO = 1.0 # Strict 8 hours limit
+
+# Walking model behind walking_route() / route_seconds()
+DOOR_SECONDS = 8 # Between neighbouring doors on a corridor
+ZONE_CHANGE_SECONDS = 60 # Over to another wing / zone of the same floor
+FLOOR_CHANGE_SECONDS = 120 # Stairs or waiting for the service lift
+
+
+def assign_rooms(rooms, staff_ids, staff_load, staff_capacity, strategy='greedy'):
+    """
+    Distributes rooms over the staff on shift.
+
+    args:
+        rooms: (room id, effort minutes, current cleaner id or None, (floor, zone)) tuples in dispatch order.
+        staff_ids: Cleaners on shift; earlier ones win ties.
+        staff_load: {cleaner id: minutes already assigned}, updated in place.
+        staff_capacity: {cleaner id: capacity in minutes}
+        strategy: A name in STRATEGIES.
+
+    Every strategy keeps the same rules: a room stays with its current cleaner
+    while that cleaner is on shift and has room for it (sticky), nobody goes
+    over capacity, and a room nobody can take stays unassigned.
+
+    Returns {room id: cleaner id, or None for unassigned}.
+    """
+    return STRATEGIES[strategy](staff_ids, staff_load, staff_capacity).assign(rooms)
+
+
+class GreedyStrategy:
+    """
+    Each room goes to the cleaner with the lowest load ratio that can still
+    take it, ties to the earlier cleaner: the original assign_daily rule, with
+    identical results. Instead of scanning every cleaner per room, it keeps
+    one heap of (load ratio, cleaner) per distinct effort holding the cleaners
+    with capacity left for that effort. Loads only grow, so a cleaner dropped
+    from a heap never needs to come back, and outdated entries are skipped
+    when they surface: O(log staff) per room for each distinct effort.
+    """
+
+    def __init__(self, staff_ids, staff_load, staff_capacity):
+        self.staff_ids = list(dict.fromkeys(staff_ids))
+        self.order = {uid: index for index, uid in enumerate(self.staff_ids)}
+        self.load = staff_load
+        self.capacity = staff_capacity
+        self.heaps = {}
+
+    def fits(self, uid, effort):
+        return (self.load[uid] + effort) / self.capacity[uid] <= MAX_CAPACITY_RATIO
+
+    def assign(self, rooms):
+        for effort in {room[1] for room in rooms}:
+            heap = [(self.load[uid] / self.capacity[uid], self.order[uid], uid) for uid in self.staff_ids if self.fits(uid, effort)]
+            heapq.heapify(heap)
+            self.heaps[effort] = heap
+
+        assignment = {}
+        for room_id, effort, current, location in rooms:
+            uid = self.choose(effort, current, location)
+            if uid is not None:
+                self.take(uid, effort, location)
+            assignment[room_id] = uid
+        return assignment
+
+    def choose(self, effort, current, location):
+        # 1. Try Sticky (Preferred)
+        if current in self.order and self.fits(current, effort):
+            return current
+        return self.pick(effort, location)
+
+    def pick(self, effort, location):
+        """ Lowest load ratio among the cleaners who can take this effort, or None. """
+        heap = self.heaps[effort]
+        while heap:
+            ratio, _, uid = heap[0]
+            if ratio == self.load[uid] / self.capacity[uid] and self.fits(uid, effort):
+                return uid
+            heapq.heappop(heap)
+        return None
+
+    def take(self, uid, effort, location):
+        self.load[uid] += effort
+        entry = (self.load[uid] / self.capacity[uid], self.order[uid], uid)
+        for room_effort, heap in self.heaps.items():
+            if self.fits(uid, room_effort):
+                heapq.heappush(heap, entry)
+
+
+class FloorStrategy(GreedyStrategy):
+    """
+    Clusters each cleaner's rooms to cut walking. A room goes to a cleaner
+    already working nearby, trying in turn the same floor and zone, the same
+    floor, then the floors just above and below; within a tier the cleaner
+    with the least capacity to spare that still fits it wins (best fit), so
+    areas are finished by the same people. Only when nobody nearby fits does
+    it open the area on the least loaded cleaner, like GreedyStrategy.
+    Capacity still owed to a cleaner's own sticky rooms further down the list
+    is not used for clustering.
+
+    Coverage is not identical to GreedyStrategy's: assigned minutes match to
+    within a fraction of a percent, but best fit fills cleaners up with the
+    rooms that come first, so up to about 1% more rooms can stay unassigned
+    (3940 against 3981 on the 5000 room / 300 staff benchmark). A greedy
+    fill-in pass would not recover them: a room stays unassigned only when no
+    cleaner had room for it, and loads only grow.
+    """
+
+    def __init__(self, staff_ids, staff_load, staff_capacity):
+        super().__init__(staff_ids, staff_load, staff_capacity)
+        self.areas = {} # (floor, zone) -> cleaners with rooms there
+        self.floors = {} # floor -> cleaners with rooms on it
+        self.reserved = dict.fromkeys(self.staff_ids, 0) # Minutes of sticky rooms still to come
+
+    def assign(self, rooms):
+        for room_id, effort, current, location in rooms:
+            if current in self.reserved:
+                self.reserved[current] += effort
+        return super().assign(rooms)
+
+    def choose(self, effort, current, location):
+        if current in self.reserved:
+            self.reserved[current] -= effort
+        return super().choose(effort, current, location)
+
+    def pick(self, effort, location):
+        floor = location[0]
+        tiers = [self.areas.get(location, ()), self.floors.get(floor, ())]
+        if floor is not None:
+            tiers.append(self.floors.get(floor - 1, []) + self.floors.get(floor + 1, []))
+        for cleaners in tiers:
+            best = None
+            for uid in cleaners:
+                # Clustering must not push out this cleaner's own sticky rooms
+                if self.fits(uid, effort + self.reserved[uid]):
+                    spare = self.capacity[uid] - self.load[uid] - self.reserved[uid] - effort
+                    if best is None or (spare, self.order[uid]) < best[0]:
+                        best = ((spare, self.order[uid]), uid)
+            if best is not None:
+                return best[1]
+        return super().pick(effort, location)
+
+    def take(self, uid, effort, location):
+        super().take(uid, effort, location)
+        for index, key in ((self.areas, location), (self.floors, location[0])):
+            working = index.setdefault(key, [])
+            if uid not in working:
+                working.append(uid)
+
+
+STRATEGIES = {
+    'greedy': GreedyStrategy,
+    'floor': FloorStrategy,
+}
+
+
+def door_position(number):
+    """ Position along the corridor; rooms are numbered in walking order. """
+    try:
+        return int(number)
+    except (TypeError, ValueError):
+        return 0
+
+
+def walking_route(stops):
+    """
+    stops: (room id, floor, zone, number) tuples. Returns the room ids in
+    walking order: floor by floor, zone by zone, along each corridor. Under
+    the walking model each floor and zone is then entered once and each
+    corridor walked once end to end.
+    """
+    ordered = sorted(stops, key=lambda stop: (stop[1] is None, stop[1] or 0, stop[2] or '', door_position(stop[3]), stop[0]))
+    return [stop[0] for stop in ordered]
+
+
+def route_seconds(stops):
+    """ Walking time through (room id, floor, zone, number) stops in the given order. """
+    seconds = 0
+    for (_, floor, zone, number), (_, next_floor, next_zone, next_number) in zip(stops, stops[1:]):
+        if floor != next_floor:
+            seconds += FLOOR_CHANGE_SECONDS
+        elif zone != next_zone:
+            seconds += ZONE_CHANGE_SECONDS
+        else:
+            seconds += DOOR_SECONDS * abs(door_position(next_number) - door_position(number))
+    return seconds
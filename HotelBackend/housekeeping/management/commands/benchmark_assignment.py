@@ -0,0 +1,141 @@
+import random
+import statistics
+from django.core.management.base import BaseCommand
+from housekeeping.logic.assignment import MAX_CAPACITY_RATIO, STRATEGIES, assign_rooms, route_seconds, walking_route
+from .benchmark_room_list import Command as RoomListBenchmark
+
+# Minutes per cleaning type in a typical CleaningTypeDefinition table
+EFFORTS = (45, 40, 35, 30, 20, 10)
+
+
+def synthetic_workload(rooms, staff, seed=42, rooms_per_floor=40):
+    """
+    (rooms, staff ids, loads, capacities, stops) shaped like assign_daily's
+    input: a third of the rooms still have yesterday's cleaner, some shifts
+    are short and some cleaners already carry rooms in progress. Demand
+    exceeds capacity a little so every cleaner ends up full. Floors have an
+    East and a West wing; stops maps room id -> (room id, floor, zone, number).
+    """
+    rng = random.Random(seed)
+    staff_ids = list(range(1, staff + 1))
+    capacity = {uid: rng.choice((480, 480, 480, 360, 240)) for uid in staff_ids}
+    load = {uid: rng.choice((0, 0, 0, 45, 90)) for uid in staff_ids}
+    # Yesterday's assignment handed out runs of neighbouring rooms
+    run = max(1, rooms // staff)
+    tasks, stops = [], {}
+    for room_id in range(rooms):
+        floor, index = divmod(room_id, rooms_per_floor)
+        zone = 'East' if index < rooms_per_floor // 2 else 'West'
+        current = staff_ids[room_id // run % staff] if rng.random() < 0.3 else None
+        tasks.append((room_id, rng.choice(EFFORTS), current, (floor + 1, zone)))
+        stops[room_id] = (room_id, floor + 1, zone, f'{floor + 1}{index + 1:03d}')
+    # Dispatch order follows priority scores, which have nothing to do with where rooms are
+    rng.shuffle(tasks)
+    return tasks, staff_ids, load, capacity, stops
+
+
+def simulate_travel(assignment, tasks, stops, route=True):
+    """
+    Walks every cleaner through their rooms, in walking_route() order or, like
+    the app today, in dispatch order. Returns {cleaner id: walking seconds}.
+    """
+    rooms_by_cleaner = {}
+    for room_id, _, _, _ in tasks:
+        uid = assignment[room_id]
+        if uid is not None:
+            rooms_by_cleaner.setdefault(uid, []).append(stops[room_id])
+    travel = {}
+    for uid, cleaner_stops in rooms_by_cleaner.items():
+        if route:
+            cleaner_stops = [stops[room_id] for room_id in walking_route(cleaner_stops)]
+        travel[uid] = route_seconds(cleaner_stops)
+    return travel
+
+
+def reference_assign(rooms, staff_ids, staff_load, staff_capacity):
+    """ assign_daily's original per-room scan over every cleaner, kept to check GreedyStrategy against. """
+    def can_take_room(uid, room_effort):
+        return (staff_load[uid] + room_effort) / staff_capacity[uid] <= MAX_CAPACITY_RATIO
+
+    assignment = {}
+    for room_id, effort, current, location in rooms:
+        if current in staff_ids and can_take_room(current, effort):
+            best_staff_id = current
+        else:
+            candidates = [uid for uid in staff_ids if can_take_room(uid, effort)]
+            best_staff_id = min(candidates, key=lambda uid: staff_load[uid] / staff_capacity[uid]) if candidates else None
+        if best_staff_id is not None:
+            staff_load[best_staff_id] += effort
+        assignment[room_id] = best_staff_id
+    return assignment
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the assign_daily strategies (and the original per-room scan) on a synthetic '
+        'workload (no database), reports assignment quality and simulates the walking time '
+        'of every cleaner\'s day: as today (rooms walked in dispatch order) and along walking_route().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=5000)
+        parser.add_argument('--staff', type=int, default=300)
+        parser.add_argument('--rooms-per-floor', type=int, default=40)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--repeat', type=int, default=3, help='Best-of-N timing')
+
+    def handle(self, *args, **options):
+        timer = RoomListBenchmark()
+        tasks, staff_ids, load, capacity, stops = synthetic_workload(
+            options['rooms'], options['staff'], options['seed'], options['rooms_per_floor'],
+        )
+        efforts = {room_id: effort for room_id, effort, _, _ in tasks}
+
+        runs = [('reference', lambda loads: reference_assign(tasks, staff_ids, loads, capacity))]
+        runs += [(name, lambda loads, name=name: assign_rooms(tasks, staff_ids, loads, capacity, name)) for name in STRATEGIES]
+
+        self.stdout.write(f"{len(tasks)} rooms, {len(staff_ids)} staff")
+        self.stdout.write(
+            f"{'strategy':>10} {'route':>6} {'ms':>8} {'assigned':>9} {'minutes':>8} {'unassigned':>11} {'moved':>6} "
+            f"{'floors/cleaner':>15} {'walk h':>7} {'walk min/cleaner':>17} {'rooms/h':>8}  valid"
+        )
+        expected = None
+        for name, run in runs:
+            elapsed, (assignment, loads) = timer.time(lambda: self.run(run, load), options['repeat'])
+            if name == 'reference':
+                expected = assignment
+            # Same rules everywhere: sticky rooms stay while they fit, nobody goes over capacity
+            valid = all(loads[uid] <= capacity[uid] for uid in staff_ids) and self.sticky_kept(tasks, assignment, load, capacity)
+            if name == 'greedy':
+                valid = valid and assignment == expected
+            worked = {}
+            for room_id, uid in assignment.items():
+                if uid is not None:
+                    worked.setdefault(uid, set()).add(stops[room_id][1])
+            assigned = sum(1 for uid in assignment.values() if uid is not None)
+            minutes = sum(efforts[room_id] for room_id, uid in assignment.items() if uid is not None)
+            moved = sum(1 for room_id, _, current, _ in tasks if current is not None and assignment[room_id] != current)
+            # The reference is today's output; it is walked both as the app lists it and along a route
+            for route in ((False, True) if name == 'reference' else (True,)):
+                travel = sum(simulate_travel(assignment, tasks, stops, route).values()) / 60
+                self.stdout.write(
+                    f"{name:>10} {'yes' if route else 'no':>6} {elapsed:>8.1f} {assigned:>9} {minutes:>8} "
+                    f"{len(tasks) - assigned:>11} {moved:>6} {statistics.mean(len(f) for f in worked.values()):>15.2f} "
+                    f"{travel / 60:>7.1f} {travel / len(worked):>17.1f} {assigned / ((minutes + travel) / 60):>8.2f}  {valid}"
+                )
+        self.stdout.write(f"{sum(efforts.values())} minutes of rooms, {sum(capacity.values()) - sum(load.values())} minutes of free capacity")
+
+    def run(self, run, load):
+        loads = dict(load)
+        return run(loads), loads
+
+    def sticky_kept(self, tasks, assignment, load, capacity):
+        """ A room only leaves its cleaner when that cleaner is full by the time it comes up. """
+        loads = dict(load)
+        for room_id, effort, current, _ in tasks:
+            uid = assignment[room_id]
+            if current in loads and uid != current and (loads[current] + effort) / capacity[current] <= MAX_CAPACITY_RATIO:
+                return False
+            if uid is not None:
+                loads[uid] += effort
+        return True
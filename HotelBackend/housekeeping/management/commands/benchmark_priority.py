@@ -0,0 +1,68 @@
+import random
+from datetime import timedelta, timezone as dt_timezone
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from housekeeping.models import Room
+from housekeeping.logic import priority
+from housekeeping.logic.priority import PRIORITY_FIELDS, get_room_priority_score, score_rooms, priority_columns
+from .benchmark_room_list import Command as RoomListBenchmark
+
+CLEANING_TYPES = [c for c, _ in Room.CLEANING_TYPE_CHOICES]
+GUEST_STATUSES = [g for g, _ in Room.GUEST_STATUS_CHOICES]
+STATUSES = [s for s, _ in Room.STATUS_CHOICES]
+
+
+def synthetic_rooms(size, now, seed=42):
+    """ Unsaved rooms with every scoring branch represented; arrivals within +-2 days. """
+    rng = random.Random(seed)
+    return [
+        Room(
+            number=str(i), cleaning_type=rng.choice(CLEANING_TYPES), guest_status=rng.choice(GUEST_STATUSES),
+            status=rng.choice(STATUSES), priority=rng.random() < 0.1,
+            next_arrival_time=now + timedelta(microseconds=rng.randint(-2 * 86400 * 10**6, 2 * 86400 * 10**6))
+            if rng.random() < 0.7 else None,
+        )
+        for i in range(size)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compares get_room_priority_score in a loop against batch score_rooms on synthetic rooms (no database).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3, help='Best-of-N timing')
+
+    def handle(self, *args, **options):
+        if priority.np is None:
+            self.stdout.write('NumPy not installed; score_rooms falls back to the scalar function')
+        timer = RoomListBenchmark()
+        now = timezone.now()
+        self.stdout.write(
+            f"{'rooms':>7} {'scalar ms':>10} {'instances ms':>13} {'speedup':>8} {'tuples ms':>10} {'speedup':>8} "
+            f"{'dt64 ms':>8} {'speedup':>8}  identical"
+        )
+        for size in options['sizes']:
+            rooms = synthetic_rooms(size, now)
+            rows = [tuple(getattr(room, field) for field in PRIORITY_FIELDS) for room in rooms]
+            scalar_ms, expected = timer.time(lambda: [get_room_priority_score(r, now) for r in rooms], options['repeat'])
+            # End to end: building the columns is part of the cost, from model instances or values_list() rows
+            instances_ms, scores = timer.time(lambda: score_rooms(priority_columns(rooms), now), options['repeat'])
+            tuples_ms, tuple_scores = timer.time(lambda: score_rooms(priority_columns(rows), now), options['repeat'])
+            identical = list(scores) == expected and list(tuple_scores) == expected
+            line = (
+                f"{size:>7} {scalar_ms:>10.1f} {instances_ms:>13.1f} {scalar_ms / instances_ms:>7.1f}x "
+                f"{tuples_ms:>10.1f} {scalar_ms / tuples_ms:>7.1f}x "
+            )
+            if priority.np is not None:
+                # Arrival times already held as a datetime64 column (e.g. a what-if model), no per-row conversion
+                columns = priority_columns(rows)
+                arrivals = priority.np.array(
+                    [a and a.astimezone(dt_timezone.utc).replace(tzinfo=None) for a in columns['next_arrival_time']],
+                    dtype='datetime64[us]',
+                )
+                typed = dict(columns, next_arrival_time=arrivals)
+                typed_ms, typed_scores = timer.time(lambda: score_rooms(typed, now), options['repeat'])
+                identical = identical and list(typed_scores) == expected
+                line += f"{typed_ms:>8.1f} {scalar_ms / typed_ms:>7.1f}x "
+            self.stdout.write(f"{line} {identical}")
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from hotel_backend.renderers import FastJSONRenderer, MessagePackRenderer, orjson, msgpack
+from housekeeping.models import Room
+from housekeeping.fast_read import room_reader
+from .benchmark_room_list import Command as RoomListBenchmark, Rollback
+
+
+class Command(BaseCommand):
+    help = 'Compares encode time and size of the room list per renderer. Seeds rooms in a transaction that is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000])
+        parser.add_argument('--repeat', type=int, default=5, help='Best-of-N timing')
+
+    def handle(self, *args, **options):
+        renderers = [('drf json', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('orjson', FastJSONRenderer()))
+        else:
+            self.stdout.write('orjson not installed; FastJSONRenderer falls back to the stdlib encoder')
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+        else:
+            self.stdout.write('msgpack not installed; skipping MessagePackRenderer')
+
+        self.stdout.write(f"{'rooms':>7} {'renderer':>10} {'encode ms':>10} {'bytes':>10}")
+        seeder = RoomListBenchmark()
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    room_ids = seeder.seed(size)
+                    data = room_reader.render(Room.objects.filter(pk__in=room_ids).order_by('number'))
+                    for name, renderer in renderers:
+                        elapsed, body = seeder.time(lambda: renderer.render(data), options['repeat'])
+                        self.stdout.write(f"{size:>7} {name:>10} {elapsed:>10.1f} {len(body):>10}")
+                    raise Rollback()
+            except Rollback:
+                pass
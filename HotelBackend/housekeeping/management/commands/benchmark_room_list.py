@@ -0,0 +1,78 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+from housekeeping.models import Room, Incident
+from housekeeping.serializers import RoomSerializer
+from housekeeping.fast_read import room_reader
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compares RoomSerializer against the fast values() room list renderer. Seeds rooms in a transaction that is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000])
+        parser.add_argument('--repeat', type=int, default=3, help='Best-of-N timing')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rooms':>7} {'serializer ms':>14} {'fast ms':>9} {'speedup':>8}  identical")
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    room_ids = self.seed(size)
+                    self.run(room_ids, options['repeat'])
+                    raise Rollback()
+            except Rollback:
+                pass
+
+    def seed(self, size):
+        """ Returns the ids of the seeded rooms, so real rooms never end up in the benchmark. """
+        rooms = Room.objects.bulk_create(
+            [
+                Room(
+                    number=str(900000 + i), status='PENDING' if i % 3 else 'COMPLETED',
+                    assigned_group=f'Group {i % 10 + 1}', guest_details={'guests': i % 4},
+                    supplies_used={'Shampoo': i % 3},
+                )
+                for i in range(size)
+            ],
+            batch_size=1000,
+        )
+        Incident.objects.bulk_create(
+            [Incident(room=room, text='Benchmark incident') for room in rooms[: size // 5]],
+            batch_size=1000,
+        )
+        return [room.pk for room in rooms]
+
+    def run(self, room_ids, repeat):
+        size = len(room_ids)
+        queryset = Room.objects.filter(pk__in=room_ids).order_by('number')
+
+        def serializer_path():
+            rooms = queryset.select_related('assigned_cleaner').prefetch_related(
+                Prefetch('incidents', queryset=Incident.objects.select_related('reported_by').order_by('id'))
+            )
+            return JSONRenderer().render(RoomSerializer(rooms, many=True).data)
+
+        def fast_path():
+            return JSONRenderer().render(room_reader.render(queryset))
+
+        slow_ms, slow_body = self.time(serializer_path, repeat)
+        fast_ms, fast_body = self.time(fast_path, repeat)
+        self.stdout.write(
+            f"{size:>7} {slow_ms:>14.1f} {fast_ms:>9.1f} {slow_ms / fast_ms:>7.1f}x  {slow_body == fast_body}"
+        )
+
+    def time(self, function, repeat):
+        best, body = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = function()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
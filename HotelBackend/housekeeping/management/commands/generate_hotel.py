@@ -0,0 +1,290 @@
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from accounts.models import CustomUser
+from housekeeping.models import (
+    Room, Incident, CleaningSession, CleaningTypeDefinition, LostItem, Announcement, Asset,
+    InventoryItem, StaffAvailability, WorkShift, RoomStatusEvent,
+)
+
+BATCH_SIZE = 1000
+
+# Share of the staff per role; cleaners take whatever is left
+STAFF_MIX = (('SUPERVISOR', 0.06), ('HOUSEMAN', 0.10), ('MAINTENANCE', 0.08), ('RECEPTION', 0.04), ('ADMIN', 0.02))
+
+CLEANING_TYPES = {'DEPARTURE': 45, 'PREARRIVAL': 30, 'WEEKLY': 40, 'HOLDOVER': 20, 'RUBBISH': 10, 'DAYUSE': 25}
+ROOM_TYPES = (('Single', '1 Queen', 1), ('Double', '2 Queens', 1), ('Suite', '1 King, 1 Sofa Bed', 2))
+INCIDENT_TEXTS = (
+    'Leaking tap', 'Light bulb out', 'Extra towels', 'AC not cooling', 'Broken hanger',
+    'Stained carpet', 'Guest requests cot', 'TV remote missing', 'Shower drain slow', 'Restock minibar',
+)
+LOST_ITEMS = ('Phone charger', 'Sunglasses', 'Watch', 'Book', 'Jacket', 'Earrings', 'Laptop', 'Teddy bear')
+ASSETS = ('Air conditioner', 'Television', 'Fridge', 'Kettle', 'Safe')
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a synthetic hotel for benchmarking: rooms, staff in groups, shifts and availability, '
+        'incident and lost-item history and cleaning sessions. The same --seed and --date give the same data. '
+        'Refuses to run on a database with rooms unless --reset is given, which FLUSHES THE WHOLE DATABASE first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=10000)
+        parser.add_argument('--rooms-per-floor', type=int, default=40)
+        parser.add_argument('--staff', type=int, default=300)
+        parser.add_argument('--groups', type=int, default=10, help='Cleaning teams (the app offers Group 1 - Group 10)')
+        parser.add_argument('--weeks', type=int, default=4, help='Weeks of history; shifts also cover next week')
+        parser.add_argument('--incidents-per-room', type=float, default=3.0)
+        parser.add_argument('--lost-items-per-room', type=float, default=0.2)
+        parser.add_argument('--cleanings-per-room-day', type=float, default=0.05, help='Status history density')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--date', help='Day the data is generated around (YYYY-MM-DD, default today)')
+        parser.add_argument('--username-prefix', default='gen_', help='Prefix of generated usernames')
+        parser.add_argument('--password', default='password123', help='Password of every generated user')
+        parser.add_argument('--reset', action='store_true')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['username_prefix']
+        try:
+            self.today = datetime.strptime(options['date'], '%Y-%m-%d').date() if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError('--date must be YYYY-MM-DD.')
+        self.now = timezone.make_aware(datetime.combine(self.today, dt_time(10, 0)))
+
+        if not 1 <= options['rooms_per_floor'] <= 999:
+            raise CommandError('--rooms-per-floor must be between 1 and 999.')
+        if Room.objects.exists() and not options['reset']:
+            raise CommandError('The database already has rooms. Use --reset to replace them.')
+
+        start = time.perf_counter()
+        if options['reset']:
+            # Deleting row by row would fire the change-feed signals for every row
+            call_command('flush', interactive=False, verbosity=0)
+        with transaction.atomic():
+            self.step('cleaning types', self.create_cleaning_types)
+            staff = self.step('staff', self.create_staff, options['staff'], options['groups'], options['password'])
+            rooms = self.step('rooms', self.create_rooms, options['rooms'], options['rooms_per_floor'], staff)
+            self.step('shifts / availability', self.create_rosters, staff, options['weeks'])
+            self.step('incidents', self.create_incidents, rooms, staff, options['weeks'], options['incidents_per_room'])
+            self.step('lost items', self.create_lost_items, rooms, staff, options['weeks'], options['lost_items_per_room'])
+            self.step('assets', self.create_assets, rooms)
+            self.step('sessions', self.create_sessions, options['groups'], options['weeks'])
+            self.step('status events', self.create_status_history, rooms, options['weeks'], options['cleanings_per_room_day'])
+            self.step('announcements / inventory', self.create_misc, staff)
+        self.stdout.write(self.style.SUCCESS(f'Generated hotel in {time.perf_counter() - start:.1f}s'))
+
+    def step(self, label, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        count = len(result) if isinstance(result, (list, dict)) else result
+        self.stdout.write(f'{label:>26}: {count:>8} rows in {(time.perf_counter() - start) * 1000:>7.0f} ms')
+        return result
+
+    def backdated_create(self, model, objects, field='created_at'):
+        """ bulk_create that keeps the history timestamps instead of letting auto_now_add stamp them now. """
+        model_field = model._meta.get_field(field)
+        model_field.auto_now_add = False
+        try:
+            model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        finally:
+            model_field.auto_now_add = True
+
+    def create_cleaning_types(self):
+        for name, minutes in CLEANING_TYPES.items():
+            CleaningTypeDefinition.objects.get_or_create(name=name, defaults={'estimated_minutes': minutes})
+        return len(CLEANING_TYPES)
+
+    def create_staff(self, count, groups, password):
+        # Hashing once instead of per user keeps hundreds of users well under a second
+        password = make_password(password)
+        roles = []
+        for role, share in STAFF_MIX:
+            roles += [role] * max(1, round(count * share))
+        roles += ['CLEANER'] * max(0, count - len(roles))
+        users = []
+        for i, role in enumerate(roles):
+            users.append(CustomUser(
+                username=f'{self.prefix}{role.lower()}{i:04d}', password=password, role=role,
+                first_name=role.title(), last_name=str(i), is_staff=role == 'ADMIN',
+                group_id=f'Group {i % groups + 1}' if role == 'CLEANER' else None,
+            ))
+        CustomUser.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        return list(CustomUser.objects.filter(username__startswith=self.prefix).order_by('username'))
+
+    def create_rooms(self, count, per_floor, staff):
+        rng = self.rng
+        cleaners = {}
+        for user in staff:
+            if user.role == 'CLEANER':
+                cleaners.setdefault(user.group_id, []).append(user)
+        group_names = sorted(cleaners)
+        statuses = ['PENDING'] * 6 + ['IN_PROGRESS'] * 2 + ['INSPECTION', 'COMPLETED', 'COMPLETED', 'MAINTENANCE']
+        rooms = []
+        for i in range(count):
+            floor, index = divmod(i, per_floor)
+            room_type, beds, bedrooms = rng.choice(ROOM_TYPES)
+            status = rng.choice(statuses)
+            guest_status = rng.choice(('NO_GUEST', 'GUEST_IN_ROOM', 'GUEST_OUT', 'GUEST_OUT', 'DND'))
+            occupied = guest_status != 'NO_GUEST'
+            check_out = self.today + timedelta(days=rng.randint(0, 6)) if occupied else None
+            group = group_names[i * len(group_names) // count] if group_names and rng.random() < 0.8 else None
+            cleaner = rng.choice(cleaners[group]) if group and rng.random() < 0.5 else None
+            rooms.append(Room(
+                number=f'{floor + 1}{index + 1:03d}', floor=floor + 1, zone='East' if index < per_floor / 2 else 'West',
+                room_type=room_type, bed_setup=beds, bedroom_count=bedrooms,
+                status=status, cleaning_type=rng.choice(list(CLEANING_TYPES)), guest_status=guest_status,
+                assigned_group=group, assigned_cleaner=cleaner, priority=rng.random() < 0.1,
+                maintenance_reason='Scheduled maintenance' if status == 'MAINTENANCE' else None,
+                current_guest_name=f'Guest {i}' if occupied else None,
+                check_in_date=self.today - timedelta(days=rng.randint(0, 6)) if occupied else None,
+                check_out_date=check_out,
+                guest_details={
+                    'reservation_number': str(6000000 + i), 'guests': f'{rng.randint(1, 3)}A',
+                    'departure_date': check_out.isoformat(),
+                } if occupied else {},
+                is_guest_waiting=occupied and rng.random() < 0.05,
+                cleaning_started_at=self.now - timedelta(minutes=rng.randint(1, 60)) if status == 'IN_PROGRESS' else None,
+                last_cleaned=self.now - timedelta(days=rng.randint(0, 3)),
+            ))
+        Room.objects.bulk_create(rooms, batch_size=BATCH_SIZE)
+        return list(Room.objects.order_by('id').only('id', 'number', 'assigned_group'))
+
+    def create_rosters(self, staff, weeks):
+        rng = self.rng
+        first = self.today - timedelta(days=self.today.weekday() + 7 * weeks)
+        days = [first + timedelta(days=d) for d in range(7 * (weeks + 2))]
+        shifts, availability = [], []
+        for user in staff:
+            days_off = set(rng.sample(range(7), 2))
+            vacation = rng.randrange(len(days)) if rng.random() < 0.1 else None
+            for n, day in enumerate(days):
+                if vacation is not None and vacation <= n < vacation + 5:
+                    availability.append(StaffAvailability(user=user, date=day, status='VACATION'))
+                elif day.weekday() in days_off:
+                    availability.append(StaffAvailability(user=user, date=day, status='OFF'))
+                elif rng.random() < 0.05:
+                    availability.append(StaffAvailability(
+                        user=user, date=day, status='PARTIAL', start_time=dt_time(9, 0), end_time=dt_time(13, 0),
+                    ))
+                    shifts.append(WorkShift(user=user, date=day, start_time=dt_time(9, 0), end_time=dt_time(13, 0)))
+                else:
+                    availability.append(StaffAvailability(user=user, date=day, status='AVAILABLE'))
+                    shifts.append(WorkShift(user=user, date=day))
+        StaffAvailability.objects.bulk_create(availability, batch_size=BATCH_SIZE)
+        WorkShift.objects.bulk_create(shifts, batch_size=BATCH_SIZE)
+        return len(availability) + len(shifts)
+
+    def create_incidents(self, rooms, staff, weeks, per_room):
+        rng = self.rng
+        reporters = [u for u in staff if u.role in ('CLEANER', 'HOUSEMAN', 'RECEPTION')] or staff
+        fixers = [u for u in staff if u.role in ('MAINTENANCE', 'HOUSEMAN')] or staff
+        categories = [c for c, _ in Incident.CATEGORY_CHOICES]
+        priorities = [p for p, _ in Incident.PRIORITY_CHOICES]
+        incidents = []
+        for _ in range(round(len(rooms) * per_room)):
+            created = self.now - timedelta(minutes=rng.randint(0, weeks * 7 * 24 * 60))
+            # Older incidents are mostly resolved; the last day or two is the open backlog
+            resolved = created < self.now - timedelta(days=2) and rng.random() < 0.95
+            category = rng.choice(categories)
+            incidents.append(Incident(
+                room=rng.choice(rooms), text=rng.choice(INCIDENT_TEXTS), priority=rng.choice(priorities),
+                status='RESOLVED' if resolved else 'OPEN', category=category,
+                target_role='HOUSEMAN' if category in ('GUEST_REQ', 'SUPPLY') else 'MAINTENANCE',
+                reported_by=rng.choice(reporters), assigned_to=rng.choice(fixers) if rng.random() < 0.5 else None,
+                created_at=created, resolved_at=created + timedelta(hours=rng.randint(1, 48)) if resolved else None,
+            ))
+        self.backdated_create(Incident, incidents)
+        return incidents
+
+    def create_lost_items(self, rooms, staff, weeks, per_room):
+        rng = self.rng
+        items = []
+        for _ in range(round(len(rooms) * per_room)):
+            created = self.now - timedelta(minutes=rng.randint(0, weeks * 7 * 24 * 60))
+            old = created < self.now - timedelta(days=7)
+            items.append(LostItem(
+                description=rng.choice(LOST_ITEMS), room=rng.choice(rooms), found_by=rng.choice(staff),
+                status=rng.choice(('RETURNED', 'DISPOSED', 'FOUND')) if old else 'FOUND', created_at=created,
+            ))
+        self.backdated_create(LostItem, items)
+        return items
+
+    def create_assets(self, rooms):
+        rng = self.rng
+        assets = [
+            Asset(
+                room=room, name=name, serial_number=f'SN-{room.number}-{n}',
+                install_date=self.today - timedelta(days=rng.randint(30, 3000)),
+                status=rng.choice(('GOOD',) * 8 + ('REPAIR', 'BROKEN')),
+            )
+            for room in rooms for n, name in enumerate(ASSETS) if rng.random() < 0.3
+        ]
+        Asset.objects.bulk_create(assets, batch_size=BATCH_SIZE)
+        return assets
+
+    def create_sessions(self, groups, weeks):
+        rng = self.rng
+        sessions = []
+        for days_ago in range(weeks * 7, -1, -1):
+            day = self.today - timedelta(days=days_ago)
+            for g in range(1, groups + 1):
+                start = timezone.make_aware(datetime.combine(day, dt_time(9, rng.randint(0, 30))))
+                if days_ago == 0:
+                    sessions.append(CleaningSession(group_id=f'Group {g}', start_time=start, target_duration_minutes=420))
+                    continue
+                worked = rng.randint(360, 500)
+                sessions.append(CleaningSession(
+                    group_id=f'Group {g}', start_time=start, end_time=start + timedelta(minutes=worked),
+                    target_duration_minutes=420, break_minutes=30,
+                    status='OVERTIME' if worked > 450 else 'COMPLETED',
+                ))
+        self.backdated_create(CleaningSession, sessions, 'start_time')
+        return sessions
+
+    def create_status_history(self, rooms, weeks, per_room_day):
+        """ Past cleaning cycles (PENDING -> IN_PROGRESS -> INSPECTION -> COMPLETED) for the activity charts. """
+        rng = self.rng
+        events = []
+        for days_ago in range(weeks * 7, 0, -1):
+            day = self.today - timedelta(days=days_ago)
+            for room in rng.sample(rooms, min(len(rooms), round(len(rooms) * per_room_day))):
+                group = room.assigned_group
+                started = timezone.make_aware(datetime.combine(day, dt_time(9, 0))) + timedelta(minutes=rng.randint(0, 420))
+                finished = started + timedelta(minutes=rng.randint(15, 60))
+                events += [
+                    RoomStatusEvent(room=room, room_number=room.number, from_status='PENDING', to_status='IN_PROGRESS',
+                                    group_id=group, timestamp=started),
+                    RoomStatusEvent(room=room, room_number=room.number, from_status='IN_PROGRESS', to_status='INSPECTION',
+                                    group_id=group, duration_seconds=int((finished - started).total_seconds()), timestamp=finished),
+                    RoomStatusEvent(room=room, room_number=room.number, from_status='INSPECTION', to_status='COMPLETED',
+                                    group_id=group, timestamp=finished + timedelta(minutes=rng.randint(5, 90))),
+                ]
+        RoomStatusEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+        return events
+
+    def create_misc(self, staff):
+        senders = [u for u in staff if u.role in ('SUPERVISOR', 'ADMIN')] or staff
+        announcements = [
+            Announcement(
+                title=f'Briefing {n + 1}', message='Daily housekeeping briefing.', sender=self.rng.choice(senders),
+                priority='HIGH' if n % 10 == 0 else 'NORMAL', created_at=self.now - timedelta(days=n),
+            )
+            for n in range(50)
+        ]
+        self.backdated_create(Announcement, announcements)
+        inventory = 0
+        for category, _ in InventoryItem.CATEGORY_CHOICES:
+            for n in range(5):
+                _, created = InventoryItem.objects.get_or_create(
+                    name=f'{category.title()} item {n + 1}',
+                    defaults={'category': category, 'quantity': self.rng.randint(0, 200), 'min_stock': 20},
+                )
+                inventory += created
+        return len(announcements) + inventory
@@ -57,6 +57,9 @@ class Command(BaseCommand):
                 room.assigned_group = group_name
                 room.cleaning_type = cleaning_type
                 room.notes = room_data.get('notes', '')
+                # Location, when the export has it (save() falls back to the room number for the floor)
+                room.floor = room_data.get('floor', room.floor)
+                room.zone = room_data.get('zone', room.zone)
                 
                 # Status Logic based on In/Out
                 in_out = room_data.get('in_out')
@@ -215,6 +215,9 @@ class Command(BaseCommand):
             room.cleaning_type = cleaning_type
             room.room_type = room_data.get('room_type', room.room_type)
             room.notes = room_data.get('notes', '')
+            # Location, when the export has it (save() falls back to the room number for the floor)
+            room.floor = room_data.get('floor', room.floor)
+            room.zone = room_data.get('zone', room.zone)
             
             # Guest Stats
             # In input: status_in_out -> "In" / "Out" / null
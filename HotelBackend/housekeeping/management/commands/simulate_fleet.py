@@ -0,0 +1,280 @@
+import asyncio
+import json
+import random
+import re
+import time
+from urllib.parse import quote, urlsplit
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from accounts.models import CustomUser
+
+API = '/api/housekeeping'
+DEFAULT_FLEET = ['CLEANER=50', 'HOUSEMAN=5', 'MAINTENANCE=5', 'SUPERVISOR=3', 'RECEPTION=2']
+# Same endpoints the app's 10 s polling loop hits (HotelContext), besides rooms, the session and lost items
+POLL_ENDPOINTS = ('announcements', 'assets')
+# Roles that also poll lost items
+LOST_ITEM_POLL_ROLES = ('RECEPTION', 'ADMIN', 'MAINTENANCE')
+# Roles whose screens load every room (fetchRooms sends ?scope=all for them)
+ALL_ROOMS_ROLES = ('HOUSEMAN', 'MAINTENANCE')
+
+
+class HTTPConnection:
+    """ Minimal keep-alive HTTP/1.1 client on asyncio streams; one request at a time. """
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body=b''):
+        # A server may drop an idle keep-alive connection; retry once on a fresh one
+        for attempt in (1, 2):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._exchange(method, path, headers, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if not reused or attempt == 2:
+                    raise
+
+    async def _exchange(self, method, path, headers, body):
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {len(body)}']
+        head += [f'{name}: {value}' for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            content = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            content = await self.reader.readexactly(int(response_headers['content-length']))
+        elif status in (204, 304) or method == 'HEAD':
+            content = b''
+        else:
+            content = await self.reader.read()
+            response_headers['connection'] = 'close'
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, response_headers, content
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Stats:
+    def __init__(self):
+        self.samples = {} # (method, endpoint) -> [(elapsed ms, status, bytes)]
+
+    def add(self, method, path, elapsed_ms, status, size):
+        # /rooms/12/?x=1 -> /rooms/{id}/
+        endpoint = re.sub(r'/\d+/', '/{id}/', path.split('?')[0])
+        self.samples.setdefault((method, endpoint), []).append((elapsed_ms, status, size))
+
+    def report(self, seconds):
+        rows = []
+        for (method, endpoint), samples in sorted(self.samples.items(), key=lambda item: -len(item[1])):
+            latencies = sorted(s[0] for s in samples)
+            # 304 is a successful poll; 0 marks a connection failure
+            errors = sum(1 for s in samples if s[1] == 0 or s[1] >= 400)
+            rows.append({
+                'method': method, 'endpoint': endpoint, 'requests': len(samples),
+                'rps': round(len(samples) / seconds, 2), 'errors': errors,
+                'error_rate': round(errors / len(samples), 4),
+                'not_modified': sum(1 for s in samples if s[1] == 304),
+                'p50_ms': round(percentile(latencies, 0.50), 1),
+                'p95_ms': round(percentile(latencies, 0.95), 1),
+                'p99_ms': round(percentile(latencies, 0.99), 1),
+                'max_ms': round(latencies[-1], 1),
+                'mean_bytes': round(sum(s[2] for s in samples) / len(samples)),
+            })
+        return rows
+
+
+def percentile(sorted_values, fraction):
+    """ Nearest-rank percentile. """
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Device:
+    def __init__(self, user, token, options, stats, rng, host, port):
+        self.user, self.role = user, user.role
+        self.options, self.stats, self.rng = options, stats, rng
+        self.host, self.port = host, port
+        self.headers = {'Authorization': f'Token {token}', 'Accept': 'application/json', 'Content-Type': 'application/json'}
+        self.idle = [] # Pooled connections; the app fires its polls in parallel
+        self.etags = {}
+        self.last_rooms = b''
+        self.cleaning = None
+
+    async def request(self, method, path, payload=None):
+        headers = dict(self.headers)
+        if method == 'GET' and self.options['conditional'] and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+        body = json.dumps(payload).encode() if payload is not None else b''
+        connection = self.idle.pop() if self.idle else HTTPConnection(self.host, self.port)
+        start = time.perf_counter()
+        try:
+            status, response_headers, content = await connection.request(method, path, headers, body)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            connection.close()
+            self.stats.add(method, path, (time.perf_counter() - start) * 1000, 0, 0)
+            return 0, b''
+        self.stats.add(method, path, (time.perf_counter() - start) * 1000, status, len(content))
+        self.idle.append(connection)
+        if 'etag' in response_headers:
+            self.etags[path] = response_headers['etag']
+        return status, content
+
+    async def run(self, deadline):
+        interval = self.options['interval']
+        # Devices do not poll in lockstep; spread the first tick over one interval
+        await asyncio.sleep(self.rng.uniform(0, interval))
+        while time.monotonic() < deadline:
+            tick = time.monotonic()
+            await self.poll()
+            if self.role == 'CLEANER':
+                await self.clean()
+            await asyncio.sleep(max(0, interval - (time.monotonic() - tick)))
+        for connection in self.idle:
+            connection.close()
+
+    async def poll(self):
+        calls = [self.fetch_rooms()] + [self.request('GET', f'{API}/{endpoint}/') for endpoint in POLL_ENDPOINTS]
+        if self.user.group_id:
+            calls.append(self.request('GET', f'{API}/cleaning-sessions/current/?group_id={quote(self.user.group_id)}'))
+        if self.role in LOST_ITEM_POLL_ROLES:
+            calls.append(self.request('GET', f'{API}/lost-items/'))
+        await asyncio.gather(*calls)
+
+    async def fetch_rooms(self):
+        # fetchRooms loads the incidents right after the rooms
+        status, content = await self.request('GET', f'{API}/rooms/?scope=all' if self.role in ALL_ROOMS_ROLES else f'{API}/rooms/')
+        if status == 200:
+            self.last_rooms = content
+        await self.request('GET', f'{API}/incidents/')
+
+    async def clean(self):
+        """ Start cleaning a pending room now and then, finish it a few ticks later (startCleaning / stopCleaning). """
+        now = timezone.now()
+        if self.cleaning is not None:
+            room_id, started, ticks = self.cleaning
+            if ticks > 1:
+                self.cleaning = (room_id, started, ticks - 1)
+                return
+            self.cleaning = None
+            await self.request('PATCH', f'{API}/rooms/{room_id}/', {
+                'last_cleaning_duration': int((now - started).total_seconds()), 'cleaning_started_at': None,
+            })
+            await self.request('PATCH', f'{API}/rooms/{room_id}/', {'status': 'INSPECTION'})
+            return
+        if self.rng.random() >= self.options['clean_rate'] or not self.last_rooms:
+            return
+        pending = [r['id'] for r in json.loads(self.last_rooms) if r.get('status') == 'PENDING']
+        if not pending:
+            return
+        room_id = self.rng.choice(pending)
+        # The app sends these back to back when a cleaner taps start
+        await asyncio.gather(
+            self.request('PATCH', f'{API}/rooms/{room_id}/', {'status': 'IN_PROGRESS', 'cleaning_started_at': now.isoformat()}),
+            self.request('PATCH', f'{API}/rooms/{room_id}/', {'status': 'IN_PROGRESS'}),
+        )
+        self.cleaning = (room_id, now, self.rng.randint(2, 6))
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulates a fleet of HotelFlow devices against a running server: every device polls like the app '
+        '(rooms + incidents, session, announcements, assets, lost items by role) each --interval seconds and '
+        'cleaners PATCH rooms when they start and finish cleaning. Reports throughput, p50/p95/p99 latency and '
+        'error rate per endpoint. Devices log in as existing users of each role (see generate_hotel) and '
+        'change room data, so point it at a disposable database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--devices', nargs='+', default=DEFAULT_FLEET, metavar='ROLE=N')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds between polls per device')
+        parser.add_argument('--clean-rate', type=float, default=0.2, help='Chance per poll that an idle cleaner starts a room')
+        parser.add_argument('--conditional', action='store_true', help='Send If-None-Match with the last ETag per list')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', help='Also write the report to this file')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('--url must be an http:// server address.')
+        fleet = {}
+        for spec in options['devices']:
+            role, _, count = spec.partition('=')
+            if role.upper() not in dict(CustomUser.ROLE_CHOICES) or not count.isdigit():
+                raise CommandError(f'Invalid device spec {spec!r}; use ROLE=N, e.g. CLEANER=50.')
+            fleet[role.upper()] = int(count)
+
+        rng = random.Random(options['seed'])
+        stats = Stats()
+        devices = []
+        for role, count in fleet.items():
+            users = list(CustomUser.objects.filter(role=role, is_active=True).order_by('id'))
+            if count and not users:
+                raise CommandError(f'No {role} users to log in as; run generate_hotel first.')
+            # More devices than users means some users are on several devices
+            for n in range(count):
+                user = users[n % len(users)]
+                token, _ = Token.objects.get_or_create(user=user)
+                devices.append(Device(user, token.key, options, stats, random.Random(rng.random()), url.hostname, url.port or 80))
+
+        self.stdout.write(f"Simulating {len(devices)} devices against {options['url']} for {options['duration']:.0f}s...")
+        start = time.monotonic()
+        asyncio.run(self.run(devices, start + options['duration']))
+        elapsed = time.monotonic() - start
+        rows = stats.report(elapsed)
+
+        self.stdout.write(
+            f"{'method':<6} {'endpoint':<44} {'reqs':>6} {'rps':>7} {'err %':>6} {'304':>5} "
+            f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'bytes':>9}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['method']:<6} {row['endpoint']:<44} {row['requests']:>6} {row['rps']:>7.2f} "
+                f"{row['error_rate'] * 100:>6.2f} {row['not_modified']:>5} {row['p50_ms']:>7.1f} "
+                f"{row['p95_ms']:>7.1f} {row['p99_ms']:>7.1f} {row['mean_bytes']:>9}"
+            )
+        total = sum(row['requests'] for row in rows)
+        errors = sum(row['errors'] for row in rows)
+        summary = {
+            'devices': len(devices), 'seconds': round(elapsed, 1), 'requests': total,
+            'rps': round(total / elapsed, 2), 'error_rate': round(errors / total, 4) if total else 0,
+        }
+        self.stdout.write(
+            f"Total: {total} requests, {summary['rps']:.1f} req/s, error rate {summary['error_rate'] * 100:.2f}%"
+        )
+        if options['json']:
+            with open(options['json'], 'w') as handle:
+                json.dump({'summary': summary, 'endpoints': rows}, handle, indent=2)
+
+    async def run(self, devices, deadline):
+        await asyncio.gather(*(device.run(deadline) for device in devices))
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0028_cleaningsession_break_minutes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_id', models.BigIntegerField()),
+                ('number', models.CharField(max_length=10)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0029_roomtombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='last_updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='last_updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='incident',
+            name='last_updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
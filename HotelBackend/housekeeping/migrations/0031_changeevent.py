@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0030_list_last_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ROOM', 'Room'), ('INCIDENT', 'Incident'), ('SESSION', 'Cleaning Session')], max_length=20)),
+                ('action', models.CharField(choices=[('SAVED', 'Saved'), ('DELETED', 'Deleted')], default='SAVED', max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('group_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
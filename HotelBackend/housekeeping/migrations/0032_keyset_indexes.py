@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 13:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0031_changeevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['-created_at', '-id'], name='announcement_created_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['-created_at', '-id'], name='incident_created_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='incident_status_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='lostitem',
+            index=models.Index(fields=['-created_at', '-id'], name='lostitem_created_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='lostitem',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='lostitem_status_keyset'),
+        ),
+    ]
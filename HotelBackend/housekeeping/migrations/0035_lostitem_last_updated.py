@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0034_room_group_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lostitem',
+            name='last_updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 12:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0035_lostitem_last_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('transitions', models.IntegerField(default=0)),
+                ('by_status', models.JSONField(blank=True, default=dict)),
+                ('rooms_cleaned', models.IntegerField(default=0)),
+                ('cleanings', models.IntegerField(default=0)),
+                ('cleaning_seconds', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RoomStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_number', models.CharField(max_length=10)),
+                ('from_status', models.CharField(blank=True, choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In Progress'), ('INSPECTION', 'Inspection'), ('COMPLETED', 'Completed'), ('MAINTENANCE', 'Maintenance')], max_length=20)),
+                ('to_status', models.CharField(choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In Progress'), ('INSPECTION', 'Inspection'), ('COMPLETED', 'Completed'), ('MAINTENANCE', 'Maintenance')], max_length=20)),
+                ('group_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('duration_seconds', models.IntegerField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('room', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_events', to='housekeeping.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['timestamp'], name='room_status_event_time'), models.Index(fields=['room', 'timestamp'], name='room_status_event_room_time')],
+            },
+        ),
+    ]
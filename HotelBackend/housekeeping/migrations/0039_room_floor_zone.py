@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-18 13:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_floors(apps, schema_editor):
+    # Same numbers the API served when floor was derived at render time (room_floor at this point in history)
+    Room = apps.get_model('housekeeping', 'Room')
+    rooms = list(Room.objects.filter(floor__isnull=True).only('id', 'number'))
+    for room in rooms:
+        try:
+            room.floor = (int(room.number) - 1) // 20 + 1
+        except ValueError:
+            room.floor = 1
+    Room.objects.bulk_update(rooms, ['floor'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('housekeeping', '0038_room_last_updated'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='floor',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='zone',
+            field=models.CharField(blank=True, help_text="e.g. 'East Wing'", max_length=50, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['floor', 'zone'], name='room_floor_zone'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['zone'], name='room_zone'),
+        ),
+        migrations.RunPython(fill_floors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,146 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import permissions, serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def list_version(queryset, version_field='last_updated'):
+    """ One aggregate that changes whenever a row is added, removed or saved. """
+    return queryset.order_by().aggregate(
+        count=Count('pk'),
+        max_id=Max('pk'),
+        changed=Max(version_field),
+    )
+
+
+class ConditionalListMixin:
+    """
+    Answers unchanged list polls with a bodyless 304.
+
+    The ETag is derived from one aggregate (count / max id / max last_updated)
+    over the filtered queryset, so an idle poll never reaches the serializer.
+    """
+    version_field = 'last_updated'
+
+    def get_list_version(self, queryset):
+        return list_version(queryset, self.version_field)
+
+    def get_list_etag(self, request, queryset):
+        version = self.get_list_version(queryset)
+        # Same collection can render differently per path/query, user and Accept header
+        key = repr((request.get_full_path(), request.user.pk, request.META.get('HTTP_ACCEPT'), version))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request, self.filter_queryset(self.get_queryset()))
+
+        client_etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if etag in client_etags or '*' in client_etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class SparseFieldsetMixin:
+    """
+    Lets read requests ask for a subset of fields, either explicitly with
+    ``?fields=id,number,status`` or through a named ``?profile=`` from
+    `field_profiles`. Both the serializer output and the SQL column list
+    (``.only()``) are narrowed; unneeded joins and prefetches are dropped.
+
+    `sparse_columns` maps computed fields (e.g. SerializerMethodFields) to the
+    model columns they read; `sparse_required_columns` are always loaded.
+    """
+    field_profiles = {}
+    sparse_columns = {}
+    sparse_required_columns = ()
+
+    def get_sparse_prototype(self):
+        if not hasattr(self, '_sparse_prototype'):
+            self._sparse_prototype = self.get_serializer_class()(context=self.get_serializer_context())
+        return self._sparse_prototype
+
+    def get_sparse_fields(self):
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return None
+        params = self.request.query_params
+
+        if params.get('fields'):
+            names = [name.strip() for name in params['fields'].split(',') if name.strip()]
+        elif params.get('profile'):
+            profile = params['profile']
+            if profile not in self.field_profiles:
+                raise ValidationError({'profile': f"Unknown profile '{profile}'."})
+            names = list(self.field_profiles[profile])
+        else:
+            return None
+
+        available = self.get_sparse_prototype().fields
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}."})
+        if 'id' in available and 'id' not in names:
+            names.insert(0, 'id')
+        return names
+
+    def get_sparse_query_plan(self, names):
+        """
+        Returns (columns, needs_joins, needs_prefetch), or None when some field's
+        data source can't be derived, in which case all columns are loaded.
+        """
+        serializer = self.get_sparse_prototype()
+        model = serializer.Meta.model
+        columns = set(self.sparse_required_columns)
+        needs_joins = needs_prefetch = False
+
+        for name in names:
+            if name in self.sparse_columns:
+                columns.update(self.sparse_columns[name])
+                continue
+            field = serializer.fields[name]
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                return None
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return None
+            if model_field.one_to_many or model_field.many_to_many:
+                needs_prefetch = True
+            elif model_field.is_relation and len(field.source_attrs) > 1:
+                columns.add('__'.join(field.source_attrs))
+                needs_joins = True
+            else:
+                columns.add(model_field.name)
+        return columns, needs_joins, needs_prefetch
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        names = self.get_sparse_fields()
+        if names is None:
+            return queryset
+        plan = self.get_sparse_query_plan(names)
+        if plan is None:
+            return queryset
+
+        columns, needs_joins, needs_prefetch = plan
+        if not needs_joins:
+            queryset = queryset.select_related(None)
+        if not needs_prefetch:
+            queryset = queryset.prefetch_related(None)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        names = self.get_sparse_fields()
+        if names is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in names:
+                    target.fields.pop(name)
+        return serializer
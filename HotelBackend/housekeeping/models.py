@@ -1,5 +1,19 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+def room_floor(number):
+    try:
+        # Assuming simplified logic: Rooms 1-20 Floor 1, etc.
+        # Mirroring the script logic: (i // 20) + 1
+        num = int(number)
+        return ((num - 1) // 20) + 1
+    except ValueError:
+        return 1
+
+def display_floor(floor, number):
+    """ The stored floor, or room_floor(number) for rooms written without one (bulk_create skips Room.save()). """
+    return room_floor(number) if floor is None else floor
 
 class Room(models.Model):
     STATUS_CHOICES = (
@@ -53,6 +67,10 @@ class Room(models.Model):
     )
     room_type = models.CharField(max_length=20, choices=ROOM_TYPE_CHOICES, default='Single')
 
+    # Location, used to keep each cleaner's rooms together; floor falls back to room_floor(number), see display_floor
+    floor = models.IntegerField(blank=True, null=True)
+    zone = models.CharField(max_length=50, blank=True, null=True, help_text="e.g. 'East Wing'")
+
     guest_status = models.CharField(max_length=20, choices=GUEST_STATUS_CHOICES, default='NO_GUEST')
     
     assigned_group = models.CharField(max_length=50, blank=True, null=True, help_text="e.g. 'Group 1' or 'Lobby Team'")
@@ -100,9 +118,54 @@ class Room(models.Model):
     last_updated = models.DateTimeField(auto_now=True) # Automatic timestamp for any change
     is_houseman_completed = models.BooleanField(default=False) # Helper/Houseman status
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_group', 'status'], name='room_group_status'), # Role-scoped room lists
+            models.Index(fields=['last_updated'], name='room_last_updated'), # Delta sync and the priority index catch-up
+            models.Index(fields=['floor', 'zone'], name='room_floor_zone'), # Floor / zone room lists and assignment
+            models.Index(fields=['zone'], name='room_zone'),
+        ]
+
+    # Values remembered at load time so post_save handlers can see what changed
+    TRACKED_FIELDS = ('status', 'assigned_group', 'assigned_cleaner_id', 'number', 'floor')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {f: instance.__dict__[f] for f in cls.TRACKED_FIELDS if f in instance.__dict__}
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_values', {})
+        # A floor derived from the old number follows a renumbering; one set explicitly stays
+        if loaded.get('number', self.number) != self.number and loaded.get('floor') == self.floor == room_floor(loaded['number']):
+            self.floor = None
+        if self.floor is None:
+            self.floor = room_floor(self.number)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'floor'}
+        super().save(*args, **kwargs)
+
+    @property
+    def location(self):
+        """ (floor, zone), see display_floor. """
+        return (display_floor(self.floor, self.number), self.zone)
+
     def __str__(self):
         return f"Room {self.number} ({self.status}) - {self.assigned_group}"
 
+class RoomTombstone(models.Model):
+    """
+    Marker left behind when a Room is deleted so delta-sync clients
+    (RoomViewSet ?since=) can drop it from their local copy.
+    """
+    room_id = models.BigIntegerField()
+    number = models.CharField(max_length=10)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Deleted Room {self.number} ({self.deleted_at})"
+
 class Incident(models.Model):
     PRIORITY_CHOICES = (('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High'), ('EMERGENCY', 'Emergency'))
     STATUS_CHOICES = (('OPEN', 'Open'), ('RESOLVED', 'Resolved'))
@@ -127,6 +190,14 @@ class Incident(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     resolved_at = models.DateTimeField(blank=True, null=True)
     photo_uri = models.CharField(max_length=500, blank=True, null=True) # Matches frontend 'photoUri'
+    last_updated = models.DateTimeField(auto_now=True) # Drives list ETags
+
+    class Meta:
+        # Keyset pagination on (created_at, id), optionally filtered by status
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='incident_created_keyset'),
+            models.Index(fields=['status', '-created_at', '-id'], name='incident_status_keyset'),
+        ]
 
     def __str__(self):
         return f"Incident {self.id} - {self.room.number if self.room else 'System'} ({self.status})"
@@ -166,6 +237,13 @@ class LostItem(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='FOUND')
     photo_uri = models.CharField(max_length=500, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    last_updated = models.DateTimeField(auto_now=True) # Drives bootstrap versions
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='lostitem_created_keyset'),
+            models.Index(fields=['status', '-created_at', '-id'], name='lostitem_status_keyset'),
+        ]
 
     def __str__(self):
         return f"Lost Item: {self.description} ({self.status})"
@@ -178,6 +256,10 @@ class Announcement(models.Model):
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='NORMAL')
+    last_updated = models.DateTimeField(auto_now=True) # Drives list ETags
+
+    class Meta:
+        indexes = [models.Index(fields=['-created_at', '-id'], name='announcement_created_keyset')]
 
     def __str__(self):
         return self.title
@@ -193,6 +275,7 @@ class Asset(models.Model):
     serial_number = models.CharField(max_length=100, blank=True, null=True)
     install_date = models.DateField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='GOOD')
+    last_updated = models.DateTimeField(auto_now=True) # Drives list ETags
     
     def __str__(self):
         return f"{self.name} ({self.room.number if self.room else 'No Room'})"
@@ -228,3 +311,89 @@ class WorkShift(models.Model):
 
     def __str__(self):
         return f"Shift: {self.user} on {self.date}"
+
+class ChangeEvent(models.Model):
+    """
+    Append-only feed of room / incident / session changes. Each web worker
+    tails it and pushes matching rows to its stream subscribers (SSE / WebSocket).
+    """
+    KIND_CHOICES = (('ROOM', 'Room'), ('INCIDENT', 'Incident'), ('SESSION', 'Cleaning Session'))
+    ACTION_CHOICES = (('SAVED', 'Saved'), ('DELETED', 'Deleted'))
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default='SAVED')
+    object_id = models.BigIntegerField()
+    group_id = models.CharField(max_length=50, blank=True, null=True) # Team the change belongs to (for filtering)
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} {self.action} (#{self.id})"
+
+class ReplayedAction(models.Model):
+    """
+    Outcome of an offline-queue action applied through /sync/replay/, keyed by
+    the client's idempotency key so a retried upload is answered, not re-applied.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='replayed_actions')
+    key = models.CharField(max_length=100)
+    action_type = models.CharField(max_length=30)
+    status_code = models.PositiveSmallIntegerField()
+    result = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"{self.action_type} {self.key} -> {self.status_code}"
+
+class RoomStatusEvent(models.Model):
+    """
+    Append-only log of room status transitions (one INSERT per change, written
+    alongside the room save). Charts read RoomStatusRollup instead of this table.
+    """
+    room = models.ForeignKey(Room, on_delete=models.SET_NULL, null=True, related_name='status_events')
+    room_number = models.CharField(max_length=10) # Kept when the room is deleted
+    from_status = models.CharField(max_length=20, choices=Room.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Room.STATUS_CHOICES)
+    group_id = models.CharField(max_length=50, blank=True, null=True)
+    duration_seconds = models.IntegerField(blank=True, null=True) # Cleaning time, on transitions out of IN_PROGRESS
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp'], name='room_status_event_time'),
+            models.Index(fields=['room', 'timestamp'], name='room_status_event_room_time'),
+        ]
+
+    def __str__(self):
+        return f"Room {self.room_number}: {self.from_status} -> {self.to_status} at {self.timestamp}"
+
+class RoomStatusRollup(models.Model):
+    """
+    Per-day totals of RoomStatusEvent. Written once a day is over (see
+    housekeeping.activity); a day with no events still gets a row.
+    """
+    date = models.DateField(unique=True)
+    transitions = models.IntegerField(default=0)
+    by_status = models.JSONField(default=dict, blank=True) # { "COMPLETED": 40, ... } by to_status
+    rooms_cleaned = models.IntegerField(default=0) # Distinct rooms that reached COMPLETED
+    cleanings = models.IntegerField(default=0) # Transitions with a cleaning duration
+    cleaning_seconds = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Room activity {self.date}: {self.transitions} transitions"
+
+class CacheVersion(models.Model):
+    """
+    Version stamps for process-local caches (see housekeeping.estimates).
+    A write bumps the stamp; every worker compares it with the version it
+    loaded and reloads when they differ.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
@@ -1,24 +1,31 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Room, StaffAvailability, WorkShift, CleaningTypeDefinition
+from .models import Room, StaffAvailability, WorkShift
+from .estimates import estimates as cleaning_estimates
 from accounts.models import CustomUser
 from .serializers import StaffAvailabilitySerializer, WorkShiftSerializer
+from .mixins import SparseFieldsetMixin
+from .events import publish, room_event
+from .stats import invalidate_dashboard
 from django.utils.dateparse import parse_date
 from datetime import timedelta, date, datetime
-from django.db.models import Sum
+import time
+from django.db import transaction
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
-class AvailabilityViewSet(viewsets.ModelViewSet):
-    queryset = StaffAvailability.objects.all()
+class AvailabilityViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = StaffAvailability.objects.select_related('user')
     serializer_class = StaffAvailabilitySerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         # Users see their own, Supervisors see all
+        queryset = super().get_queryset()
         if self.request.user.role == 'CLEANER':
-            return self.queryset.filter(user=self.request.user)
-        return self.queryset
+            return queryset.filter(user=self.request.user)
+        return queryset
 
 class IsAdminOrReceptionOrSupervisor(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -28,6 +35,7 @@ class IsAdminOrReceptionOrSupervisor(permissions.BasePermission):
         return False
 
 from .logic.priority import get_room_priority_score
+from .logic.assignment import STRATEGIES as ASSIGNMENT_STRATEGIES, assign_rooms, walking_route
 
 class RosterViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
@@ -47,7 +55,7 @@ class RosterViewSet(viewsets.ViewSet):
         start_date = parse_date(start_date_str)
         end_date = start_date + timedelta(days=6)
         
-        shifts = WorkShift.objects.filter(date__range=[start_date, end_date])
+        shifts = WorkShift.objects.filter(date__range=[start_date, end_date]).select_related('user')
         if request.user.role == 'CLEANER':
             shifts = shifts.filter(user=request.user)
             
@@ -67,7 +75,7 @@ class RosterViewSet(viewsets.ViewSet):
         forecast_data = []
 
         # Helper: Cleaning estimates
-        estimates = {ct.name: ct.estimated_minutes for ct in CleaningTypeDefinition.objects.all()}
+        estimates = cleaning_estimates.all()
         STAYOVER_MINS = 20 # Fixed for stayer
         DEPARTURE_MINS = estimates.get('DEPARTURE', 30)
 
@@ -157,34 +165,45 @@ class RosterViewSet(viewsets.ViewSet):
              return Response({'error': 'start_date required'}, status=400)
 
         start_date = parse_date(start_date_str)
-        generated_shifts = []
         alerts = []
         
         # Helper: Cleaning estimates
-        estimates = {ct.name: ct.estimated_minutes for ct in CleaningTypeDefinition.objects.all()}
+        estimates = cleaning_estimates.all()
         STAYOVER_MINS = 20
         DEPARTURE_MINS = estimates.get('DEPARTURE', 30)
 
         total_assignments = {} # Track shifts per user for fairness
 
-        # Pre-fetch staff to avoid DB hits in loop, but we need fresh availability check
+        # Pre-fetch staff to avoid DB hits in loop
         all_cleaners = list(CustomUser.objects.filter(role='CLEANER'))
-
-        # CLEAR EXISTING SHIFTS for this week to avoid stale data (e.g. user changed to OFF)
-        # We delete shifts for the range we are about to generate.
         end_date_gen = start_date + timedelta(days=6)
-        WorkShift.objects.filter(date__range=[start_date, end_date_gen]).delete()
 
+        # The week's availability, one query: (user id, date) -> StaffAvailability
+        availability = {}
+        for av in StaffAvailability.objects.filter(user__role='CLEANER', date__range=[start_date, end_date_gen]):
+            availability[(av.user_id, av.date)] = av
+
+        # Demand for the whole week in two queries instead of two COUNTs per day
+        checkouts = {
+            row['check_out_date']: row
+            for row in Room.objects.filter(check_out_date__range=[start_date, end_date_gen])
+            .values('check_out_date')
+            .annotate(departures=Count('id'), in_room=Count('id', filter=Q(guest_status='GUEST_IN_ROOM')))
+        }
+        guests_in = Room.objects.filter(guest_status='GUEST_IN_ROOM').count()
+
+        new_shifts = []
         for i in range(7):
             current_date = start_date + timedelta(days=i)
             # 1. Demand Calculation
             # Departures: Rooms checking out today
-            departures = Room.objects.filter(check_out_date=current_date).count()
+            checkout = checkouts.get(current_date, {'departures': 0, 'in_room': 0})
+            departures = checkout['departures']
             
             # Stayovers: Occupied rooms NOT checking out today
             # Logic: Guest is IN, and checkout is NOT today (or None/Future)
             # We assume 'GUEST_IN_ROOM' means a stayover unless they are checking out.
-            stayovers = Room.objects.filter(guest_status='GUEST_IN_ROOM').exclude(check_out_date=current_date).count() 
+            stayovers = guests_in - checkout['in_room']
             
             total_minutes = (departures * DEPARTURE_MINS) + (stayovers * STAYOVER_MINS)
             
@@ -215,35 +234,18 @@ class RosterViewSet(viewsets.ViewSet):
             
             for staff in all_cleaners:
                 # Check specific availability for this date
-                try:
-                    av = StaffAvailability.objects.filter(user=staff, date=current_date).first()
-                    # Use filter().first() instead of get() to match multiple potential records safely (though unique constraint exists)
-                    if av and av.status in ['VACATION', 'OFF']:
-                        continue 
-                    
-                    s_time = av.start_time if (av and av.start_time) else '09:00:00'
-                    e_time = av.end_time if (av and av.end_time) else '17:00:00'
-                    
-                except Exception:
-                    s_time = '09:00:00'
-                    e_time = '17:00:00'
+                av = availability.get((staff.id, current_date))
+                if av and av.status in ['VACATION', 'OFF']:
+                    continue 
+                
+                s_time = av.start_time if (av and av.start_time) else '09:00:00'
+                e_time = av.end_time if (av and av.end_time) else '17:00:00'
 
                 if assigned_count >= staff_needed:
                     break
                 
-                # Create Shift
-                shift, created = WorkShift.objects.get_or_create(
-                    user=staff,
-                    date=current_date,
-                    defaults={'start_time': s_time, 'end_time': e_time}
-                )
-                if not created:
-                    # Update times if it existed (e.g. re-running generator)
-                    shift.start_time = s_time
-                    shift.end_time = e_time
-                    shift.save()
-
-                generated_shifts.append(WorkShiftSerializer(shift).data)
+                # Create Shift (written in one go below)
+                new_shifts.append(WorkShift(user=staff, date=current_date, start_time=s_time, end_time=e_time))
                 
                 total_assignments[staff.id] = total_assignments.get(staff.id, 0) + 1
                 assigned_count += 1
@@ -255,6 +257,13 @@ class RosterViewSet(viewsets.ViewSet):
             elif assigned_count > staff_needed and staff_needed > 0:
                  alerts.append(f"{current_date}: Surplus. {assigned_count - staff_needed} extra staff.")
 
+        # CLEAR EXISTING SHIFTS for this week to avoid stale data (e.g. user changed to OFF),
+        # then write the new roster, so the week is never left half generated.
+        with transaction.atomic():
+            WorkShift.objects.filter(date__range=[start_date, end_date_gen]).delete()
+            WorkShift.objects.bulk_create(new_shifts)
+        generated_shifts = WorkShiftSerializer(new_shifts, many=True).data
+
         return Response({
             'message': 'Roster Generated',
             'shifts': generated_shifts,
@@ -269,18 +278,26 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
     """
     @action(detail=False, methods=['post'])
     def assign_daily(self, request):
+        """
+        The whole assignment is computed in memory, then written in one
+        transaction: called-in shifts, extra team groups and a single
+        bulk_update of the rooms whose assignment changed.
+        Body: {"strategy": "greedy" | "floor"} (see logic/assignment.py).
+        `routes` lists each cleaner's rooms in walking order.
+        """
+        started = time.perf_counter()
         target_date = date.today()
+        strategy = request.data.get('strategy') or 'greedy'
+        if strategy not in ASSIGNMENT_STRATEGIES:
+            return Response({'error': f"Unknown strategy; use one of: {', '.join(ASSIGNMENT_STRATEGIES)}."}, status=400)
         
         # 1. Get Factors
         # Cleaning Times
-        estimates = {ct.name: ct.estimated_minutes for ct in CleaningTypeDefinition.objects.all()}
-        # Default fallback
-        def get_estimate(cleaning_type):
-            return estimates.get(cleaning_type, 30)
+        get_estimate = cleaning_estimates.get
 
         # 2. Get Available Staff (Those with Shifts today)
-        shifts = WorkShift.objects.filter(date=target_date)
-        if not shifts.exists():
+        shifts = list(WorkShift.objects.filter(date=target_date).select_related('user'))
+        if not shifts:
              return Response({'error': 'No staff shifts found for today. Generate roster first.'}, status=400)
         
         staff_ids = []
@@ -314,26 +331,30 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
         active_rooms = Room.objects.filter(
             assigned_cleaner__id__in=staff_ids,
             status__in=['IN_PROGRESS', 'INSPECTION', 'COMPLETED']
-        )
+        ).values_list('assigned_cleaner_id', 'cleaning_type')
         
-        for r in active_rooms:
-            effort = get_estimate(r.cleaning_type)
-            staff_load[r.assigned_cleaner.id] += effort
+        for cleaner_id, cleaning_type in active_rooms:
+            effort = get_estimate(cleaning_type)
+            staff_load[cleaner_id] += effort
 
         # 3. Get Rooms to Assign (Only Pending)
         # We re-distribute ALL pending rooms to ensure optimal priority dispatch
-        dirty_rooms = Room.objects.filter(status='PENDING') 
+        rooms_list = list(Room.objects.filter(status='PENDING'))
         
-        if not dirty_rooms.exists():
+        if not rooms_list:
             return Response({'message': 'No pending rooms to assign.'})
+        loaded = time.perf_counter()
+        # Assignment as loaded, to write back only the rooms that change
+        original = {room.id: (room.assigned_cleaner_id, room.assigned_group) for room in rooms_list}
 
         # 4. Sort Rooms using PRIORITY ENGINE
-        rooms_list = list(dirty_rooms)
-        
+        # Scalar scores: these are model instances, and building score_rooms() columns from them costs more than it saves
+        time_now = timezone.now()
+
         def sort_key(r):
             # Dynamic Score
-            score = get_room_priority_score(r)
-            
+            score = get_room_priority_score(r, time_now)
+
             # Tie-breaker: Effort (Larger rooms first? Or smaller? Usually larger first to fill rocks)
             effort = get_estimate(r.cleaning_type)
             return (score, effort)
@@ -344,59 +365,28 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
         assignments_count = 0
         reassigned_count = 0
         unassigned_count = 0
+
+        tasks = [(room.id, get_estimate(room.cleaning_type), room.assigned_cleaner_id, room.location) for room in rooms_list]
+        assignment = assign_rooms(tasks, staff_ids, staff_load, staff_capacity, strategy)
         
         for room in rooms_list:
-            # Define Effort
-            effort = get_estimate(room.cleaning_type)
-            MAX_CAPACITY_RATIO = 1.0 # Strict 8 hours limit
-
-            # Helper to check if staff can take room
-            def can_take_room(uid, room_effort):
-                 current = staff_load[uid]
-                 cap = staff_capacity[uid]
-                 projected = (current + room_effort)
-                 return (projected / cap) <= MAX_CAPACITY_RATIO
-
-            # 1. Try Sticky (Preferred)
-            preferred_staff_id = None
-            if room.assigned_cleaner and room.assigned_cleaner.id in staff_ids:
-                if can_take_room(room.assigned_cleaner.id, effort):
-                    preferred_staff_id = room.assigned_cleaner.id
-            
-            if preferred_staff_id:
-                best_staff_id = preferred_staff_id
-            else:
-                # 2. Find best available staff across all
-                # Sort by current load ratio
-                candidates = [uid for uid in staff_ids if can_take_room(uid, effort)]
-                
-                if not candidates:
-                    best_staff_id = None
-                else:
-                    # Pick the one with lowest ratio
-                    best_staff_id = min(candidates, key=lambda uid: staff_load[uid] / staff_capacity[uid])
-                    if room.assigned_cleaner_id != best_staff_id:
-                         reassigned_count += 1
-            
+            best_staff_id = assignment[room.id]
             if best_staff_id:
+                if room.assigned_cleaner_id != best_staff_id:
+                    reassigned_count += 1
                 # Assign
                 room.assigned_cleaner_id = best_staff_id
                 room.assigned_group = staff_groups.get(best_staff_id) # Assign Group too
-                room.save()
-                
-                # Update Load
-                effort = get_estimate(room.cleaning_type)
-                staff_load[best_staff_id] += effort
                 assignments_count += 1
             else:
                  # Leave Unassigned (and clear any previous assignment to prevent overload)
-                 if room.assigned_cleaner:
-                     room.assigned_cleaner = None
+                 if room.assigned_cleaner_id:
+                     room.assigned_cleaner_id = None
                      room.assigned_group = None
-                     room.save()
                  unassigned_count += 1
         
         # 6. Emergency Call-in (Phase 2)
+        called_in = []
         if unassigned_count > 0:
             # Find off-duty cleaners
             extra_cleaners = CustomUser.objects.filter(role='CLEANER', is_active=True).exclude(id__in=staff_ids)
@@ -410,8 +400,8 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
                     break
                     
                 # Call-in logic
-                # 1. Create Shift
-                WorkShift.objects.create(user=extra, date=target_date, start_time='09:00:00', end_time='17:00:00')
+                # 1. Create Shift (written with the rooms below)
+                called_in.append(extra)
                 
                 # 2. Init Capacity
                 e_id = extra.id
@@ -424,7 +414,6 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
                 # Pairing Logic: 2 Cleaners per Team
                 e_group = f"Extra Team {extra_team_idx}"
                 extra.group_id = e_group
-                extra.save() 
                 
                 current_team_size += 1
                 if current_team_size >= 2:
@@ -438,9 +427,8 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
                     if not room.assigned_cleaner_id: # Only target unassigned
                         effort = get_estimate(room.cleaning_type)
                         if (staff_load[e_id] + effort) <= staff_capacity[e_id]:
-                             room.assigned_cleaner = extra
+                             room.assigned_cleaner_id = e_id
                              room.assigned_group = e_group
-                             room.save()
                              
                              staff_load[e_id] += effort
                              assignments_count += 1
@@ -448,9 +436,41 @@ class AutoAssignRoomsViewSet(viewsets.ViewSet):
                         
                         if unassigned_count == 0:
                             break
+
+        # Walking order of each cleaner's rooms (room numbers)
+        stops = {}
+        for room in rooms_list:
+            if room.assigned_cleaner_id:
+                stops.setdefault(room.assigned_cleaner_id, []).append((room.number, *room.location, room.number))
+        routes = {uid: walking_route(cleaner_stops) for uid, cleaner_stops in stops.items()}
+        computed = time.perf_counter()
+
+        # 7. Persist in one transaction: a failure leaves the previous assignment intact
+        now = timezone.now()
+        changed = [room for room in rooms_list if original[room.id] != (room.assigned_cleaner_id, room.assigned_group)]
+        for room in changed:
+            # bulk_update skips auto_now and post_save
+            room.last_updated = now
+        with transaction.atomic():
+            WorkShift.objects.bulk_create([
+                WorkShift(user=extra, date=target_date, start_time='09:00:00', end_time='17:00:00') for extra in called_in
+            ])
+            CustomUser.objects.bulk_update(called_in, ['group_id'])
+            Room.objects.bulk_update(changed, ['assigned_cleaner', 'assigned_group', 'last_updated'], batch_size=500)
+            publish(*[room_event(room) for room in changed])
+            invalidate_dashboard()
+        finished = time.perf_counter()
             
         return Response({
             'message': f'Processed. Assigned: {assignments_count}. Unassigned (Overload): {unassigned_count}. Re-optimized: {reassigned_count}.',
             'loads': staff_load,
-            'capacities': staff_capacity
+            'capacities': staff_capacity,
+            'updated_rooms': len(changed),
+            'routes': routes,
+            'timings': {
+                'load_ms': round((loaded - started) * 1000, 1),
+                'compute_ms': round((computed - loaded) * 1000, 1),
+                'write_ms': round((finished - computed) * 1000, 1),
+                'total_ms': round((finished - started) * 1000, 1),
+            },
         })
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Room, Incident, InventoryItem, CleaningTypeDefinition, LostItem, Announcement, Asset
+from .models import Room, Incident, InventoryItem, CleaningTypeDefinition, LostItem, Announcement, Asset, display_floor
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -29,16 +29,6 @@ class RoomSerializer(serializers.ModelSerializer):
     incidents = IncidentSerializer(many=True, read_only=True)
     assigned_cleaner = serializers.PrimaryKeyRelatedField(read_only=True)
     assigned_cleaner_name = serializers.CharField(source='assigned_cleaner.username', read_only=True)
-    floor = serializers.SerializerMethodField()
-
-    def get_floor(self, obj):
-        try:
-            # Assuming simplified logic: Rooms 1-20 Floor 1, etc.
-            # Mirroring the script logic: (i // 20) + 1
-            num = int(obj.number)
-            return ((num - 1) // 20) + 1
-        except ValueError:
-            return 1
 
     def validate(self, data):
         cleaning_type = data.get('cleaning_type', self.instance.cleaning_type if self.instance else None)
@@ -56,6 +46,12 @@ class RoomSerializer(serializers.ModelSerializer):
         
         return data
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'floor' in data:
+            data['floor'] = display_floor(data['floor'], instance.number)
+        return data
+
     class Meta:
         model = Room
         fields = '__all__'
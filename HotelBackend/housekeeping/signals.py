@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Room, RoomTombstone, Incident, CleaningSession, LostItem, CleaningTypeDefinition
+from .events import publish, room_event, incident_event, session_event
+from .stats import invalidate_dashboard
+from .activity import status_event
+from .estimates import bump_version
+
+
+@receiver(post_delete, sender=Room)
+def record_room_tombstone(sender, instance, **kwargs):
+    # Delta-sync clients need to know about deletions they missed
+    RoomTombstone.objects.create(room_id=instance.id, number=instance.number)
+
+
+@receiver(post_save, sender=Room)
+def room_saved(sender, instance, **kwargs):
+    publish(room_event(instance))
+    previous = getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    if previous != instance.status:
+        status_event(instance, previous).save()
+    # The saved values are the baseline for the next change on this instance
+    instance._loaded_values = {f: instance.__dict__[f] for f in Room.TRACKED_FIELDS if f in instance.__dict__}
+
+
+@receiver(post_delete, sender=Room)
+def room_deleted(sender, instance, **kwargs):
+    publish(room_event(instance, action='DELETED'))
+
+
+@receiver(post_save, sender=Incident)
+def incident_saved(sender, instance, **kwargs):
+    publish(incident_event(instance))
+
+
+@receiver(post_delete, sender=Incident)
+def incident_deleted(sender, instance, **kwargs):
+    publish(incident_event(instance, action='DELETED'))
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=Incident)
+@receiver(post_delete, sender=Incident)
+@receiver(post_save, sender=LostItem)
+@receiver(post_delete, sender=LostItem)
+def dashboard_changed(sender, **kwargs):
+    invalidate_dashboard()
+
+
+@receiver(post_save, sender=CleaningSession)
+def session_saved(sender, instance, **kwargs):
+    publish(session_event(instance))
+
+
+@receiver(post_save, sender=CleaningTypeDefinition)
+@receiver(post_delete, sender=CleaningTypeDefinition)
+def cleaning_estimates_changed(sender, **kwargs):
+    bump_version()
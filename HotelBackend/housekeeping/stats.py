@@ -0,0 +1,71 @@
+"""
+Dashboard counters.
+
+Each distribution is one conditional-aggregate query, and the whole result
+is cached for DASHBOARD_CACHE_SECONDS. Room, incident and lost-item writes
+drop the cached copy once they commit (see signals.py; bulk paths call
+invalidate_dashboard() themselves). The cache is per process with the
+default local-memory backend, so other workers catch up within the TTL.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Room, Incident, LostItem
+from .activity import daily_activity
+
+DASHBOARD_CACHE_KEY = 'housekeeping:dashboard'
+DASHBOARD_CACHE_SECONDS = 30
+ACTIVITY_DAYS = 7
+
+
+def dashboard_stats():
+    stats = cache.get(DASHBOARD_CACHE_KEY)
+    if stats is None:
+        stats = compute_dashboard()
+        cache.set(DASHBOARD_CACHE_KEY, stats, DASHBOARD_CACHE_SECONDS)
+    return stats
+
+
+def compute_dashboard():
+    # 1. Room Status Distribution (Pie Chart)
+    rooms = Room.objects.aggregate(
+        total=Count('id'),
+        **{status: Count('id', filter=Q(status=status)) for status, _ in Room.STATUS_CHOICES},
+    )
+    total_rooms = rooms.pop('total')
+
+    # 2. Incidents by Role (Bar/Pie Chart)
+    incidents = Incident.objects.filter(status='OPEN').aggregate(
+        total=Count('id'),
+        **{role: Count('id', filter=Q(target_role=role)) for role, _ in Incident.ROLE_CHOICES},
+    )
+    issues_open = incidents.pop('total')
+
+    # 3. Last 7 days from the status event rollups
+    today = timezone.localdate()
+    days = daily_activity(today - timedelta(days=ACTIVITY_DAYS - 1), today)
+    labels = [day.date.strftime('%a') for day in days]
+
+    return {
+        'total_rooms': total_rooms,
+        'cleaned_today': rooms['COMPLETED'], # Naive
+        'issues_open': issues_open,
+        'lost_items_found': LostItem.objects.filter(status='FOUND').count(),
+        'status_distribution': rooms,
+        'incident_distribution': incidents,
+        'weekly_activity': {'labels': labels, 'data': [day.transitions for day in days]}, # Status changes per day
+        'rooms_cleaned_per_day': {'labels': labels, 'data': [day.rooms_cleaned for day in days]},
+        'cleaning_duration': { # Average minutes per cleaning
+            'labels': labels,
+            'data': [round(day.cleaning_seconds / day.cleanings / 60, 1) if day.cleanings else 0 for day in days],
+        },
+    }
+
+
+def invalidate_dashboard():
+    """ Drop the cached dashboard once the current transaction commits. """
+    transaction.on_commit(lambda: cache.delete(DASHBOARD_CACHE_KEY))
@@ -0,0 +1,117 @@
+"""
+Live change stream for HotelFlow devices.
+
+    GET /api/housekeeping/events/stream/    Server-Sent Events
+    ws://<host>/ws/housekeeping/events/     WebSocket (routed in hotel_backend/asgi.py)
+
+Both authenticate with the DRF token (``Authorization: Token <key>`` or
+``?token=<key>`` for clients that cannot set headers) and only deliver
+events visible to the user's role and group (see events.is_visible).
+Reconnecting clients resume with ``Last-Event-ID`` / ``?last_event_id=``.
+Both transports need the ASGI server (see Procfile).
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.authtoken.models import Token
+
+from .events import broker, event_message
+
+HEARTBEAT_SECONDS = 15.0
+
+
+@sync_to_async
+def get_token_user(key):
+    if not key:
+        return None
+    token = Token.objects.select_related('user').filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+def get_stream_role(user):
+    return 'ADMIN' if user.is_superuser else user.role
+
+
+def parse_event_id(raw):
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+async def sse_frames(subscription):
+    try:
+        yield 'retry: 3000\n\n'
+        async for event in subscription.events(heartbeat=HEARTBEAT_SECONDS):
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            yield f"id: {event.id}\nevent: {event.kind.lower()}\ndata: {json.dumps(event_message(event))}\n\n"
+        if subscription.overflowed:
+            yield 'event: resync\ndata: {}\n\n'
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def event_stream(request):
+    if isinstance(request, WSGIRequest):
+        return JsonResponse({'error': 'The event stream requires the ASGI server.'}, status=501)
+
+    auth = request.headers.get('Authorization', '')
+    key = auth[len('Token '):] if auth.startswith('Token ') else request.GET.get('token')
+    user = await get_token_user(key)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    last_event_id = parse_event_id(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    subscription = broker.subscribe(get_stream_role(user), user.group_id, last_event_id)
+    if last_event_id is not None:
+        await broker.replay(subscription, last_event_id)
+
+    response = StreamingHttpResponse(sse_frames(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # Keep proxies from buffering the stream
+    return response
+
+
+async def websocket_events(scope, receive, send):
+    """ Raw ASGI WebSocket handler; same events as the SSE stream, one JSON message each. """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    params = parse_qs(scope.get('query_string', b'').decode())
+    user = await get_token_user(params.get('token', [None])[0])
+    if user is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    await send({'type': 'websocket.accept'})
+
+    last_event_id = parse_event_id(params.get('last_event_id', [None])[0])
+    subscription = broker.subscribe(get_stream_role(user), user.group_id, last_event_id)
+    if last_event_id is not None:
+        await broker.replay(subscription, last_event_id)
+
+    async def pump():
+        async for event in subscription.events(heartbeat=HEARTBEAT_SECONDS):
+            payload = {'type': 'keepalive'} if event is None else event_message(event)
+            await send({'type': 'websocket.send', 'text': json.dumps(payload)})
+        if subscription.overflowed:
+            await send({'type': 'websocket.send', 'text': json.dumps({'type': 'resync'})})
+            await send({'type': 'websocket.close', 'code': 4000})
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+    finally:
+        pump_task.cancel()
+        broker.unsubscribe(subscription)
@@ -0,0 +1,169 @@
+"""
+Offline queue replay.
+
+    POST /api/housekeeping/sync/replay/
+    {"actions": [{"key": "<idempotency key>", "type": "UPDATE_ROOM", "payload": {"id": 12, "data": {...}}},
+                 {"key": "...", "type": "ADD_INCIDENT", "payload": {"data": {...}}}]}
+
+Actions are applied in order inside one transaction, each in its own
+savepoint so a rejected action does not undo the others. Every outcome is
+stored in ReplayedAction under (user, key); sending the same key again
+returns the stored result instead of applying the action twice. Records
+are kept for REPLAY_RETENTION, longer than a device stays offline, and
+trimmed from this write path.
+"""
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import Room, ReplayedAction
+from .serializers import RoomSerializer, IncidentSerializer
+from .views import ROOM_STATUS_NOTIFICATIONS, notify_room_status_changes, notify_incident_created
+
+REPLAY_LIMIT = 500
+
+REPLAY_RETENTION = timedelta(days=7)
+# Each process prunes the records at most this often, from the write path
+PRUNE_INTERVAL = 600.0
+_last_prune = None
+
+
+def prune_replayed_actions():
+    """ Deletes ReplayedAction rows older than REPLAY_RETENTION, at most once per PRUNE_INTERVAL. """
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = now
+    ReplayedAction.objects.filter(created_at__lt=timezone.now() - REPLAY_RETENTION).delete()
+
+
+class SyncViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @action(detail=False, methods=['post'])
+    def replay(self, request):
+        actions = request.data.get('actions') if isinstance(request.data, dict) else request.data
+        if not isinstance(actions, list):
+            return Response({'error': 'A list of actions is required.'}, status=400)
+        if len(actions) > REPLAY_LIMIT:
+            return Response({'error': f'At most {REPLAY_LIMIT} actions per request.'}, status=400)
+
+        keys = []
+        for item in actions:
+            # Queues written before idempotency keys fall back to the action id
+            key = (item.get('key') or item.get('id')) if isinstance(item, dict) else None
+            if key in (None, ''):
+                return Response({'error': 'Every action must be an object with a "key".'}, status=400)
+            keys.append(str(key)[:100])
+        if len(set(keys)) != len(keys):
+            return Response({'error': 'Duplicate keys in one batch.'}, status=400)
+
+        user = request.user
+        done = {r.key: r for r in ReplayedAction.objects.filter(user=user, key__in=keys)}
+        room_changes = {room_status: [] for room_status in ROOM_STATUS_NOTIFICATIONS}
+        incidents = []
+        results = []
+
+        with transaction.atomic():
+            for key, item in zip(keys, actions):
+                if key in done:
+                    results.append(self.result(done[key], replayed=True))
+                    continue
+                error = self.shape_error(item)
+                if error:
+                    # Rejected before claiming the key: nothing is recorded, a fixed retry can still apply
+                    results.append({
+                        'key': key, 'type': str(item.get('type'))[:30], 'status': 400,
+                        'data': {'error': error}, 'replayed': False,
+                    })
+                    continue
+                try:
+                    # Claiming the key first makes a concurrent upload of it wait for us, then see our record
+                    with transaction.atomic():
+                        record = ReplayedAction.objects.create(
+                            user=user, key=key, action_type=str(item.get('type'))[:30], status_code=0,
+                        )
+                except IntegrityError:
+                    record = ReplayedAction.objects.get(user=user, key=key)
+                    results.append(self.result(record, replayed=True))
+                    continue
+
+                with transaction.atomic():
+                    status_code, data, side_effect = self.apply(user, item.get('type'), item.get('payload') or {})
+                    if status_code >= 400:
+                        # Undo anything the rejected action wrote; its outcome is still recorded
+                        transaction.set_rollback(True)
+                record.status_code, record.result = status_code, data
+                record.save(update_fields=['status_code', 'result'])
+                results.append(self.result(record, replayed=False))
+                if side_effect:
+                    kind, value = side_effect
+                    if kind == 'room':
+                        room_changes[value[0]].append(value[1])
+                    else:
+                        incidents.append(value)
+
+        prune_replayed_actions()
+        notify_room_status_changes(room_changes)
+        for incident in incidents:
+            notify_incident_created(incident)
+
+        return Response({'results': results})
+
+    def result(self, record, replayed):
+        return {
+            'key': record.key, 'type': record.action_type, 'status': record.status_code,
+            'data': record.result, 'replayed': replayed,
+        }
+
+    def shape_error(self, item):
+        """ Why the action's payload cannot be applied as sent, or None. """
+        payload = item.get('payload')
+        if payload is not None and not isinstance(payload, dict):
+            return '"payload" must be an object.'
+        data = (payload or {}).get('data')
+        if data is not None and not isinstance(data, dict):
+            return '"payload.data" must be an object.'
+        return None
+
+    def apply(self, user, action_type, payload):
+        """ Returns (status code, response data, side effect to run after commit). """
+        data = payload.get('data') or {}
+        if action_type == 'UPDATE_ROOM':
+            room_id = payload.get('id')
+            room = Room.objects.select_for_update().filter(pk=room_id).first() if str(room_id).isdigit() else None
+            if room is None:
+                return 404, {'error': 'Room not found.'}, None
+            serializer = RoomSerializer(room, data=data, partial=True)
+            if not serializer.is_valid():
+                return 400, serializer.errors, None
+
+            old_status = room.status
+            room = serializer.save()
+            side_effect = None
+            if room.status != old_status:
+                # Same timer and notification rules as RoomViewSet.perform_update
+                if room.status == 'IN_PROGRESS':
+                    room.cleaning_started_at = timezone.now()
+                    room.save()
+                elif room.status == 'PENDING':
+                    room.cleaning_started_at = None
+                    room.save()
+                if room.status in ROOM_STATUS_NOTIFICATIONS:
+                    side_effect = ('room', (room.status, room.number))
+            return 200, {'id': room.id, 'status': room.status, 'last_updated': serializer.data['last_updated']}, side_effect
+
+        if action_type == 'ADD_INCIDENT':
+            serializer = IncidentSerializer(data=data)
+            if not serializer.is_valid():
+                return 400, serializer.errors, None
+            incident = serializer.save(reported_by=user)
+            return 201, serializer.data, ('incident', incident)
+
+        return 400, {'error': f'Unknown action type: {action_type}'}, None
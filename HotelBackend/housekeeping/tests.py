@@ -1,3 +1,1437 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import LiveServerTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from accounts.models import CustomUser
+from hotel_backend.renderers import FastJSONRenderer, msgpack
+from hotel_backend.metrics import recorder
+from .models import (
+    Room, Incident, ChangeEvent, ReplayedAction, InventoryItem, CleaningTypeDefinition, CleaningSession,
+    LostItem, Announcement, Asset, StaffAvailability, WorkShift, RoomStatusEvent, RoomStatusRollup,
+    CacheVersion, RoomTombstone,
+)
+from .urls import router
+from .pagination import KeysetPagination
+from .views import RoomViewSet, format_sync_cursor
+from .serializers import RoomSerializer
+from .fast_read import room_reader
+from .estimates import estimates
+from . import events as events_module
+from .events import EVENT_RETENTION, EventBroker, Subscription, is_visible
+from .stream_views import broker as stream_broker
+from . import sync_views
+from .sync_views import REPLAY_RETENTION
+from .dispatch import GroupQueue, is_assignable, priority_index
+from .logic import priority as priority_module
+from .logic.priority import get_room_priority_score, score_rooms, priority_columns, PRIORITY_FIELDS
+from .management.commands.benchmark_priority import synthetic_rooms
+from .management.commands.benchmark_assignment import (
+    Command as AssignmentBenchmark, reference_assign, simulate_travel, synthetic_workload,
+)
+from .logic.assignment import STRATEGIES as ASSIGNMENT_STRATEGIES, assign_rooms, route_seconds, walking_route
 
-# Create your tests here.
+
+class RoomListQueryCountTests(TestCase):
+    """ The room list must not issue per-room queries (nested incidents, cleaner name). """
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('supervisor', password='pass', role='SUPERVISOR')
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def create_rooms(self, start, count):
+        for i in range(start, start + count):
+            room = Room.objects.create(number=str(i), assigned_cleaner=self.cleaner, assigned_group='Group 1')
+            Incident.objects.create(room=room, text=f"Leak in {i}", reported_by=self.cleaner)
+            Incident.objects.create(room=room, text=f"Lamp in {i}", reported_by=self.supervisor, status='RESOLVED')
+
+    def count_list_queries(self):
+        # ETag version (rooms + incidents), rooms joined to cleaner, prefetched incidents
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/housekeeping/rooms/')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_is_constant(self):
+        self.create_rooms(1, 3)
+        self.count_list_queries()
+
+        self.create_rooms(100, 30)
+        response = self.count_list_queries()
+        self.assertEqual(len(response.data), 33)
+
+    def test_nested_data_is_unchanged(self):
+        self.create_rooms(1, 1)
+        room = self.count_list_queries().data[0]
+        self.assertEqual(room['assigned_cleaner_name'], 'cleaner')
+        self.assertEqual([i['user'] for i in room['incidents']], ['cleaner', 'supervisor'])
+
+
+class FastRoomListTests(TestCase):
+    """ The values()-based room list must render exactly like RoomSerializer. """
+
+    def setUp(self):
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        now = timezone.now()
+        rich = Room.objects.create(
+            number='215', status='IN_PROGRESS', cleaning_type='PREARRIVAL', assigned_cleaner=self.cleaner,
+            assigned_group='Group 1', priority=True, check_in_date=date(2026, 1, 2), next_arrival_time=now,
+            guest_details={'guests': 2, 'names': ['Ana', 'Luis']}, supplies_used={'Shampoo': 2},
+            last_inspection_report={'passed': True}, cleaning_started_at=now, notes='Late checkout',
+        )
+        Room.objects.create(number='Lobby', guest_details=None)
+        Incident.objects.create(room=rich, text='Leak', reported_by=self.cleaner, assigned_to=self.cleaner)
+        Incident.objects.create(room=rich, text='Anonymous', reported_by=None, status='RESOLVED')
+
+    def test_output_is_byte_identical(self):
+        queryset = Room.objects.order_by('number')
+        expected = JSONRenderer().render(RoomSerializer(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(room_reader.render(queryset)), expected)
+
+    def test_sparse_output_is_byte_identical(self):
+        fields = ['id', 'number', 'floor', 'assigned_cleaner_name', 'incidents']
+        queryset = Room.objects.order_by('number')
+        serializer = RoomSerializer(queryset, many=True)
+        for name in list(serializer.child.fields):
+            if name not in fields:
+                serializer.child.fields.pop(name)
+        expected = JSONRenderer().render(serializer.data)
+        self.assertEqual(JSONRenderer().render(room_reader.render(queryset, fields)), expected)
+
+
+class DeltaSyncTests(TestCase):
+    """ GET /rooms/?since= returns only what changed after the cursor. """
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('supervisor', password='pass', role='SUPERVISOR')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.rooms = [Room.objects.create(number=str(101 + i)) for i in range(3)]
+        self.hour_ago = timezone.now() - timedelta(hours=1)
+        Room.objects.update(last_updated=self.hour_ago)
+
+    def delta(self, since):
+        return self.client.get('/api/housekeeping/rooms/', {'since': since})
+
+    def test_changed_and_deleted_rooms(self):
+        snapshot = self.delta('').data
+        self.assertEqual(len(snapshot['rooms']), 3)
+        self.assertEqual(snapshot['cursor'], format_sync_cursor(self.hour_ago))
+        # A later poll, once the snapshot rooms are out of the overlap window
+        cursor = format_sync_cursor(self.hour_ago + timedelta(minutes=1))
+
+        changed, deleted = self.rooms[1], self.rooms[2]
+        changed.notes = 'Extra towels'
+        changed.save()
+        deleted_id = deleted.id
+        deleted.delete()
+        self.assertTrue(RoomTombstone.objects.filter(room_id=deleted_id, number='103').exists())
+
+        response = self.delta(cursor)
+        self.assertEqual([r['number'] for r in response.data['rooms']], ['102'])
+        self.assertEqual(response.data['deleted'], [deleted_id])
+        self.assertGreater(response.data['cursor'], cursor)
+
+    def test_overlap_window(self):
+        cursor = self.hour_ago + timedelta(minutes=30)
+        Room.objects.filter(pk=self.rooms[0].pk).update(last_updated=cursor - timedelta(seconds=1))
+        Room.objects.filter(pk=self.rooms[1].pk).update(last_updated=cursor - timedelta(seconds=3))
+        response = self.delta(format_sync_cursor(cursor))
+        # Saved 1 s before the cursor: within DELTA_SYNC_OVERLAP, so it is sent again
+        self.assertEqual([r['number'] for r in response.data['rooms']], ['101'])
+
+    def test_malformed_cursor(self):
+        response = self.delta('yesterday')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.data)
+
+
+class ConditionalListTests(TestCase):
+    """ Unchanged list polls get a 304 keyed on the list's version. """
+    URL = '/api/housekeeping/rooms/'
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('supervisor', password='pass', role='SUPERVISOR')
+        room = Room.objects.create(number='101')
+        self.incident = Incident.objects.create(room=room, text='Leak')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def etag(self, **headers):
+        response = self.client.get(self.URL, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.etag()
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+        self.assertEqual(self.client.get(self.URL, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_incident_change_moves_the_room_list_etag(self):
+        etag = self.etag()
+        self.incident.status = 'RESOLVED'
+        self.incident.save()
+        self.assertEqual(self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_depends_on_accept_and_user(self):
+        etag = self.etag(HTTP_ACCEPT='application/json')
+        self.assertNotEqual(self.etag(HTTP_ACCEPT='*/*'), etag)
+        other = CustomUser.objects.create_user('reception', password='pass', role='RECEPTION')
+        self.client.force_authenticate(other)
+        self.assertNotEqual(self.etag(HTTP_ACCEPT='application/json'), etag)
+
+
+class SparseFieldsetTests(TestCase):
+    """ ?fields= / ?profile= narrow both the output and the SQL. """
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('supervisor', password='pass', role='SUPERVISOR')
+        room = Room.objects.create(number='101', notes='Late checkout')
+        Incident.objects.create(room=room, text='Leak', reported_by=self.supervisor, photo_uri='leak.jpg')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def test_unknown_field_or_profile(self):
+        self.assertEqual(self.client.get('/api/housekeeping/rooms/', {'fields': 'number,bogus'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/housekeeping/rooms/', {'profile': 'bogus'}).status_code, 400)
+
+    def test_slim_profile(self):
+        rooms = self.client.get('/api/housekeeping/rooms/', {'profile': 'slim'}).json()
+        self.assertEqual(set(rooms[0]), set(RoomViewSet.field_profiles['slim']))
+
+    def test_only_requested_columns_are_selected(self):
+        with CaptureQueriesContext(connection) as queries:
+            incidents = self.client.get('/api/housekeeping/incidents/', {'fields': 'text,status'}).json()
+        self.assertEqual(incidents, [{'id': incidents[0]['id'], 'text': 'Leak', 'status': 'OPEN'}])
+        [select] = [q['sql'] for q in queries if '"housekeeping_incident"."text"' in q['sql']]
+        self.assertNotIn('photo_uri', select)
+        self.assertNotIn('JOIN', select)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/housekeeping/rooms/', {'fields': 'number'})
+        [select] = [q['sql'] for q in queries if '"housekeeping_room"."number"' in q['sql']]
+        self.assertNotIn('"housekeeping_room"."notes"', select)
+
+
+class KeysetPaginationTests(TestCase):
+    """ Opt-in ?page_size= / ?cursor= pages over (created_at, id). """
+    URL = '/api/housekeeping/incidents/'
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('supervisor', password='pass', role='SUPERVISOR')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def create(self, count):
+        Incident.objects.bulk_create([Incident(text=f'Issue {i}') for i in range(count)])
+
+    def test_unpaginated_by_default(self):
+        self.create(3)
+        self.assertEqual(len(self.client.get(self.URL).json()), 3)
+
+    def test_pages_through_equal_timestamps(self):
+        self.create(5)
+        # Same created_at everywhere: page boundaries fall back to the id
+        Incident.objects.update(created_at=timezone.now())
+        expected = list(Incident.objects.order_by('-id').values_list('id', flat=True))
+        pages = [self.client.get(self.URL, {'page_size': 2}).json()]
+        while pages[-1]['next'] and len(pages) < 5:
+            # The next link carries the cursor (and page size) as is
+            pages.append(self.client.get(pages[-1]['next']).json())
+        self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+        self.assertEqual([incident['id'] for page in pages for incident in page['results']], expected)
+
+    def test_invalid_cursor(self):
+        for cursor in ('garbage', 'bm90LWEtY3Vyc29y'):
+            self.assertEqual(self.client.get(self.URL, {'cursor': cursor}).status_code, 404)
+
+    def test_page_size_is_clamped(self):
+        self.create(KeysetPagination.max_page_size + 1)
+        data = self.client.get(self.URL, {'page_size': 10000}).json()
+        self.assertEqual(len(data['results']), KeysetPagination.max_page_size)
+        self.assertIsNotNone(data['next'])
+        self.assertEqual(len(self.client.get(self.URL, {'page_size': 0}).json()['results']), 1)
+
+
+class RoomBulkUpdateTests(TestCase):
+    """ POST /rooms/bulk_update/ applies all updates or none. """
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('supervisor', password='pass', role='SUPERVISOR')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.rooms = [Room.objects.create(number=str(101 + i), assigned_group='Group 1') for i in range(3)]
+
+    def post(self, updates):
+        return self.client.post('/api/housekeeping/rooms/bulk_update/', {'updates': updates}, format='json')
+
+    @mock.patch('housekeeping.views.send_multicast_push')
+    def test_applies_batch_and_coalesces_notifications(self, push):
+        a, b, c = self.rooms
+        stamp = c.last_updated
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post([
+                {'id': a.id, 'status': 'INSPECTION'},
+                {'id': b.id, 'status': 'INSPECTION', 'assigned_group': 'Group 2'},
+                {'id': c.id, 'status': 'IN_PROGRESS', 'priority': True},
+            ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+
+        b.refresh_from_db()
+        c.refresh_from_db()
+        self.assertEqual((b.status, b.assigned_group), ('INSPECTION', 'Group 2'))
+        self.assertTrue(c.priority)
+        self.assertIsNotNone(c.cleaning_started_at)
+        self.assertGreater(c.last_updated, stamp)
+
+        push.assert_called_once()
+        self.assertEqual(push.call_args.args[1], '2 Rooms Ready for Inspection')
+        events = ChangeEvent.objects.filter(kind='ROOM').order_by('id')
+        self.assertEqual(events.count(), 3)
+        self.assertEqual(events[1].payload['previous_group'], 'Group 1')
+
+    @mock.patch('housekeeping.views.send_multicast_push')
+    def test_invalid_item_rejects_whole_batch(self, push):
+        a, b, _ = self.rooms
+        response = self.post([
+            {'id': a.id, 'status': 'COMPLETED'},
+            {'id': b.id, 'cleaning_type': 'WEEKLY', 'next_guest_name': 'Ana'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['id'], b.id)
+        a.refresh_from_db()
+        self.assertEqual(a.status, 'PENDING')
+        push.assert_not_called()
+
+    def test_unknown_room(self):
+        response = self.post([{'id': 999999, 'status': 'COMPLETED'}])
+        self.assertEqual(response.status_code, 404)
+
+
+class OfflineReplayTests(TestCase):
+    """ POST /sync/replay/ applies queued actions once per idempotency key. """
+
+    def setUp(self):
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.cleaner)
+        self.room = Room.objects.create(number='101', assigned_group='Group 1')
+
+    def replay(self, actions):
+        return self.client.post('/api/housekeeping/sync/replay/', {'actions': actions}, format='json')
+
+    @mock.patch('housekeeping.views.send_multicast_push')
+    def test_retry_does_not_duplicate(self, push):
+        actions = [
+            {'key': 'dev1-1', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': {'status': 'IN_PROGRESS'}}},
+            {'key': 'dev1-2', 'type': 'ADD_INCIDENT', 'payload': {'data': {'room': self.room.id, 'text': 'Broken lamp', 'targetRole': 'MAINTENANCE'}}},
+            {'key': 'dev1-3', 'type': 'UPDATE_ROOM', 'payload': {'id': 999999, 'data': {'status': 'COMPLETED'}}},
+        ]
+        first = self.replay(actions)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([r['status'] for r in first.data['results']], [200, 201, 404])
+        self.assertFalse(any(r['replayed'] for r in first.data['results']))
+
+        second = self.replay(actions)
+        self.assertTrue(all(r['replayed'] for r in second.data['results']))
+        self.assertEqual(second.data['results'][1]['data'], first.data['results'][1]['data'])
+        self.assertEqual(Incident.objects.count(), 1)
+        self.assertEqual(ReplayedAction.objects.count(), 3)
+
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.status, 'IN_PROGRESS')
+        self.assertIsNotNone(self.room.cleaning_started_at)
+
+    def test_rejected_action_is_rolled_back_alone(self):
+        response = self.replay([
+            {'key': 'a', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': {'cleaning_type': 'WEEKLY', 'next_guest_name': 'Ana'}}},
+            {'key': 'b', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': {'priority': True}}},
+        ])
+        self.assertEqual([r['status'] for r in response.data['results']], [400, 200])
+        self.room.refresh_from_db()
+        self.assertEqual((self.room.cleaning_type, self.room.priority), ('DEPARTURE', True))
+
+    def test_malformed_actions(self):
+        response = self.replay([
+            {'key': 'a', 'type': 'UPDATE_ROOM', 'payload': [self.room.id]},
+            {'key': 'b', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': 'priority'}},
+            {'key': 'c', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': {'priority': True}}},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.data['results']], [400, 400, 200])
+        self.assertEqual(list(ReplayedAction.objects.values_list('key', flat=True)), ['c'])
+        self.assertEqual(self.replay(['not an action']).status_code, 400)
+
+    def test_replays_prune_old_records(self):
+        old = ReplayedAction.objects.create(user=self.cleaner, key='old', action_type='UPDATE_ROOM', status_code=200)
+        ReplayedAction.objects.filter(pk=old.pk).update(created_at=timezone.now() - REPLAY_RETENTION - timedelta(minutes=1))
+        with mock.patch.object(sync_views, '_last_prune', None):
+            self.replay([{'key': 'new', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': {'priority': True}}}])
+            self.assertEqual(list(ReplayedAction.objects.values_list('key', flat=True)), ['new'])
+
+            # Throttled: the next replay within PRUNE_INTERVAL leaves old rows for later
+            ReplayedAction.objects.update(created_at=timezone.now() - REPLAY_RETENTION - timedelta(minutes=1))
+            self.replay([{'key': 'newer', 'type': 'UPDATE_ROOM', 'payload': {'id': self.room.id, 'data': {'priority': False}}}])
+            self.assertEqual(ReplayedAction.objects.count(), 2)
+
+
+class ChangeFeedTests(TestCase):
+    """ The ChangeEvent feed behind the live stream. """
+
+    def test_writes_prune_old_events(self):
+        old = ChangeEvent.objects.create(kind='ROOM', object_id=1)
+        ChangeEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - EVENT_RETENTION - timedelta(minutes=1))
+        recent = ChangeEvent.objects.create(kind='ROOM', object_id=2)
+        with mock.patch.object(events_module, '_last_prune', None):
+            with self.captureOnCommitCallbacks(execute=True):
+                Room.objects.create(number='101')
+            self.assertFalse(ChangeEvent.objects.filter(pk=old.pk).exists())
+            self.assertTrue(ChangeEvent.objects.filter(pk=recent.pk).exists())
+
+            # Throttled: the next write within PRUNE_INTERVAL leaves old rows for later
+            ChangeEvent.objects.filter(pk=recent.pk).update(created_at=timezone.now() - EVENT_RETENTION - timedelta(minutes=1))
+            with self.captureOnCommitCallbacks(execute=True):
+                Room.objects.create(number='102')
+            self.assertTrue(ChangeEvent.objects.filter(pk=recent.pk).exists())
+
+    def test_feed_thread_recycles_its_connection(self):
+        broker = EventBroker()
+        with mock.patch.object(events_module, 'connection') as feed_connection:
+            broker._poll()
+            feed_connection.close_if_unusable_or_obsolete.assert_called_once()
+            # No subscribers left: the loop ends and closes the feed thread's connection
+            asyncio.run(broker._run())
+            broker._executor.shutdown(wait=True)
+            feed_connection.close.assert_called_once()
+
+
+class StreamVisibilityTests(TestCase):
+    """ Who gets which live event, and in what order. """
+
+    def event(self, event_id=None, kind='ROOM', group_id='Group 1', **payload):
+        return ChangeEvent(id=event_id, kind=kind, object_id=1, group_id=group_id, payload=payload)
+
+    def test_role_filtering(self):
+        moved = self.event(previous_group='Group 2', status='PENDING')
+        self.assertTrue(is_visible(moved, 'SUPERVISOR', None))
+        self.assertTrue(is_visible(moved, 'CLEANER', 'Group 1'))
+        self.assertTrue(is_visible(moved, 'CLEANER', 'Group 2')) # The team it left
+        self.assertFalse(is_visible(moved, 'CLEANER', 'Group 3'))
+        self.assertFalse(is_visible(moved, 'CLEANER', None))
+        self.assertTrue(is_visible(moved, 'HOUSEMAN', None))
+        self.assertFalse(is_visible(moved, 'MAINTENANCE', None))
+        self.assertTrue(is_visible(self.event(status='PENDING', previous_status='MAINTENANCE'), 'MAINTENANCE', None))
+
+        request = self.event(kind='INCIDENT', group_id='Group 3', target_role='HOUSEMAN')
+        self.assertTrue(is_visible(request, 'HOUSEMAN', None))
+        self.assertFalse(is_visible(request, 'MAINTENANCE', None))
+        self.assertFalse(is_visible(self.event(kind='SESSION'), 'HOUSEMAN', None))
+
+    def test_overflow_stops_the_subscription(self):
+        with mock.patch.object(Subscription, 'queue_size', 2):
+            subscription = Subscription(None, 'SUPERVISOR', None)
+        for event_id in (1, 2, 3, 4):
+            subscription.offer(self.event(event_id))
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(subscription.queue.qsize(), 2)
+
+    def test_release_replays_backlog_then_held_events_in_order(self):
+        subscription = Subscription(None, 'CLEANER', 'Group 1')
+        subscription.hold()
+        subscription.offer(self.event(6))
+        subscription.offer(self.event(5))
+        self.assertTrue(subscription.queue.empty())
+        # The backlog overlaps the held live events and carries another team's room
+        subscription.release([self.event(3), self.event(4, group_id='Group 2'), self.event(5)])
+        delivered = [subscription.queue.get_nowait().id for _ in range(subscription.queue.qsize())]
+        self.assertEqual(delivered, [3, 5, 6])
+        subscription.offer(self.event(7))
+        self.assertEqual(subscription.queue.get_nowait().id, 7)
+
+
+class EventBrokerTests(TestCase):
+    def create(self, *ids):
+        ChangeEvent.objects.bulk_create([ChangeEvent(id=event_id, kind='ROOM', object_id=event_id) for event_id in ids])
+
+    def test_tail_picks_up_late_commits(self):
+        broker = EventBroker()
+        self.create(1)
+        self.assertEqual(broker._fetch(), []) # Starts from the newest event
+        # 3 is allocated but not committed yet
+        self.create(2, 4)
+        self.assertEqual([e.id for e in broker._fetch()], [2, 4])
+        self.assertEqual(set(broker._gaps), {3})
+        self.create(3)
+        self.assertEqual([e.id for e in broker._fetch()], [3])
+        self.assertEqual(broker._gaps, {})
+
+    def test_gaps_are_given_up_after_a_while(self):
+        broker = EventBroker()
+        broker._fetch()
+        self.create(2)
+        with mock.patch.object(events_module.time, 'monotonic', return_value=1000.0):
+            broker._fetch()
+        self.assertEqual(set(broker._gaps), {1})
+        with mock.patch.object(events_module.time, 'monotonic', return_value=1000.0 + broker.gap_timeout + 1):
+            self.create(1) # Too late: already given up on
+            self.assertEqual(broker._fetch(), [])
+        self.assertEqual(broker._gaps, {})
+
+    def test_backlog(self):
+        self.create(1, 2, 3)
+        self.assertEqual([e.id for e in EventBroker()._fetch_backlog(1)], [2, 3])
+
+
+class EventStreamAuthTests(TestCase):
+    URL = '/api/housekeeping/events/stream/'
+
+    def setUp(self):
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        self.token = Token.objects.create(user=self.cleaner)
+
+    def test_requires_the_asgi_server(self):
+        self.assertEqual(self.client.get(self.URL, {'token': self.token.key}).status_code, 501)
+
+    async def test_token_header_or_query(self):
+        subscription = Subscription(None, 'CLEANER', 'Group 1')
+        with mock.patch.object(stream_broker, 'subscribe', return_value=subscription) as subscribe, \
+                mock.patch.object(stream_broker, 'replay', new=mock.AsyncMock()) as replay:
+            response = await self.async_client.get(self.URL, headers={'Authorization': f'Token {self.token.key}'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            subscribe.assert_called_once_with('CLEANER', 'Group 1', None)
+            replay.assert_not_called()
+
+            response = await self.async_client.get(self.URL, {'token': self.token.key, 'last_event_id': '41'})
+            self.assertEqual(response.status_code, 200)
+            subscribe.assert_called_with('CLEANER', 'Group 1', 41)
+            replay.assert_awaited_once_with(subscription, 41)
+
+    async def test_rejects_missing_or_bad_tokens(self):
+        with mock.patch.object(stream_broker, 'subscribe') as subscribe:
+            self.assertEqual((await self.async_client.get(self.URL)).status_code, 401)
+            self.assertEqual((await self.async_client.get(self.URL, {'token': 'nope'})).status_code, 401)
+            response = await self.async_client.get(self.URL, headers={'Authorization': 'Bearer ' + self.token.key})
+            self.assertEqual(response.status_code, 401)
+            self.cleaner.is_active = False
+            await self.cleaner.asave()
+            self.assertEqual((await self.async_client.get(self.URL, {'token': self.token.key})).status_code, 401)
+        subscribe.assert_not_called()
+
+
+class RoomScopeTests(TestCase):
+    """ The room list only carries the rooms each role works on. """
+
+    def setUp(self):
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        self.room_g1 = Room.objects.create(number='101', assigned_group='Group 1')
+        self.room_mine = Room.objects.create(number='102', assigned_group='Group 3', assigned_cleaner=self.cleaner)
+        self.room_g2 = Room.objects.create(number='201', assigned_group='Group 2', status='MAINTENANCE')
+        self.room_other = Room.objects.create(number='202', assigned_group='Group 2', cleaning_type='WEEKLY')
+        Incident.objects.create(room=self.room_other, text='Fridge', target_role='MAINTENANCE')
+        self.client = APIClient()
+
+    def numbers(self, user, url='/api/housekeeping/rooms/'):
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sorted(r['number'] for r in response.data)
+
+    def test_role_subsets(self):
+        maintenance = CustomUser.objects.create_user('fixer', password='pass', role='MAINTENANCE')
+        houseman = CustomUser.objects.create_user('runner', password='pass', role='HOUSEMAN')
+        supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR')
+
+        self.assertEqual(self.numbers(self.cleaner), ['101', '102'])
+        self.assertEqual(self.numbers(maintenance), ['201', '202'])
+        self.assertEqual(self.numbers(houseman), ['101', '102'])
+        self.assertEqual(self.numbers(supervisor), ['101', '102', '201', '202'])
+        self.assertEqual(len(self.numbers(maintenance, '/api/housekeeping/rooms/?scope=all')), 4)
+        self.assertEqual(self.numbers(self.cleaner, '/api/housekeeping/rooms/?scope=all'), ['101', '102'])
+
+    def test_detail_is_not_scoped(self):
+        self.client.force_authenticate(self.cleaner)
+        response = self.client.get(f'/api/housekeeping/rooms/{self.room_g2.id}/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_delta_reports_rooms_leaving_scope(self):
+        self.client.force_authenticate(self.cleaner)
+        cursor = self.client.get('/api/housekeeping/rooms/?since=').data['cursor']
+
+        # Another group's rooms change too (one of them passes through this cleaner's hands)
+        room_passing = Room.objects.create(number='203', assigned_group='Group 2')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room_g1.assigned_group = 'Group 2'
+            self.room_g1.save()
+            self.room_other.priority = True
+            self.room_other.save()
+            room_passing = Room.objects.get(pk=room_passing.pk)
+            room_passing.assigned_cleaner = self.cleaner
+            room_passing.save()
+            room_passing.assigned_cleaner = None
+            room_passing.save()
+            Incident.objects.create(room=self.room_mine, text='Towels', target_role='HOUSEMAN')
+
+        response = self.client.get('/api/housekeeping/rooms/', {'since': cursor})
+        self.assertEqual(response.data['deleted'], sorted([self.room_g1.id, room_passing.id]))
+        self.assertEqual([r['number'] for r in response.data['rooms']], ['102'])
+        self.assertEqual(response.data['rooms'][0]['incidents'][0]['text'], 'Towels')
+
+        # Other roles only hear about rooms they could see
+        maintenance = CustomUser.objects.create_user('fixer', password='pass', role='MAINTENANCE')
+        self.client.force_authenticate(maintenance)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room_g2.status = 'PENDING'
+            self.room_g2.save()
+        response = self.client.get('/api/housekeeping/rooms/', {'since': cursor})
+        self.assertEqual(response.data['deleted'], [self.room_g2.id])
+
+    def test_delta_hides_unrelated_rooms_from_housemen(self):
+        houseman = CustomUser.objects.create_user('runner', password='pass', role='HOUSEMAN')
+        self.client.force_authenticate(houseman)
+        cursor = self.client.get('/api/housekeeping/rooms/?since=').data['cursor']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Never a prep room: the houseman must not learn it exists
+            self.room_other.priority = True
+            self.room_other.save()
+            # A prep room that is now being cleaned leaves the houseman's list
+            self.room_g1.status = 'IN_PROGRESS'
+            self.room_g1.save()
+            # So does a room whose only houseman request was closed
+            request = Incident.objects.create(room=self.room_g2, text='Extra bed', target_role='HOUSEMAN')
+            request.status = 'RESOLVED'
+            request.save()
+
+        response = self.client.get('/api/housekeeping/rooms/', {'since': cursor})
+        self.assertEqual(response.data['deleted'], sorted([self.room_g1.id, self.room_g2.id]))
+
+
+class BootstrapTests(TestCase):
+    """ GET /bootstrap/ returns the working set in a fixed number of queries. """
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR', group_id='Group 1')
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        for i in range(5):
+            room = Room.objects.create(number=str(101 + i), assigned_group='Group 1' if i % 2 else 'Group 2')
+            Incident.objects.create(room=room, text=f'Issue {i}', reported_by=self.cleaner)
+        self.client = APIClient()
+
+    def test_sections_and_skipping(self):
+        self.client.force_authenticate(self.supervisor)
+        # 8 version reads (rooms + embedded incidents, incidents, session, announcements, assets, lost items, staff)
+        # plus rooms, nested incidents, incidents, announcements, assets and lost items
+        with self.assertNumQueries(14):
+            first = self.client.get('/api/housekeeping/bootstrap/')
+        self.assertEqual(len(first.data['rooms']['data']), 5)
+        self.assertEqual(len(first.data['staff']['data']), 2)
+
+        versions = {name: section['version'] for name, section in first.data.items()}
+        with self.assertNumQueries(8):
+            second = self.client.get('/api/housekeeping/bootstrap/', versions)
+        self.assertTrue(all(section.get('unchanged') for section in second.data.values()))
+
+        Room.objects.filter(number='101').update(status='COMPLETED', last_updated=timezone.now())
+        third = self.client.get('/api/housekeeping/bootstrap/', versions)
+        self.assertIn('data', third.data['rooms'])
+        self.assertTrue(third.data['announcements']['unchanged'])
+
+    def test_cleaner_sections(self):
+        self.client.force_authenticate(self.cleaner)
+        data = self.client.get('/api/housekeeping/bootstrap/').data
+        self.assertNotIn('staff', data)
+        self.assertNotIn('lost_items', data)
+        self.assertEqual([r['number'] for r in data['rooms']['data']], ['102', '104'])
+        self.assertIsNone(data['session']['data'])
+
+
+class RendererTests(TestCase):
+    """ Content negotiation between the fast JSON and MessagePack renderers. """
+
+    def setUp(self):
+        self.supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR')
+        room = Room.objects.create(number='101', notes='Line\u2028break', guest_details={'names': ['Zoë']})
+        Incident.objects.create(room=room, text='Leak', reported_by=self.supervisor)
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def test_json_matches_drf(self):
+        data = RoomSerializer(Room.objects.all(), many=True).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+        response = self.client.get('/api/housekeeping/rooms/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_json_request_body(self):
+        room = Room.objects.get()
+        response = self.client.patch(f'/api/housekeeping/rooms/{room.id}/', {'notes': 'Dusty'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.generic('PATCH', f'/api/housekeeping/rooms/{room.id}/', '{bad', 'application/json')
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_round_trip(self):
+        response = self.client.get('/api/housekeeping/rooms/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        rooms = msgpack.unpackb(response.content)
+        self.assertEqual(rooms[0]['incidents'][0]['text'], 'Leak')
+
+        room = Room.objects.get()
+        response = self.client.generic(
+            'PATCH', f'/api/housekeeping/rooms/{room.id}/', msgpack.packb({'priority': True}), 'application/msgpack'
+        )
+        self.assertEqual(response.status_code, 200)
+        room.refresh_from_db()
+        self.assertTrue(room.priority)
+
+
+class RequestMetricsTests(TestCase):
+    """ RequestMetricsMiddleware aggregates per route and /api/metrics/ reports it. """
+
+    def setUp(self):
+        recorder.reset()
+        self.admin = CustomUser.objects.create_user('admin', password='pass', role='ADMIN')
+        self.cleaner = CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER')
+        Room.objects.create(number='101')
+        self.client = APIClient()
+
+    def test_routes_are_aggregated(self):
+        self.client.force_authenticate(self.admin)
+        for _ in range(3):
+            self.client.get('/api/housekeeping/rooms/')
+        self.client.get('/api/housekeeping/no-such-endpoint/')
+
+        routes = {(r['method'], r['route']): r for r in self.client.get('/api/metrics/').data['routes']}
+        rooms = routes[('GET', 'room-list')]
+        self.assertEqual(rooms['requests'], 3)
+        self.assertGreaterEqual(rooms['mean_queries'], 4)
+        self.assertGreater(rooms['mean_bytes'], 0)
+        self.assertEqual(sum(rooms['histogram'].values()), 3)
+        self.assertIn(('GET', '<unmatched>'), routes)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(self.cleaner)
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.supervisor = CustomUser.objects.create_user('sup', password='pass', role='SUPERVISOR')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.rooms = Room.objects.bulk_create([Room(number=str(100 + i), status='COMPLETED' if i < 3 else 'PENDING') for i in range(10)])
+        Incident.objects.create(room=self.rooms[0], text='Leak', target_role='MAINTENANCE')
+        Incident.objects.create(room=self.rooms[1], text='Towels', target_role='HOUSEMAN')
+        Incident.objects.create(room=self.rooms[2], text='Old', target_role='HOUSEMAN', status='RESOLVED')
+        LostItem.objects.create(description='Watch', room=self.rooms[0])
+
+    def test_counts(self):
+        # Three counts, plus the activity rollups (existing rows, missing days, insert) and today
+        with self.assertNumQueries(7):
+            data = self.client.get('/api/housekeeping/stats/dashboard/').json()
+        self.assertEqual(data['total_rooms'], 10)
+        self.assertEqual(data['cleaned_today'], 3)
+        self.assertEqual(data['issues_open'], 2)
+        self.assertEqual(data['lost_items_found'], 1)
+        self.assertEqual(data['status_distribution'], {'PENDING': 7, 'IN_PROGRESS': 0, 'INSPECTION': 0, 'COMPLETED': 3, 'MAINTENANCE': 0})
+        self.assertEqual(data['incident_distribution'], {'MAINTENANCE': 1, 'RECEPTION': 0, 'SUPERVISOR': 0, 'HOUSEMAN': 1, 'CLEANER': 0})
+
+    def test_cached_until_a_write_commits(self):
+        self.client.get('/api/housekeeping/stats/dashboard/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/housekeeping/stats/dashboard/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.get(pk=self.rooms[5].pk).delete()
+        self.assertEqual(self.client.get('/api/housekeeping/stats/dashboard/').json()['total_rooms'], 9)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Incident.objects.create(room=self.rooms[0], text='Bulb', target_role='MAINTENANCE')
+        self.assertEqual(self.client.get('/api/housekeeping/stats/dashboard/').json()['issues_open'], 3)
+
+    def test_bulk_update_invalidates(self):
+        self.client.get('/api/housekeeping/stats/dashboard/')
+        with mock.patch('housekeeping.views.send_multicast_push'), self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/housekeeping/rooms/bulk_update/', [{'id': self.rooms[9].id, 'status': 'COMPLETED'}], format='json')
+        self.assertEqual(self.client.get('/api/housekeeping/stats/dashboard/').json()['cleaned_today'], 4)
+
+
+
+class RoomActivityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.supervisor = CustomUser.objects.create_user('sup', password='pass', role='SUPERVISOR')
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.room = Room.objects.create(number='101', assigned_group='Group 1')
+
+    @mock.patch('housekeeping.views.send_multicast_push')
+    def test_transitions_are_logged(self, push):
+        url = f'/api/housekeeping/rooms/{self.room.id}/'
+        self.client.patch(url, {'status': 'IN_PROGRESS'}, format='json')
+        self.client.patch(url, {'notes': 'No status change'}, format='json')
+        Room.objects.filter(pk=self.room.pk).update(cleaning_started_at=timezone.now() - timedelta(minutes=20))
+        self.client.patch(url, {'status': 'INSPECTION'}, format='json')
+        self.client.post('/api/housekeeping/rooms/bulk_update/', [{'id': self.room.id, 'status': 'COMPLETED'}], format='json')
+
+        events = list(RoomStatusEvent.objects.order_by('id').values_list('from_status', 'to_status', 'group_id'))
+        self.assertEqual(events, [
+            ('PENDING', 'IN_PROGRESS', 'Group 1'), ('IN_PROGRESS', 'INSPECTION', 'Group 1'), ('INSPECTION', 'COMPLETED', 'Group 1'),
+        ])
+        self.assertAlmostEqual(RoomStatusEvent.objects.get(to_status='INSPECTION').duration_seconds, 1200, delta=5)
+
+    def test_dashboard_charts_come_from_rollups(self):
+        now = timezone.now()
+        other = Room.objects.create(number='102')
+        events = []
+        for days_ago, room, minutes in ((1, self.room, 30), (1, other, 50), (3, self.room, 40)):
+            at = now - timedelta(days=days_ago)
+            events += [
+                RoomStatusEvent(room=room, room_number=room.number, from_status='PENDING', to_status='IN_PROGRESS', timestamp=at),
+                RoomStatusEvent(room=room, room_number=room.number, from_status='IN_PROGRESS', to_status='INSPECTION',
+                                duration_seconds=minutes * 60, timestamp=at),
+                RoomStatusEvent(room=room, room_number=room.number, from_status='INSPECTION', to_status='COMPLETED', timestamp=at),
+            ]
+        RoomStatusEvent.objects.bulk_create(events)
+
+        data = self.client.get('/api/housekeeping/stats/dashboard/').json()
+        self.assertEqual(len(data['weekly_activity']['labels']), 7)
+        self.assertEqual(data['weekly_activity']['labels'][-1], timezone.localdate().strftime('%a'))
+        self.assertEqual(data['weekly_activity']['data'], [0, 0, 0, 3, 0, 6, 0])
+        self.assertEqual(data['rooms_cleaned_per_day']['data'], [0, 0, 0, 1, 0, 2, 0])
+        self.assertEqual(data['cleaning_duration']['data'], [0, 0, 0, 40.0, 0, 40.0, 0])
+        # Closed days are rolled up once, today stays live
+        self.assertEqual(RoomStatusRollup.objects.count(), 6)
+        self.assertFalse(RoomStatusRollup.objects.filter(date=timezone.localdate()).exists())
+
+        cache.clear()
+        with self.assertNumQueries(5):
+            self.assertEqual(self.client.get('/api/housekeeping/stats/dashboard/').json()['weekly_activity'], data['weekly_activity'])
+
+
+
+class CleaningEstimateTests(TestCase):
+    def setUp(self):
+        estimates.invalidate()
+        self.departure = CleaningTypeDefinition.objects.create(name='DEPARTURE', estimated_minutes=45)
+        CleaningTypeDefinition.objects.create(name='STAYOVER', estimated_minutes=15)
+
+    def test_reads_come_from_memory(self):
+        self.assertEqual(estimates.all(), {'DEPARTURE': 45, 'STAYOVER': 15})
+        with self.assertNumQueries(0):
+            self.assertEqual(estimates.get('DEPARTURE'), 45)
+            self.assertEqual(estimates.get('UNKNOWN'), 30)
+
+    def test_saving_a_type_bumps_the_version(self):
+        estimates.all()
+        version = CacheVersion.objects.get(name='cleaning_estimates').version
+        self.departure.estimated_minutes = 50
+        self.departure.save()
+        self.assertEqual(CacheVersion.objects.get(name='cleaning_estimates').version, version + 1)
+        self.assertEqual(estimates.get('DEPARTURE'), 50)
+
+    def test_other_workers_pick_up_a_new_version(self):
+        estimates.all()
+        # Another process changed the table and bumped the stamp; no signal reaches this one
+        CleaningTypeDefinition.objects.filter(name='DEPARTURE').update(estimated_minutes=60)
+        CacheVersion.objects.filter(name='cleaning_estimates').update(version=F('version') + 1)
+        self.assertEqual(estimates.get('DEPARTURE'), 45)
+        with mock.patch('housekeeping.estimates.VERSION_CHECK_SECONDS', 0):
+            self.assertEqual(estimates.get('DEPARTURE'), 60)
+            # Same version: one stamp query, no reload
+            with self.assertNumQueries(1):
+                estimates.all()
+
+    def test_session_target_uses_estimates(self):
+        user = CustomUser.objects.create_user('c', password='pass', role='CLEANER', group_id='Group 1')
+        Room.objects.create(number='101', assigned_group='Group 1', cleaning_type='DEPARTURE')
+        Room.objects.create(number='102', assigned_group='Group 1', cleaning_type='WEEKLY')
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post('/api/housekeeping/cleaning-sessions/', {'group_id': 'Group 1'}, format='json')
+        self.assertEqual(response.json()['target_duration_minutes'], 75)
+
+
+
+class BatchPriorityTests(TestCase):
+    def rooms(self, now):
+        rooms = synthetic_rooms(5000, now, seed=7)
+        # Boundaries of the deadline formula, down to the microsecond
+        for offset in (0, 1, -1, 1800 * 10**6, 1800 * 10**6 + 1, 1800 * 10**6 - 1, 3 * 3600 * 10**6 + 7):
+            for guest_status in ('GUEST_IN_ROOM', 'NO_GUEST'):
+                rooms.append(Room(cleaning_type='PREARRIVAL', guest_status=guest_status, status='IN_PROGRESS', priority=True,
+                                  next_arrival_time=now + timedelta(microseconds=offset)))
+        rooms.append(Room(cleaning_type='PREARRIVAL', next_arrival_time=None))
+        rooms.append(Room(cleaning_type=None, next_arrival_time=now))
+        rooms.append(Room(cleaning_type='DEEP_CLEAN')) # A custom CleaningTypeDefinition
+        return rooms
+
+    def test_batch_matches_scalar_exactly(self):
+        now = timezone.now()
+        rooms = self.rooms(now)
+        expected = [get_room_priority_score(room, now) for room in rooms]
+        columns = priority_columns(rooms)
+        self.assertEqual(list(score_rooms(columns, now)), expected)
+        # Same columns as tuples straight from values_list()
+        rows = [tuple(getattr(room, field) for field in PRIORITY_FIELDS) for room in rooms]
+        self.assertEqual(list(score_rooms(priority_columns(rows), now)), expected)
+        with mock.patch('housekeeping.logic.priority.np', None):
+            self.assertEqual(score_rooms(columns, now), expected)
+        # Unknown types score 0 without being added to the code table
+        self.assertEqual(list(priority_module.TYPE_CODES), list(priority_module.TYPE_BASE_SCORES))
+
+    @skipUnless(priority_module.np is not None, 'NumPy not installed')
+    def test_datetime64_arrivals(self):
+        now = timezone.now()
+        rooms = self.rooms(now)
+        columns = priority_columns(rooms)
+        columns['next_arrival_time'] = priority_module.np.array(
+            [a and a.replace(tzinfo=None) for a in columns['next_arrival_time']], dtype='datetime64[us]',
+        )
+        self.assertEqual(list(score_rooms(columns, now)), [get_room_priority_score(room, now) for room in rooms])
+
+    def test_empty_batch(self):
+        self.assertEqual(list(score_rooms(priority_columns([]))), [])
+
+
+class RoomDispatchTests(TestCase):
+    def setUp(self):
+        priority_index.reset()
+        estimates.invalidate()
+        CleaningTypeDefinition.objects.create(name='DEPARTURE', estimated_minutes=45)
+        CleaningTypeDefinition.objects.create(name='WEEKLY', estimated_minutes=35)
+        self.cleaner = CustomUser.objects.create_user('c', password='pass', role='CLEANER', group_id='Group 1')
+        self.departure = Room.objects.create(number='101', assigned_group='Group 1', cleaning_type='DEPARTURE')
+        self.weekly = Room.objects.create(number='102', assigned_group='Group 1', cleaning_type='WEEKLY')
+        Room.objects.create(number='103', assigned_group='Group 1', cleaning_type='DAYUSE', status='IN_PROGRESS')
+        Room.objects.create(number='104', assigned_group='Group 1', cleaning_type='DEPARTURE', guest_status='GUEST_IN_ROOM', priority=True)
+        Room.objects.create(number='201', assigned_group='Group 2', cleaning_type='DAYUSE')
+        self.client = APIClient()
+        self.client.force_authenticate(self.cleaner)
+
+    def next_room(self, query=''):
+        response = self.client.get(f'/api/housekeeping/rooms/next/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_top_assignable_room_of_the_group(self):
+        data = self.next_room()
+        self.assertEqual(data['room']['number'], '101')
+        self.assertEqual(data['score'], 300)
+        self.assertEqual(data['queued'], 2)
+        self.assertEqual(self.next_room('?group_id=Group 2')['room']['number'], '201')
+        self.assertEqual(self.next_room('?group_id=Group 9'), {'room': None, 'score': None, 'queued': 0})
+
+    def test_changes_are_applied_incrementally(self):
+        self.next_room()
+        self.client.patch(f'/api/housekeeping/rooms/{self.departure.id}/', {'status': 'IN_PROGRESS'}, format='json')
+        # Catch-up: changed rooms, deletions and the room itself; no reload of the pending rooms
+        with self.assertNumQueries(4):
+            self.assertEqual(self.next_room()['room']['number'], '102')
+        self.client.patch(f'/api/housekeeping/rooms/{self.departure.id}/', {'status': 'PENDING', 'priority': True}, format='json')
+        self.assertEqual(self.next_room()['score'], 2300)
+        self.departure.delete()
+        self.weekly.assigned_group = 'Group 2'
+        self.weekly.save()
+        self.assertEqual(self.next_room(), {'room': None, 'score': None, 'queued': 0})
+        self.assertEqual(self.next_room('?group_id=Group 2')['queued'], 2)
+
+    def test_prearrival_rooms_rise_as_the_arrival_nears(self):
+        now = timezone.now()
+        Room.objects.create(number='105', assigned_group='Group 1', cleaning_type='PREARRIVAL', next_arrival_time=now + timedelta(hours=6))
+        self.assertEqual(self.next_room()['room']['number'], '105')
+        room_id, score, _ = priority_index.next_room('Group 1', now + timedelta(hours=7))
+        self.assertEqual(score, 5000)
+
+    def test_equal_scores_break_ties_like_assign_daily(self):
+        now = timezone.now()
+        # Both overdue, so both score 5000: the lower id wins, not the earlier arrival
+        first = Room.objects.create(number='105', assigned_group='Group 1', cleaning_type='PREARRIVAL', next_arrival_time=now - timedelta(hours=1))
+        Room.objects.create(number='106', assigned_group='Group 1', cleaning_type='PREARRIVAL', next_arrival_time=now - timedelta(hours=3))
+        self.assertEqual(priority_index.next_room('Group 1', now), (first.id, 5000, 4))
+
+    def test_overdue_rooms_are_ranked_without_a_scan(self):
+        now = timezone.now()
+        queue = GroupQueue()
+        for room_id in range(1, 501):
+            room = SimpleNamespace(id=room_id, status='PENDING', assigned_group='Group 1', cleaning_type='PREARRIVAL',
+                                   guest_status='NO_GUEST', priority=False, next_arrival_time=now - timedelta(minutes=room_id))
+            queue.push(room, 45 if room_id in (250, 300) else 40)
+        self.assertEqual(queue.peek(now), (250, 5000))
+        # Once moved to the static heap, the 500 tied rooms are not rescored on every peek
+        with mock.patch('housekeeping.dispatch.get_room_priority_score', wraps=get_room_priority_score) as score:
+            self.assertEqual(queue.peek(now + timedelta(minutes=1)), (250, 5000))
+        self.assertLessEqual(score.call_count, 1)
+
+    def test_matches_a_full_rerank(self):
+        now = timezone.now()
+        rooms = synthetic_rooms(2000, now, seed=3)
+        for room_id, room in enumerate(rooms, start=1):
+            room.id, room.assigned_group = room_id, 'Group 1'
+        effort = {'DEPARTURE': 45, 'PREARRIVAL': 40, 'WEEKLY': 35}
+        queue = GroupQueue()
+        for room in rooms:
+            if is_assignable(room):
+                queue.push(room, effort.get(room.cleaning_type, 30))
+        # Status changes knock rooms out and bring them back
+        for room in rooms[::7]:
+            queue.discard(room.id)
+        for room in rooms[::21]:
+            room.status = 'PENDING'
+            if is_assignable(room):
+                queue.push(room, effort.get(room.cleaning_type, 30))
+        queued = [room for room in rooms if room.id in queue.entries]
+        for hours in (0, 1, 6, 24, 72):
+            time_now = now + timedelta(hours=hours)
+            best = max(get_room_priority_score(room, time_now) for room in queued)
+            # Ties go to the larger effort, then the lower id
+            expected = max(queued, key=lambda room: (get_room_priority_score(room, time_now), effort.get(room.cleaning_type, 30), -room.id))
+            self.assertEqual(queue.peek(time_now), (expected.id, best))
+
+
+class AutoAssignTests(TestCase):
+    URL = '/api/housekeeping/assign-rooms/assign_daily/'
+
+    def setUp(self):
+        estimates.invalidate()
+        CleaningTypeDefinition.objects.create(name='DEPARTURE', estimated_minutes=45)
+        self.supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR')
+        self.full = CustomUser.objects.create_user('c1', password='pass', role='CLEANER', group_id='Group 1')
+        self.short = CustomUser.objects.create_user('c2', password='pass', role='CLEANER', group_id='Group 2')
+        self.off = CustomUser.objects.create_user('c3', password='pass', role='CLEANER')
+        WorkShift.objects.create(user=self.full, date=date.today(), start_time=dt_time(9), end_time=dt_time(17))
+        WorkShift.objects.create(user=self.short, date=date.today(), start_time=dt_time(9), end_time=dt_time(10))
+        Room.objects.bulk_create([Room(number=str(100 + i), cleaning_type='DEPARTURE') for i in range(15)])
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def test_assigns_and_calls_in_extra_staff(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            data = self.client.post(self.URL).json()
+        self.assertEqual(set(data['timings']), {'load_ms', 'compute_ms', 'write_ms', 'total_ms'})
+        self.assertEqual(data['updated_rooms'], 15)
+        self.assertEqual(data['routes'][str(self.off.id)], sorted(data['routes'][str(self.off.id)]))
+        self.assertEqual(Room.objects.filter(assigned_cleaner=self.full, assigned_group='Group 1').count(), 10)
+        self.assertEqual(Room.objects.filter(assigned_cleaner=self.short, assigned_group='Group 2').count(), 1)
+        self.assertEqual(Room.objects.filter(assigned_cleaner=self.off, assigned_group='Extra Team 1').count(), 4)
+        self.off.refresh_from_db()
+        self.assertEqual(self.off.group_id, 'Extra Team 1')
+        self.assertTrue(WorkShift.objects.filter(user=self.off, date=date.today()).exists())
+        self.assertEqual(ChangeEvent.objects.filter(kind='ROOM').count(), 15)
+
+        # A rerun keeps every room where it is and writes nothing
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.post(self.URL).json()
+        self.assertEqual(data['updated_rooms'], 0)
+        self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE')])
+
+    def test_strategy_choice(self):
+        response = self.client.post(self.URL, {'strategy': 'floor'}, format='json')
+        self.assertEqual(response.json()['updated_rooms'], 15)
+        self.assertEqual(self.client.post(self.URL, {'strategy': 'random'}, format='json').status_code, 400)
+
+    def test_failed_write_leaves_the_previous_assignment(self):
+        with mock.patch('django.db.models.query.QuerySet.bulk_update', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(self.URL)
+        self.off.refresh_from_db()
+        self.assertIsNone(self.off.group_id)
+        self.assertFalse(WorkShift.objects.filter(user=self.off).exists())
+        self.assertFalse(Room.objects.filter(assigned_cleaner__isnull=False).exists())
+
+
+class RosterGenerateTests(TestCase):
+    URL = '/api/housekeeping/roster/generate/'
+    MONDAY = date(2026, 3, 2)
+
+    def setUp(self):
+        estimates.invalidate()
+        self.supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR')
+        self.cleaners = [CustomUser.objects.create_user(f'c{n}', password='pass', role='CLEANER') for n in range(3)]
+        # 42 stayovers (840 min, 2 cleaners) every day; on Monday 21 of them check out instead
+        Room.objects.bulk_create([
+            Room(number=str(100 + i), guest_status='GUEST_IN_ROOM', check_out_date=self.MONDAY if i < 21 else None)
+            for i in range(42)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def generate(self):
+        # Cold caches, so runs issue the same queries
+        cache.clear()
+        estimates.invalidate()
+        return self.client.post(self.URL, {'start_date': self.MONDAY.isoformat()}, format='json').json()
+
+    def test_follows_demand_and_availability(self):
+        tuesday = self.MONDAY + timedelta(days=1)
+        StaffAvailability.objects.create(user=self.cleaners[0], date=tuesday, status='OFF')
+        StaffAvailability.objects.create(user=self.cleaners[1], date=tuesday, status='PARTIAL', start_time=dt_time(7), end_time=dt_time(15))
+        # Stale shift from an earlier run, before the cleaner took the day off
+        WorkShift.objects.create(user=self.cleaners[0], date=tuesday)
+
+        data = self.generate()
+        # Monday: 21 departures * 30 + 21 stayovers * 20 = 1050 min -> 2 cleaners
+        self.assertEqual(len(data['shifts']), 7 * 2)
+        self.assertEqual(WorkShift.objects.count(), 7 * 2)
+        self.assertTrue(all(shift['id'] for shift in data['shifts']))
+        tuesday_shifts = {shift['user']: shift for shift in data['shifts'] if shift['date'] == tuesday.isoformat()}
+        self.assertEqual(set(tuesday_shifts), {self.cleaners[1].id, self.cleaners[2].id})
+        self.assertEqual((tuesday_shifts[self.cleaners[1].id]['start_time'], tuesday_shifts[self.cleaners[1].id]['end_time']), ('07:00:00', '15:00:00'))
+        self.assertEqual(tuesday_shifts[self.cleaners[2].id]['start_time'], '09:00:00')
+
+    def test_queries_do_not_grow_with_staff(self):
+        with CaptureQueriesContext(connection) as few:
+            self.generate()
+        for n in range(3, 40):
+            cleaner = CustomUser.objects.create_user(f'c{n}', password='pass', role='CLEANER')
+            StaffAvailability.objects.create(user=cleaner, date=self.MONDAY, status='AVAILABLE')
+        with CaptureQueriesContext(connection) as many:
+            self.generate()
+        self.assertEqual(len(many), len(few))
+
+
+class AssignmentStrategyTests(TestCase):
+    def test_greedy_matches_the_original_scan(self):
+        for seed in range(5):
+            tasks, staff_ids, load, capacity, _ = synthetic_workload(800, 40, seed=seed)
+            expected_load, greedy_load = dict(load), dict(load)
+            expected = reference_assign(tasks, staff_ids, expected_load, capacity)
+            self.assertEqual(assign_rooms(tasks, staff_ids, greedy_load, capacity, 'greedy'), expected)
+            self.assertEqual(greedy_load, expected_load)
+
+    def test_every_strategy_keeps_the_rules(self):
+        tasks, staff_ids, load, capacity, stops = synthetic_workload(2000, 60, seed=1)
+        walking = {}
+        for name in ASSIGNMENT_STRATEGIES:
+            loads = dict(load)
+            assignment = assign_rooms(tasks, staff_ids, loads, capacity, name)
+            self.assertEqual(set(assignment), {room_id for room_id, _, _, _ in tasks})
+            self.assertTrue(all(loads[uid] <= capacity[uid] for uid in staff_ids), name)
+            self.assertTrue(AssignmentBenchmark().sticky_kept(tasks, assignment, load, capacity), name)
+            walking[name] = sum(simulate_travel(assignment, tasks, stops).values())
+        self.assertLess(walking['floor'], walking['greedy'])
+
+    def test_floor_coverage_stays_close_to_greedy(self):
+        for rooms, staff in ((800, 40), (2000, 60), (5000, 300)):
+            tasks, staff_ids, load, capacity, _ = synthetic_workload(rooms, staff, seed=rooms)
+            efforts = {room_id: effort for room_id, effort, _, _ in tasks}
+            coverage = {}
+            for name in ('greedy', 'floor'):
+                assignment = assign_rooms(tasks, staff_ids, dict(load), capacity, name)
+                assigned = [room_id for room_id, uid in assignment.items() if uid is not None]
+                coverage[name] = (len(assigned), sum(efforts[room_id] for room_id in assigned))
+            # Same minutes of work, at most ~1% more rooms left over (see FloorStrategy)
+            self.assertGreaterEqual(coverage['floor'][1], 0.995 * coverage['greedy'][1])
+            self.assertGreaterEqual(coverage['floor'][0], 0.985 * coverage['greedy'][0])
+
+    def test_walking_route(self):
+        stops = [(4, 1, 'East', '1003'), (1, 2, 'East', '2005'), (3, 1, 'East', '1012'), (5, None, None, 'Lobby'), (2, 1, 'West', '1030')]
+        self.assertEqual(walking_route(stops), [4, 3, 2, 1, 5])
+        by_id = {stop[0]: stop for stop in stops}
+        ordered = [by_id[room_id] for room_id in walking_route(stops)]
+        # 9 doors, a zone change and two floor changes
+        self.assertEqual(route_seconds(ordered), 9 * 8 + 60 + 2 * 120)
+        self.assertLess(route_seconds(ordered), route_seconds(stops))
+
+
+class RoomLocationTests(TestCase):
+    def test_floor_defaults_from_the_number(self):
+        self.assertEqual(Room.objects.create(number='45').floor, 3)
+        self.assertEqual(Room.objects.create(number='Lobby').floor, 1)
+        self.assertEqual(Room.objects.create(number='1012', floor=10, zone='East').floor, 10)
+
+    def test_bulk_created_rooms_take_the_floor_from_the_number(self):
+        # bulk_create skips save(), so these have no floor in the database
+        Room.objects.bulk_create([Room(number='41', zone='East'), Room(number='5', zone='West')])
+        self.assertEqual(Room.objects.filter(floor__isnull=True).count(), 2)
+        self.assertEqual(Room.objects.get(number='41').location, (3, 'East'))
+        cleaner = CustomUser.objects.create_user('c1', password='pass', role='CLEANER', group_id='Group 1')
+        WorkShift.objects.create(user=cleaner, date=date.today(), start_time=dt_time(9), end_time=dt_time(17))
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR'))
+        data = client.post('/api/housekeeping/assign-rooms/assign_daily/', {'strategy': 'floor'}, format='json').json()
+        # Floor 1 before floor 3, not East before West
+        self.assertEqual(data['routes'][str(cleaner.id)], ['5', '41'])
+
+    def test_renumbering_moves_a_derived_floor(self):
+        derived = Room.objects.create(number='45')
+        explicit = Room.objects.create(number='1012', floor=10)
+        for room, number in ((derived, '65'), (explicit, '1013')):
+            room = Room.objects.get(pk=room.pk)
+            room.number = number
+            room.save(update_fields=['number'])
+        self.assertEqual(Room.objects.get(pk=derived.pk).floor, 4)
+        self.assertEqual(Room.objects.get(pk=explicit.pk).floor, 10)
+
+    def test_api_import_reads_the_location(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR'))
+        client.post('/api/housekeeping/import_json/', {'teams': {'team_1': {'rooms': [
+            {'room': '1012', 'floor': 10, 'zone': 'East'}, {'room': '45'},
+        ]}}}, format='json')
+        self.assertEqual(Room.objects.get(number='1012').location, (10, 'East'))
+        self.assertEqual(Room.objects.get(number='45').location, (3, None))
+
+    def test_bulk_created_rooms_show_a_floor(self):
+        room = Room.objects.bulk_create([Room(number='45')])[0]
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR'))
+        self.assertEqual(client.get('/api/housekeeping/rooms/').json()[0]['floor'], 3)
+        self.assertEqual(client.get(f'/api/housekeeping/rooms/{room.id}/').json()['floor'], 3)
+        self.assertEqual(client.get('/api/housekeeping/rooms/?since=').json()['rooms'][0]['floor'], 3)
+
+    def test_floor_and_zone_are_writable(self):
+        supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR')
+        client = APIClient()
+        client.force_authenticate(supervisor)
+        response = client.post('/api/housekeeping/rooms/', {'number': '2001', 'floor': 20, 'zone': 'West'}, format='json')
+        self.assertEqual((response.json()['floor'], response.json()['zone']), (20, 'West'))
+        self.assertEqual(client.get('/api/housekeeping/rooms/?fields=number,floor,zone').json(), [{'id': response.json()['id'], 'number': '2001', 'floor': 20, 'zone': 'West'}])
+
+
+class EndpointBudgetTests(TestCase):
+    """
+    Query-count and wall-time budgets for every housekeeping endpoint on a
+    realistic property. Query budgets are exact upper bounds: going over one
+    almost always means a per-row query (N+1) crept into a serializer or view.
+    Wall-time budgets are loose and only catch gross regressions.
+    """
+    ROOMS = 300
+    INCIDENTS = 3000
+    GROUPS = 10
+    CLEANERS_PER_GROUP = 4
+    DAYS = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.monday = today - timedelta(days=today.weekday())
+        cls.supervisor = CustomUser.objects.create_user('boss', password='pass', role='SUPERVISOR')
+        others = [
+            CustomUser(username=f'{role.lower()}{i}', role=role)
+            for role in ('RECEPTION', 'MAINTENANCE', 'HOUSEMAN') for i in range(2)
+        ]
+        cleaners = [
+            CustomUser(username=f'cleaner{g}_{i}', role='CLEANER', group_id=f'Group {g}')
+            for g in range(1, cls.GROUPS + 1) for i in range(cls.CLEANERS_PER_GROUP)
+        ]
+        CustomUser.objects.bulk_create(others + cleaners)
+        cleaners = list(CustomUser.objects.filter(role='CLEANER').order_by('id'))
+        staff = list(CustomUser.objects.order_by('id'))
+
+        CleaningTypeDefinition.objects.bulk_create([
+            CleaningTypeDefinition(name=name, estimated_minutes=minutes)
+            for name, minutes in (('DEPARTURE', 45), ('PREARRIVAL', 40), ('WEEKLY', 35), ('HOLDOVER', 20), ('RUBBISH', 10), ('DAYUSE', 30))
+        ])
+        statuses = ('PENDING', 'PENDING', 'IN_PROGRESS', 'INSPECTION', 'COMPLETED', 'MAINTENANCE')
+        cleaning_types = ('DEPARTURE', 'PREARRIVAL', 'WEEKLY', 'HOLDOVER', 'RUBBISH', 'DAYUSE')
+        guest_statuses = ('GUEST_OUT', 'GUEST_IN_ROOM', 'NO_GUEST', 'DND')
+        Room.objects.bulk_create([
+            Room(
+                number=str((i // 30 + 1) * 100 + i % 30 + 1), status=statuses[i % 6], cleaning_type=cleaning_types[i % 5],
+                guest_status=guest_statuses[i % 4], assigned_group=f'Group {i % cls.GROUPS + 1}',
+                assigned_cleaner=cleaners[i % len(cleaners)] if i % 3 else None, priority=i % 17 == 0,
+                check_out_date=today + timedelta(days=i % 7), guest_details={'guests': i % 4 + 1},
+                supplies_used={'Shampoo': i % 3},
+            )
+            for i in range(cls.ROOMS)
+        ])
+        rooms = list(Room.objects.order_by('id'))
+        roles = ('MAINTENANCE', 'HOUSEMAN', 'RECEPTION', 'SUPERVISOR', 'CLEANER')
+        Incident.objects.bulk_create([
+            Incident(
+                room=rooms[i % len(rooms)] if i % 10 else None, text=f'Incident {i}', status='OPEN' if i % 3 == 0 else 'RESOLVED',
+                target_role=roles[i % 5], reported_by=staff[i % len(staff)], assigned_to=staff[i % 7] if i % 4 == 0 else None,
+            )
+            for i in range(cls.INCIDENTS)
+        ], batch_size=500)
+        LostItem.objects.bulk_create([
+            LostItem(description=f'Item {i}', room=rooms[i % len(rooms)], found_by=staff[i % len(staff)]) for i in range(200)
+        ])
+        Announcement.objects.bulk_create([
+            Announcement(title=f'Notice {i}', message='Shift change', sender=cls.supervisor) for i in range(50)
+        ])
+        Asset.objects.bulk_create([Asset(room=room, name='Minibar', serial_number=f'MB-{room.number}') for room in rooms])
+        InventoryItem.objects.bulk_create([InventoryItem(name=f'Supply {i}', quantity=i) for i in range(30)])
+
+        first_day = cls.monday - timedelta(days=7)
+        days = [first_day + timedelta(days=d) for d in range(cls.DAYS)]
+        WorkShift.objects.bulk_create([
+            WorkShift(user=cleaner, date=day, start_time=dt_time(9), end_time=dt_time(17))
+            for day in days for cleaner in cleaners
+        ], batch_size=500)
+        StaffAvailability.objects.bulk_create([
+            StaffAvailability(user=cleaner, date=day, status='OFF' if (day.day + n) % 7 == 0 else 'AVAILABLE')
+            for day in days for n, cleaner in enumerate(cleaners)
+        ], batch_size=500)
+        CleaningSession.objects.bulk_create([
+            CleaningSession(group_id=f'Group {g}', status='COMPLETED', target_duration_minutes=300)
+            for g in range(1, cls.GROUPS + 1) for _ in range(cls.DAYS)
+        ])
+        CleaningSession.objects.create(group_id='Group 1', target_duration_minutes=300)
+
+    def setUp(self):
+        # Budgets are for cold caches
+        cache.clear()
+        estimates.invalidate()
+        priority_index.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def budgets(self):
+        """ (method, url, body, max queries, max ms); writes come last because they change the data. """
+        room = Room.objects.order_by('id').first()
+        vacant = Room.objects.filter(guest_status='NO_GUEST').order_by('-id').first()
+        incident = Incident.objects.order_by('id').first()
+        monday = self.monday.isoformat()
+        pending = list(Room.objects.filter(status='PENDING').order_by('id').values_list('id', flat=True)[:20])
+        return [
+            ('get', '/api/housekeeping/rooms/', None, 4, 3000),
+            ('get', '/api/housekeeping/rooms/?profile=slim', None, 3, 2000),
+            ('get', '/api/housekeeping/rooms/?since=', None, 4, 3000),
+            ('get', f'/api/housekeeping/rooms/{room.id}/', None, 2, 500),
+            ('get', '/api/housekeeping/rooms/next/?group_id=Group 1', None, 5, 500),
+            ('get', '/api/housekeeping/incidents/', None, 2, 3000),
+            ('get', '/api/housekeeping/incidents/?page_size=50', None, 2, 500),
+            ('get', f'/api/housekeeping/incidents/{incident.id}/', None, 1, 500),
+            ('get', '/api/housekeeping/inventory/', None, 1, 500),
+            ('get', '/api/housekeeping/cleaning-types/', None, 1, 500),
+            ('get', '/api/housekeeping/cleaning-sessions/', None, 1, 1000),
+            ('get', '/api/housekeeping/cleaning-sessions/current/?group_id=Group 1', None, 1, 500),
+            ('get', '/api/housekeeping/lost-items/', None, 1, 1000),
+            ('get', '/api/housekeeping/lost-items/?page_size=50', None, 1, 500),
+            ('get', '/api/housekeeping/announcements/', None, 2, 500),
+            ('get', '/api/housekeeping/assets/', None, 2, 1000),
+            ('get', '/api/housekeeping/stats/dashboard/', None, 7, 1000),
+            ('get', '/api/housekeeping/availability/', None, 1, 2000),
+            ('get', f'/api/housekeeping/roster/week/?start_date={monday}', None, 1, 1000),
+            ('get', f'/api/housekeeping/roster/forecast/?start_date={monday}', None, 24, 2000),
+            ('get', '/api/housekeeping/bootstrap/', None, 13, 5000),
+            ('patch', f'/api/housekeeping/rooms/{room.id}/', {'notes': 'Budget'}, 6, 1000),
+            ('post', '/api/housekeeping/incidents/', {'room': room.id, 'text': 'Leak', 'targetRole': 'MAINTENANCE'}, 3, 500),
+            ('post', '/api/housekeeping/rooms/bulk_update/',
+             {'updates': [{'id': pk, 'status': 'IN_PROGRESS'} for pk in pending]}, 7, 2000),
+            ('post', f'/api/housekeeping/rooms/{room.id}/move_guest/', {'target_room_id': vacant.id}, 6, 1000),
+            ('post', '/api/housekeeping/sync/replay/', {'actions': [
+                {'key': 'budget-1', 'type': 'UPDATE_ROOM', 'payload': {'id': room.id, 'data': {'priority': True}}},
+                {'key': 'budget-2', 'type': 'ADD_INCIDENT', 'payload': {'data': {'room': room.id, 'text': 'Lamp', 'targetRole': 'HOUSEMAN'}}},
+            ]}, 23, 1000), # Includes the throttled ReplayedAction prune
+            ('post', '/api/housekeeping/assign-rooms/assign_daily/', None, 6, 2000),
+            ('post', '/api/housekeeping/roster/generate/', {'start_date': monday}, 8, 2000),
+        ]
+
+    def test_endpoint_budgets(self):
+        for method, url, body, max_queries, max_ms in self.budgets():
+            with self.subTest(method=method.upper(), url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = getattr(self.client, method)(url, body, format='json')
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                self.assertLess(response.status_code, 400, response.content[:300])
+                self.assertLessEqual(len(queries), max_queries, f'{method.upper()} {url}: {len(queries)} queries')
+                self.assertLessEqual(elapsed_ms, max_ms, f'{method.upper()} {url}: {elapsed_ms:.0f} ms')
+
+    def test_every_route_has_a_budget(self):
+        covered = {url.split('/')[3].split('?')[0] for _, url, _, _, _ in self.budgets()}
+        self.assertEqual({prefix for prefix, _, _ in router.registry} - covered, set())
+
+
+class GenerateHotelTests(TestCase):
+    def generate(self, **options):
+        call_command('generate_hotel', rooms=200, staff=40, weeks=1, date='2026-03-02', stdout=StringIO(), **options)
+        return (
+            list(Room.objects.order_by('number').values_list('number', 'status', 'assigned_group', 'assigned_cleaner__username')),
+            list(Incident.objects.order_by('created_at', 'text').values_list('room__number', 'status', 'created_at')),
+            list(WorkShift.objects.order_by('user__username', 'date').values_list('user__username', 'date', 'end_time')),
+        )
+
+    def test_generates_a_consistent_hotel(self):
+        rooms, incidents, shifts = self.generate()
+        self.assertEqual(len(rooms), 200)
+        self.assertEqual(len(incidents), 600)
+        self.assertEqual(CustomUser.objects.filter(username__startswith='gen_').count(), 40)
+        self.assertEqual(CleaningSession.objects.filter(status='IN_PROGRESS').count(), 10)
+        self.assertEqual(
+            list(Room.objects.filter(number__in=('1001', '1040', '2001')).order_by('number').values_list('floor', 'zone')),
+            [(1, 'East'), (1, 'West'), (2, 'East')],
+        )
+        # History keeps its timestamps instead of being stamped at insert time
+        self.assertLess(incidents[0][2], timezone.make_aware(datetime(2026, 2, 28)))
+        for number, status, group, cleaner in rooms:
+            if cleaner:
+                self.assertEqual(CustomUser.objects.get(username=cleaner).group_id, group)
+        self.assertTrue(shifts)
+
+    def test_same_seed_same_data(self):
+        first = self.generate()
+        self.assertEqual(self.generate(reset=True), first)
+        self.assertNotEqual(self.generate(reset=True, seed=7)[0], first[0])
+
+    def test_refuses_to_mix_with_existing_rooms(self):
+        Room.objects.create(number='101')
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class RoomDeleteTests(TestCase):
+    def test_deleting_a_room_with_incidents(self):
+        supervisor = CustomUser.objects.create_user('sup', password='pass', role='SUPERVISOR')
+        room = Room.objects.create(number='101')
+        Incident.objects.create(room=room, text='Leak', reported_by=supervisor)
+        client = APIClient()
+        client.force_authenticate(supervisor)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(f'/api/housekeeping/rooms/{room.id}/')
+        self.assertEqual(response.status_code, 204)
+        event = ChangeEvent.objects.get(kind='INCIDENT', action='DELETED')
+        self.assertIsNone(event.payload['room_number'])
+
+
+class SimulateFleetTests(LiveServerTestCase):
+    def test_fleet_reports_every_polled_endpoint(self):
+        CustomUser.objects.create_user('cleaner', password='pass', role='CLEANER', group_id='Group 1')
+        CustomUser.objects.create_user('reception', password='pass', role='RECEPTION')
+        Room.objects.bulk_create([Room(number=str(100 + i), assigned_group='Group 1') for i in range(20)])
+        out = StringIO()
+        with tempfile.NamedTemporaryFile(suffix='.json') as report:
+            call_command(
+                'simulate_fleet', url=self.live_server_url, devices=['CLEANER=2', 'RECEPTION=1'],
+                duration=1.5, interval=0.5, clean_rate=1, json=report.name, stdout=out,
+            )
+            result = json.load(report)
+        endpoints = {(row['method'], row['endpoint']) for row in result['endpoints']}
+        self.assertIn(('GET', '/api/housekeeping/rooms/'), endpoints)
+        self.assertIn(('GET', '/api/housekeeping/cleaning-sessions/current/'), endpoints)
+        self.assertIn(('GET', '/api/housekeeping/lost-items/'), endpoints)
+        self.assertIn(('PATCH', '/api/housekeeping/rooms/{id}/'), endpoints)
+        # The in-memory test database can refuse concurrent writes, so only the polls must be clean
+        self.assertEqual(sum(row['errors'] for row in result['endpoints'] if row['method'] == 'GET'), 0)
+        self.assertIn('p99 ms', out.getvalue())
+
+    def test_needs_users_for_each_role(self):
+        with self.assertRaises(CommandError):
+            call_command('simulate_fleet', url=self.live_server_url, devices=['HOUSEMAN=1'], duration=0.1, stdout=StringIO())
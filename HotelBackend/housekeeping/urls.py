@@ -2,6 +2,9 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import RoomViewSet, IncidentViewSet, InventoryItemViewSet, CleaningTypeDefinitionViewSet, CleaningSessionViewSet, LostItemViewSet, AnnouncementViewSet, StatsViewSet, AssetViewSet, ImportRoomsView
 from .roster_views import AvailabilityViewSet, RosterViewSet, AutoAssignRoomsViewSet
+from .stream_views import event_stream
+from .sync_views import SyncViewSet
+from .bootstrap_views import BootstrapView
 
 router = DefaultRouter()
 router.register(r'rooms', RoomViewSet)
@@ -16,8 +19,11 @@ router.register(r'assets', AssetViewSet)
 router.register(r'availability', AvailabilityViewSet, basename='availability')
 router.register(r'roster', RosterViewSet, basename='roster')
 router.register(r'assign-rooms', AutoAssignRoomsViewSet, basename='assign-rooms')
+router.register(r'sync', SyncViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('import_json/', ImportRoomsView.as_view(), name='import_json'),
+    path('events/stream/', event_stream, name='event_stream'),
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
 ]
@@ -1,5 +1,5 @@
 from rest_framework import viewsets, permissions, status, views
-from .models import Room, Incident, InventoryItem, CleaningTypeDefinition, LostItem, Announcement, Asset, CleaningSession
+from .models import Room, RoomTombstone, ChangeEvent, Incident, InventoryItem, CleaningTypeDefinition, LostItem, Announcement, Asset, CleaningSession, RoomStatusEvent
 from .serializers import (
     RoomSerializer, IncidentSerializer, InventoryItemSerializer, 
     CleaningTypeDefinitionSerializer, LostItemSerializer, 
@@ -7,11 +7,134 @@ from .serializers import (
 )
 from accounts.models import CustomUser
 from .utils import send_multicast_push
+from .mixins import ConditionalListMixin, SparseFieldsetMixin
+from .fast_read import FastListMixin, room_reader
+from .pagination import KeysetPagination
+from .events import publish, room_event
+from .stats import dashboard_stats, invalidate_dashboard
+from .activity import status_event
+from .estimates import estimates
+from .dispatch import priority_index
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch, Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import timedelta, timezone as dt_timezone
 import json
 
+# Rows saved by a transaction that commits after a poll can carry a
+# last_updated slightly older than the cursor we handed out, so every delta
+# query looks back this far. Re-sent rooms are harmless (clients upsert by id).
+DELTA_SYNC_OVERLAP = timedelta(seconds=2)
+
+BULK_UPDATE_LIMIT = 500
+
+# status -> (role, title for one room, title for several, adjective)
+ROOM_STATUS_NOTIFICATIONS = {
+    'INSPECTION': ('SUPERVISOR', "Room Ready for Inspection", "Rooms Ready for Inspection", 'ready'),
+    'COMPLETED': ('RECEPTION', "Room Cleaned", "Rooms Cleaned", 'clean'),
+}
+
+def notify_room_status_changes(numbers_by_status):
+    """ Sends one push per audience for rooms that reached a notified status in a batch. """
+    for room_status, numbers in numbers_by_status.items():
+        if not numbers or room_status not in ROOM_STATUS_NOTIFICATIONS:
+            continue
+        role, single_title, batch_title, adjective = ROOM_STATUS_NOTIFICATIONS[room_status]
+        if len(numbers) == 1:
+            title, body = single_title, f"Room {numbers[0]} is {adjective}."
+        else:
+            title, body = f"{len(numbers)} {batch_title}", f"Rooms {', '.join(numbers)} are {adjective}."
+        send_multicast_push(CustomUser.objects.filter(role=role), title, body, extra={"type": "ROOM_UPDATE"})
+
+def notify_incident_created(incident):
+    # Notify Target Role
+    if incident.target_role:
+        targets = CustomUser.objects.filter(role=incident.target_role)
+        send_multicast_push(targets, "New Incident", f"{incident.text} ({incident.room_number if hasattr(incident, 'room_number') else 'General'})", extra={"type": "INCIDENT", "id": incident.id})
+
+# Roles that get the whole room list; everyone else gets a role-specific subset
+FULL_ROOM_LIST_ROLES = ('SUPERVISOR', 'ADMIN', 'RECEPTION')
+
+def room_scope(user):
+    """ Q limiting the room list to what the user's role works on, or None for everything. """
+    if user.is_superuser or user.role in FULL_ROOM_LIST_ROLES:
+        return None
+    if user.role == 'CLEANER':
+        scope = Q(assigned_cleaner=user)
+        if user.group_id:
+            scope |= Q(assigned_group=user.group_id)
+        return scope
+    if user.role == 'HOUSEMAN':
+        # Prep rooms (HousemanScreen.prepRooms) and rooms with open houseman requests
+        requests = Incident.objects.filter(status='OPEN', target_role='HOUSEMAN', room__isnull=False)
+        return Q(cleaning_type__in=('PREARRIVAL', 'DEPARTURE'), status='PENDING') | Q(pk__in=requests.values('room'))
+    if user.role == 'MAINTENANCE':
+        jobs = Incident.objects.filter(status='OPEN', target_role='MAINTENANCE', room__isnull=False)
+        return Q(status='MAINTENANCE') | Q(pk__in=jobs.values('room'))
+    return None
+
+def room_state_in_scope(user, state):
+    """ room_scope's rules for one ROOM event payload (a room state); incident-based scope is judged from INCIDENT events. """
+    if user.role == 'CLEANER':
+        return state.get('assigned_cleaner') == user.pk or (bool(user.group_id) and state.get('assigned_group') == user.group_id)
+    if user.role == 'HOUSEMAN':
+        return state.get('cleaning_type') in ('PREARRIVAL', 'DEPARTURE') and state.get('status') == 'PENDING'
+    if user.role == 'MAINTENANCE':
+        return state.get('status') == 'MAINTENANCE'
+    return False
+
+def event_in_scope(user, event):
+    """ Whether the room behind a ROOM or INCIDENT event was in room_scope(user) just before or after it. """
+    payload = event.payload
+    if event.kind == 'INCIDENT':
+        if user.role == 'CLEANER':
+            # Incident events carry the room's group at the time
+            return bool(user.group_id) and event.group_id == user.group_id
+        # An open request puts its room in that role's scope
+        return payload.get('target_role') == user.role
+    before = dict(
+        payload,
+        status=payload.get('previous_status', payload.get('status')),
+        assigned_group=payload.get('previous_group', payload.get('assigned_group')),
+        assigned_cleaner=payload.get('previous_cleaner', payload.get('assigned_cleaner')),
+    )
+    return room_state_in_scope(user, before) or room_state_in_scope(user, payload)
+
+def rooms_left_scope(user, candidates, since):
+    """
+    Ids among `candidates` (changed rooms now outside the user's scope) that
+    the change feed shows inside it at some point after `since`, i.e. rooms
+    the device may still hold. Other rooms' ids are not sent. Cursors older
+    than events.EVENT_RETENTION need a full snapshot instead.
+    """
+    room_ids = set(candidates.values_list('pk', flat=True))
+    if not room_ids:
+        return set()
+    feed = ChangeEvent.objects.filter(created_at__gt=since).filter(
+        Q(kind='ROOM', object_id__in=room_ids) | Q(kind='INCIDENT', payload__room__in=room_ids)
+    )
+    return {
+        event.object_id if event.kind == 'ROOM' else event.payload.get('room')
+        for event in feed if event_in_scope(user, event)
+    }
+
+def format_sync_cursor(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+def parse_sync_cursor(raw):
+    try:
+        value = parse_datetime(raw)
+    except ValueError:
+        value = None
+    if value is None:
+        return None
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value
+
 class ImportRoomsView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -45,6 +168,9 @@ class ImportRoomsView(views.APIView):
                 room.assigned_group = group_name
                 room.cleaning_type = cleaning_type
                 room.notes = room_data.get('notes', '')
+                # Location, when the export has it (save() falls back to the room number for the floor)
+                room.floor = room_data.get('floor', room.floor)
+                room.zone = room_data.get('zone', room.zone)
                 
                 in_out = room_data.get('in_out')
                 if in_out == 'In': room.guest_status = 'GUEST_IN_ROOM'
@@ -58,24 +184,110 @@ class ImportRoomsView(views.APIView):
 
         return Response({'message': 'Import Successful', 'details': results})
 
-class InventoryItemViewSet(viewsets.ModelViewSet):
+class InventoryItemViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = InventoryItem.objects.all().order_by('name')
     serializer_class = InventoryItemSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(ConditionalListMixin, FastListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Room.objects.all().order_by('number')
     serializer_class = RoomSerializer
     permission_classes = [permissions.IsAuthenticated]
+    list_reader = room_reader
+
+    # ?profile=slim: just what HotelContext.fetchRooms maps
+    field_profiles = {
+        'slim': [
+            'id', 'number', 'status', 'cleaning_type', 'bed_setup', 'priority', 'is_guest_waiting',
+            'last_dnd_timestamp', 'maintenance_reason', 'current_guest_name', 'check_out_date',
+            'next_arrival_time', 'guest_status', 'assigned_group', 'assigned_cleaner', 'extras_text',
+            'cleaning_started_at', 'last_cleaning_duration', 'last_inspection_report',
+            'is_houseman_completed', 'last_updated',
+        ],
+    }
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Room.objects.all().order_by('number')
+        # Nested incidents + cleaner name would otherwise cost 2 queries per room
+        queryset = Room.objects.all().order_by('number').select_related('assigned_cleaner').prefetch_related(
+            Prefetch('incidents', queryset=Incident.objects.select_related('reported_by').order_by('id'))
+        )
         
-        if user.role == 'CLEANER' and user.group_id:
-             pass 
-             
-        return queryset 
+        if self.action == 'list':
+            scope = self.get_room_scope()
+            if scope is not None:
+                queryset = queryset.filter(scope)
+
+        return queryset
+
+    def get_room_scope(self):
+        # Maintenance and housemen pick arbitrary rooms in some screens; ?scope=all lets them opt out
+        user = self.request.user
+        if self.request.query_params.get('scope') == 'all' and user.role != 'CLEANER':
+            return None
+        return room_scope(user)
+
+    def list(self, request, *args, **kwargs):
+        # ?since=<cursor> switches to delta sync; a blank value asks for a full snapshot plus a cursor
+        if 'since' in request.query_params:
+            return self.delta(request, request.query_params.get('since'))
+        return super().list(request, *args, **kwargs)
+
+    def get_list_version(self, queryset):
+        # Rooms embed their incidents, so incident changes must also move the ETag
+        version = super().get_list_version(queryset)
+        version['incidents'] = Incident.objects.filter(room__in=queryset.values('pk')).order_by().aggregate(
+            count=Count('pk'), changed=Max('last_updated')
+        )
+        return version
+
+    def delta(self, request, since):
+        """
+        Returns rooms changed after `since`, ids of rooms deleted after it and
+        the cursor to send on the next poll.
+        """
+        rooms = self.filter_queryset(self.get_queryset())
+        deleted = RoomTombstone.objects.none()
+        left_scope = set()
+        incidents_newest = None
+        cursor = None
+
+        if since:
+            cursor = parse_sync_cursor(since)
+            if cursor is None:
+                return Response({'error': 'Invalid since cursor.'}, status=400)
+            window_start = cursor - DELTA_SYNC_OVERLAP
+            # Rooms embed their incidents, so an incident change re-sends its room
+            changed_incidents = Incident.objects.filter(last_updated__gt=window_start, room__isnull=False)
+            changed = Q(last_updated__gt=window_start) | Q(pk__in=changed_incidents.values('room'))
+            in_scope = rooms
+            rooms = rooms.filter(changed)
+            deleted = RoomTombstone.objects.filter(deleted_at__gt=window_start).order_by('deleted_at')
+            incidents_newest = changed_incidents.filter(room__in=in_scope.values('pk')).aggregate(
+                newest=Max('last_updated')
+            )['newest']
+            scope = self.get_room_scope()
+            if scope is not None:
+                # Rooms that moved out of this user's scope are dropped client side like deletions
+                left_scope = rooms_left_scope(request.user, Room.objects.filter(changed).exclude(scope), window_start)
+
+        # Taken before reading rows: a room saved in between is re-sent next poll, never skipped
+        newest = rooms.order_by().aggregate(newest=Max('last_updated'))['newest']
+        data = room_reader.render(rooms, self.get_sparse_fields())
+        deleted = list(deleted.values('room_id', 'deleted_at'))
+
+        # Advance the cursor to the newest change we actually returned
+        for stamp in [newest, incidents_newest] + [d['deleted_at'] for d in deleted]:
+            if stamp is not None and (cursor is None or stamp > cursor):
+                cursor = stamp
+        if cursor is None:
+            cursor = timezone.now()
+
+        return Response({
+            'rooms': data,
+            'deleted': sorted({d['room_id'] for d in deleted} | left_scope),
+            'cursor': format_sync_cursor(cursor),
+        })
 
     def perform_update(self, serializer):
         # Capture previous status
@@ -104,9 +316,99 @@ class RoomViewSet(viewsets.ModelViewSet):
         targets = CustomUser.objects.all()
         if role:
             targets = targets.filter(role=role)
-        
+
         send_multicast_push(targets, title, body, extra={"type": "ROOM_UPDATE"})
 
+    @action(detail=False, methods=['get'], url_path='next')
+    def next_room(self, request):
+        """
+        The group's top-ranked assignable room (PENDING, not blocked by a guest)
+        from the in-memory priority index; ?group_id= defaults to the user's group.
+        """
+        group_id = request.query_params.get('group_id') or request.user.group_id
+        if not group_id:
+            return Response({'error': 'group_id is required.'}, status=400)
+        room_id, score, queued = priority_index.next_room(group_id)
+        rooms = room_reader.render(self.get_queryset().filter(pk=room_id), self.get_sparse_fields()) if room_id else []
+        return Response({'room': rooms[0] if rooms else None, 'score': score, 'queued': queued})
+
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """
+        Applies a batch of partial room updates in one transaction.
+        Body: [{"id": 1, "status": "...", ...}, ...] or {"updates": [...]}.
+        Every item is validated with RoomSerializer first; if any fails,
+        nothing is written and the per-item errors are returned.
+        """
+        updates = request.data.get('updates') if isinstance(request.data, dict) else request.data
+        if not isinstance(updates, list) or not updates:
+            return Response({'error': 'A non-empty list of updates is required.'}, status=400)
+        if len(updates) > BULK_UPDATE_LIMIT:
+            return Response({'error': f'At most {BULK_UPDATE_LIMIT} updates per request.'}, status=400)
+
+        ids = []
+        for item in updates:
+            room_id = item.get('id') if isinstance(item, dict) else None
+            if not isinstance(room_id, int) or isinstance(room_id, bool):
+                return Response({'error': 'Every update needs an integer "id".'}, status=400)
+            ids.append(room_id)
+        if len(set(ids)) != len(ids):
+            return Response({'error': 'Each room may appear only once per batch.'}, status=400)
+
+        now = timezone.now()
+        changed_fields = {'last_updated'}
+        notifications = {room_status: [] for room_status in ROOM_STATUS_NOTIFICATIONS}
+        status_events = []
+
+        with transaction.atomic():
+            rooms = Room.objects.select_for_update().in_bulk(ids)
+            missing = [room_id for room_id in ids if room_id not in rooms]
+            if missing:
+                return Response({'error': 'Rooms not found.', 'ids': missing}, status=404)
+
+            validated = []
+            errors = []
+            for item in updates:
+                data = {k: v for k, v in item.items() if k != 'id'}
+                serializer = RoomSerializer(rooms[item['id']], data=data, partial=True)
+                if serializer.is_valid():
+                    validated.append(serializer)
+                else:
+                    errors.append({'id': item['id'], 'errors': serializer.errors})
+            if errors:
+                return Response({'errors': errors}, status=400)
+
+            for serializer in validated:
+                room = serializer.instance
+                old_status = room.status
+                for attr, value in serializer.validated_data.items():
+                    setattr(room, attr, value)
+                changed_fields.update(serializer.validated_data)
+
+                # Same timer and notification rules as perform_update
+                if room.status != old_status:
+                    status_events.append(status_event(room, old_status, now))
+                    if room.status == 'IN_PROGRESS':
+                        room.cleaning_started_at = now
+                        changed_fields.add('cleaning_started_at')
+                    elif room.status == 'PENDING':
+                        room.cleaning_started_at = None
+                        changed_fields.add('cleaning_started_at')
+                    if room.status in notifications:
+                        notifications[room.status].append(room.number)
+                # bulk_update skips auto_now and post_save
+                room.last_updated = now
+
+            updated = [rooms[room_id] for room_id in ids]
+            Room.objects.bulk_update(updated, sorted(changed_fields), batch_size=200)
+            RoomStatusEvent.objects.bulk_create(status_events)
+            publish(*[room_event(room) for room in updated])
+            invalidate_dashboard()
+
+        notify_room_status_changes(notifications)
+
+        return Response(room_reader.render(self.get_queryset().filter(pk__in=ids), self.get_sparse_fields()))
+
     @action(detail=True, methods=['post'])
     def move_guest(self, request, pk=None):
         source_room = self.get_object()
@@ -128,7 +430,7 @@ class RoomViewSet(viewsets.ModelViewSet):
         target_room.current_guest_name = source_room.current_guest_name
         target_room.check_in_date = source_room.check_in_date
         target_room.check_out_date = source_room.check_out_date
-        target_room.guest_count = source_room.guest_count
+        target_room.guest_details = source_room.guest_details # Guest count lives here; Room has no guest_count
         target_room.guest_status = source_room.guest_status
         
         # Determine Status
@@ -146,32 +448,37 @@ class RoomViewSet(viewsets.ModelViewSet):
         source_room.current_guest_name = None
         source_room.check_in_date = None
         source_room.check_out_date = None
-        source_room.guest_count = 1
+        source_room.guest_details = {}
         source_room.guest_status = 'NO_GUEST'
         source_room.status = 'PENDING' # Needs cleaning now
         source_room.save()
         
         return Response({'message': f'Guest moved from {source_room.number} to {target_room.number}'})
 
-class CleaningTypeDefinitionViewSet(viewsets.ModelViewSet):
+class CleaningTypeDefinitionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = CleaningTypeDefinition.objects.all().order_by('name')
     serializer_class = CleaningTypeDefinitionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class IncidentViewSet(viewsets.ModelViewSet):
-    queryset = Incident.objects.all().order_by('-created_at')
+class IncidentViewSet(ConditionalListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = Incident.objects.select_related('reported_by').order_by('-created_at')
     serializer_class = IncidentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    sparse_required_columns = ('created_at',) # Keyset cursor
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status', None)
+        if status_filter:
+            queryset = queryset.filter(status__in=status_filter.split(','))
+        return queryset
 
     def perform_create(self, serializer):
         incident = serializer.save(reported_by=self.request.user)
-        
-        # Notify Target Role
-        if incident.target_role:
-            targets = CustomUser.objects.filter(role=incident.target_role)
-            send_multicast_push(targets, "New Incident", f"{incident.text} ({incident.room_number if hasattr(incident, 'room_number') else 'General'})", extra={"type": "INCIDENT", "id": incident.id})
+        notify_incident_created(incident)
 
-class CleaningSessionViewSet(viewsets.ModelViewSet):
+class CleaningSessionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = CleaningSession.objects.all()
     serializer_class = CleaningSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -182,13 +489,9 @@ class CleaningSessionViewSet(viewsets.ModelViewSet):
         # Calculate total minutes
         rooms = Room.objects.filter(assigned_group=group_id).exclude(status='MAINTENANCE')
         total_minutes = 0
-        
-        # Cache definitions to avoid N+1 is ideal, simple loop for now
-        cleaning_types = {ct.name: ct.estimated_minutes for ct in CleaningTypeDefinition.objects.all()}
-        
-        for room in rooms:
-            minutes = cleaning_types.get(room.cleaning_type, 30) # Default 30
-            total_minutes += minutes
+
+        for cleaning_type in rooms.values_list('cleaning_type', flat=True):
+            total_minutes += estimates.get(cleaning_type)
             
         serializer.save(target_duration_minutes=total_minutes)
 
@@ -207,10 +510,19 @@ class CleaningSessionViewSet(viewsets.ModelViewSet):
             return Response(CleaningSessionSerializer(session).data)
         return Response(None)
 
-class LostItemViewSet(viewsets.ModelViewSet):
-    queryset = LostItem.objects.all().order_by('-created_at')
+class LostItemViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = LostItem.objects.select_related('found_by').order_by('-created_at')
     serializer_class = LostItemSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    sparse_required_columns = ('created_at',) # Keyset cursor
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status', None)
+        if status_filter:
+            queryset = queryset.filter(status__in=status_filter.split(','))
+        return queryset
 
     def perform_create(self, serializer):
         item = serializer.save(found_by=self.request.user)
@@ -218,10 +530,12 @@ class LostItemViewSet(viewsets.ModelViewSet):
         targets = CustomUser.objects.filter(role='RECEPTION')
         send_multicast_push(targets, "Lost Item Found", f"{item.description} in {item.room or 'Lobby'}", extra={"type": "LOST_ITEM", "id": item.id})
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
-    queryset = Announcement.objects.all().order_by('-created_at')
+class AnnouncementViewSet(ConditionalListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = Announcement.objects.select_related('sender').order_by('-created_at')
     serializer_class = AnnouncementSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    sparse_required_columns = ('created_at',) # Keyset cursor
 
     def perform_create(self, serializer):
         ann = serializer.save(sender=self.request.user)
@@ -229,13 +543,13 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         targets = CustomUser.objects.all()
         send_multicast_push(targets, f"📢 {ann.title}", ann.message, extra={"type": "ANNOUNCEMENT", "priority": ann.priority})
 
-class AssetViewSet(viewsets.ModelViewSet):
+class AssetViewSet(ConditionalListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Asset.objects.all()
     serializer_class = AssetSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Asset.objects.all()
+        queryset = Asset.objects.select_related('room')
         room_id = self.request.query_params.get('room', None)
         if room_id:
             queryset = queryset.filter(room_id=room_id)
@@ -246,34 +560,4 @@ class StatsViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
-        total_rooms = Room.objects.count()
-        cleaned_today = Room.objects.filter(status='COMPLETED').count() # Naive
-        issues_open = Incident.objects.filter(status='OPEN').count()
-        lost_items_found = LostItem.objects.filter(status='FOUND').count()
-        
-        # 1. Room Status Distribution (Pie Chart)
-        status_counts = {}
-        for status, _ in Room.STATUS_CHOICES:
-            status_counts[status] = Room.objects.filter(status=status).count()
-            
-        # 2. Incidents by Role (Bar/Pie Chart)
-        incident_counts = {}
-        for role, _ in Incident.ROLE_CHOICES:
-            incident_counts[role] = Incident.objects.filter(target_role=role, status='OPEN').count()
-
-        # 3. Weekly Activity (Mocked for Demo - requires History Model for real data)
-        # In a real app, query 'RoomHistory' or 'LogEntry' by date.
-        weekly_activity = {
-            "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-            "data": [12, 19, 3, 5, 2, 3, 10] 
-        }
-
-        return Response({
-            'total_rooms': total_rooms,
-            'cleaned_today': cleaned_today,
-            'issues_open': issues_open,
-            'lost_items_found': lost_items_found,
-            'status_distribution': status_counts,
-            'incident_distribution': incident_counts,
-            'weekly_activity': weekly_activity
-        })
+        return Response(dashboard_stats())
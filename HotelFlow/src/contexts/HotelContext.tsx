@@ -527,7 +527,10 @@ export const HotelProvider: React.FC<{ children: ReactNode }> = ({ children }) =
     // Fetch rooms from API
     const fetchRooms = async () => {
         try {
-            const res = await api.get('/housekeeping/rooms/');
+            // The server trims the list to each role's own rooms; maintenance (block-room picker)
+            // and housemen (departure / stayover counts) work from every room, so they opt out
+            const everyRoom = ['HOUSEMAN', 'MAINTENANCE'].includes(user?.role || '');
+            const res = await api.get('/housekeeping/rooms/', everyRoom ? { params: { scope: 'all' } } : undefined);
 
             // Transform
             const transformed = res.data.map((r: any) => ({